@@ -0,0 +1,63 @@
+"""
+This file times finding the latest of many tags one SemVer at a time against
+the bulk column parser, with and without NumPy
+"""
+
+from __future__ import print_function
+
+from importlib.util import find_spec
+from random import Random
+from sys import argv
+from timeit import timeit
+
+from gitflow_easyrelease import SemVer
+
+COUNT = 100000
+
+
+def create_tags(count):
+    """Creates count shuffled tags, a few of them pre-releases"""
+    generator = Random(0)
+    tags = []
+    for _ in range(count):
+        tag = "v%d.%d.%d" % (
+            generator.randint(0, 20),
+            generator.randint(0, 50),
+            generator.randint(0, 200)
+        )
+        if 0 == generator.randint(0, 9):
+            tag += "-rc.%d" % generator.randint(1, 12)
+        tags.append(tag)
+    return tags
+
+
+def per_tag(tags):
+    """Parses every tag into a SemVer before taking the max"""
+    return max(SemVer.from_version(tag) for tag in tags)
+
+
+def bulk(tags, use_numpy=False):
+    """Parses the listing into columns before taking the max"""
+    return SemVer.get_latest_in(SemVer.parse_many(tags, use_numpy))
+
+
+def main(count):
+    """Prints the time each strategy takes"""
+    tags = create_tags(count)
+    strategies = [
+        ('per tag', lambda: per_tag(tags)),
+        ('parse_many', lambda: bulk(tags)),
+    ]
+    if find_spec('numpy'):
+        strategies.append(('parse_many, NumPy', lambda: bulk(tags, True)))
+    else:
+        print('NumPy is not installed; skipping its row')
+    latest = set(repr(strategy()) for _, strategy in strategies)
+    assert 1 == len(latest), latest
+    print("%d tags, latest %s" % (count, latest.pop()))
+    for name, strategy in strategies:
+        print("%-20s %8.2f ms" % (name, timeit(strategy, number=3) * 1000 / 3))
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if 1 < len(argv) else COUNT)
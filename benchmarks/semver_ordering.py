@@ -0,0 +1,49 @@
+"""
+This file times sorting, max, and deduplicating versions through the
+tuple-keyed rich comparisons against the legacy compare method
+"""
+
+from __future__ import print_function
+
+from functools import cmp_to_key
+from operator import attrgetter
+from random import Random
+from sys import argv
+from timeit import timeit
+
+from gitflow_easyrelease import SemVer
+
+COUNT = 50000
+
+
+def create_versions(count):
+    """Creates count shuffled versions"""
+    generator = Random(0)
+    return [
+        SemVer(
+            generator.randint(0, 20),
+            generator.randint(0, 50),
+            generator.randint(0, 200)
+        )
+        for _ in range(count)
+    ]
+
+
+def main(count):
+    """Prints the time each strategy takes"""
+    versions = create_versions(count)
+    legacy = cmp_to_key(lambda first, second: -first.compare(second))
+    strategies = [
+        ('sorted, compare', lambda: sorted(versions, key=legacy)),
+        ('sorted, rich comparisons', lambda: sorted(versions)),
+        ('sorted, key', lambda: sorted(versions, key=attrgetter('key'))),
+        ('max, rich comparisons', lambda: max(versions)),
+        ('set', lambda: set(versions)),
+    ]
+    print("%d versions" % count)
+    for name, strategy in strategies:
+        print("%-26s %8.2f ms" % (name, timeit(strategy, number=5) * 200))
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if 1 < len(argv) else COUNT)
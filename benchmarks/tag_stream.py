@@ -0,0 +1,91 @@
+"""
+This file compares peak memory while finding the latest tag, buffering every
+tag versus streaming them, as the tag count grows
+"""
+
+from __future__ import print_function
+
+from os import chdir, getcwd
+from os.path import join
+from shutil import rmtree
+from subprocess import check_call, check_output
+from sys import argv
+from tempfile import mkdtemp
+import tracemalloc
+
+from gitflow_easyrelease import GitDir, RepoInfo, RepoSnapshot, SemVer
+
+COUNTS = [1000, 10000, 100000]
+
+
+def create_repo(count):
+    """Creates a repo with count packed semver tags on a single commit"""
+    root = mkdtemp()
+    check_call(['git', 'init', '-q', root])
+    check_call([
+        'git',
+        '-C', root,
+        '-c', 'user.name=bench',
+        '-c', 'user.email=bench@example.com',
+        'commit', '-q', '--allow-empty', '-m', 'bench'
+    ])
+    commit = check_output(
+        ['git', '-C', root, 'rev-parse', 'HEAD'],
+        universal_newlines=True
+    ).strip()
+    with open(join(root, '.git', 'packed-refs'), 'w') as handle:
+        handle.write('# pack-refs with: peeled fully-peeled sorted \n')
+        for index in range(count):
+            handle.write("%s refs/tags/%d.%d.%d\n" % (
+                commit,
+                index // 10000,
+                index // 100 % 100,
+                index % 100
+            ))
+    return root
+
+
+def buffered():
+    """Lists, parses, and sorts every tag before taking the last"""
+    RepoSnapshot.clear()
+    tags = RepoInfo.get_semver_tags()
+    return SemVer.from_version(sorted(tags, key=SemVer.sort_key)[-1])
+
+
+def streamed():
+    """Folds the tag stream into a running maximum"""
+    return SemVer.get_max_version(
+        SemVer.iter_versions(RepoInfo.iter_semver_tags())
+    )
+
+
+def measure(strategy):
+    """Returns the peak traced allocation of one run, in KiB"""
+    GitDir.clear()
+    tracemalloc.start()
+    strategy()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def main(counts):
+    """Prints one row per tag count"""
+    print("%10s %14s %14s" % ('tags', 'buffered KiB', 'streamed KiB'))
+    start = getcwd()
+    for count in counts:
+        root = create_repo(count)
+        try:
+            chdir(root)
+            print("%10d %14d %14d" % (
+                count,
+                measure(buffered),
+                measure(streamed)
+            ))
+        finally:
+            chdir(start)
+            rmtree(root)
+
+
+if __name__ == '__main__':
+    main([int(count) for count in argv[1:]] or COUNTS)
@@ -0,0 +1,98 @@
+"""
+This file times validating and splitting tags with the single-pass tokenizer
+against the anchored regex, over a few tag corpora shaped like real repos
+"""
+
+from __future__ import print_function
+
+from random import Random
+from sys import argv
+from timeit import timeit
+
+from gitflow_easyrelease import SEMVER_PATTERN, tokenize_semver
+
+COUNT = 20000
+
+
+def create_release(generator):
+    """Creates a plain release tag"""
+    return "v%d.%d.%d" % (
+        generator.randint(0, 20),
+        generator.randint(0, 50),
+        generator.randint(0, 200)
+    )
+
+
+def create_prerelease(generator):
+    """Creates a pre-release tag with build metadata"""
+    return "%s-rc.%d+build.%d" % (
+        create_release(generator)[1:],
+        generator.randint(1, 12),
+        generator.randint(1, 9999)
+    )
+
+
+def create_junk(generator):
+    """Creates a tag that isn't semver"""
+    return generator.choice([
+        "release-%d" % generator.randint(2010, 2030),
+        "%s.%d" % (create_release(generator), generator.randint(0, 9)),
+        "%s-" % create_release(generator),
+        "deploy/%d" % generator.randint(0, 9999),
+    ])
+
+
+def create_corpora(count):
+    """Creates the named corpora, each count tags long"""
+    generator = Random(0)
+    mixed = [create_release, create_release, create_prerelease, create_junk]
+    return [
+        ('releases', [create_release(generator) for _ in range(count)]),
+        ('prereleases', [create_prerelease(generator) for _ in range(count)]),
+        ('junk', [create_junk(generator) for _ in range(count)]),
+        ('mixed', [generator.choice(mixed)(generator) for _ in range(count)]),
+    ]
+
+
+def with_regex(tags):
+    """Matches then splits every tag with SEMVER_PATTERN"""
+    parsed = []
+    for tag in tags:
+        found = SEMVER_PATTERN.match(tag)
+        if found:
+            major, minor, patch, prerelease, build = found.group(
+                'major',
+                'minor',
+                'patch',
+                'prerelease',
+                'build'
+            )
+            parsed.append((int(major), int(minor), int(patch), prerelease, build))
+        else:
+            parsed.append(None)
+    return parsed
+
+
+def with_tokenizer(tags, strict=False):
+    """Splits every tag with tokenize_semver"""
+    return [tokenize_semver(tag, strict) for tag in tags]
+
+
+def main(count):
+    """Prints the time each strategy takes on each corpus"""
+    for corpus, tags in create_corpora(count):
+        assert with_regex(tags) == with_tokenizer(tags), corpus
+        print("%s, %d tags" % (corpus, count))
+        for name, strategy in [
+                ('regex', lambda: with_regex(tags)),
+                ('tokenizer', lambda: with_tokenizer(tags)),
+                ('tokenizer, strict', lambda: with_tokenizer(tags, True)),
+        ]:
+            print("  %-20s %8.2f ms" % (
+                name,
+                timeit(strategy, number=5) * 1000 / 5
+            ))
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if 1 < len(argv) else COUNT)
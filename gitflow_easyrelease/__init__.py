@@ -1,9 +1,62 @@
 """This file provides the gitflow_easyrelease module"""
 
-from .is_semver import SEMVER_PATTERN, is_semver
-from .repo_info import RepoInfo
-from .semver import SemVer
-from .color_output import ColorOutput
-from .subcommand import Subcommand
-from .application import Application
-from .cli_file import cli
+from collections import OrderedDict
+from importlib import import_module
+from sys import version_info
+
+# is_semver is tiny and shares its name with its module, so it's bound up
+# front; otherwise importing the submodule first would leave the package
+# attribute pointing at the module instead of the function
+from .is_semver import SEMVER_PATTERN, is_semver, tokenize_semver
+
+_LAZY_MEMBERS = OrderedDict([
+    ('ProcessRunner', 'process_runner'),
+    ('GitDir', 'git_dir'),
+    ('GitflowConfig', 'gitflow_config'),
+    ('RepoSnapshot', 'repo_snapshot'),
+    ('RepoInfo', 'repo_info'),
+    ('TagIndex', 'tag_index'),
+    ('ReachabilityCache', 'reachability_cache'),
+    ('VersionColumns', 'version_columns'),
+    ('VersionIndex', 'version_index'),
+    ('SemVer', 'semver'),
+    ('VersionConstraint', 'version_constraint'),
+    ('ReleaseEngine', 'release_engine'),
+    ('ColorOutput', 'color_output'),
+    ('Subcommand', 'subcommand'),
+    ('LatestSubcommand', 'latest_subcommand'),
+    ('ResolveSubcommand', 'resolve_subcommand'),
+    ('Metrics', 'metrics'),
+    ('Application', 'application'),
+    ('Tracer', 'tracer'),
+    ('cli', 'cli_file'),
+])
+
+__all__ = ['SEMVER_PATTERN', 'is_semver', 'tokenize_semver']
+__all__ += list(_LAZY_MEMBERS)
+
+
+def __getattr__(name):
+    """Imports public members on first access"""
+    if name in _LAZY_MEMBERS:
+        module_name = _LAZY_MEMBERS[name]
+        module = import_module('.%s' % module_name, __name__)
+        # Bind every member of the module so none is shadowed by the
+        # submodule attribute the import system just set
+        for member, source in _LAZY_MEMBERS.items():
+            if source == module_name:
+                globals()[member] = getattr(module, member)
+        return globals()[name]
+    raise AttributeError(
+        "module %r has no attribute %r" % (__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MEMBERS))
+
+
+if version_info < (3, 7):
+    # Module-level __getattr__ needs PEP 562; resolve everything up front
+    for _name in _LAZY_MEMBERS:
+        __getattr__(_name)
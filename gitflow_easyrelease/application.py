@@ -2,13 +2,18 @@
 
 from __future__ import print_function
 
-from argparse import ArgumentParser
+from argparse import Action, ArgumentParser, SUPPRESS
 from collections import OrderedDict
-from sys import argv, exit as sys_exit
+from sys import argv, exit as sys_exit, stderr
 
 from argparse_color_formatter import ColorHelpFormatter
 
-from gitflow_easyrelease import ColorOutput, RepoInfo
+from gitflow_easyrelease.color_output import ColorOutput
+from gitflow_easyrelease.metrics import Metrics
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.release_engine import ReleaseEngine
+from gitflow_easyrelease.semver import SemVer
+from gitflow_easyrelease.tracer import Tracer
 
 
 class Application(object):
@@ -16,57 +21,112 @@ class Application(object):
     This class parses arguments and performs the desired action.
     """
 
+    HELP_FLAGS = ['-h', '--help', '--all-help']
+
     def __init__(self, subcommands=None):
-        RepoInfo.ensure_git_flow()
         self.subcommands = (
             subcommands
             if subcommands
             else OrderedDict()
         )
 
-    def attach_subparsers(self, parser):
-        """Attaches subparsers for each subcommand"""
+    def attach_subparsers(self, parser, selected=None):
+        """Attaches subparsers for the selected subcommand or all of them"""
         subparsers = parser.add_subparsers(
             dest='subcommand',
             help='Available subcommands'
         )
-        for _, subcommand in self.subcommands.items():
-            subcommand.attach_subparser(subparsers)
+        for key, subcommand in self.subcommands.items():
+            if selected is None or key == selected:
+                subcommand.attach_subparser(subparsers)
 
-    def populate_root_parser(self, parser):
+    def populate_root_parser(self, parser, args=None):
         """Adds a help argument and subcommand info"""
         parser.add_argument(
             '-h', '--help',
             action='help',
             help='show this help message and exit'
         )
-        self.attach_subparsers(parser)
+        self.attach_subparsers(parser, self.select_subcommand(args))
+
+    def select_subcommand(self, args=None):
+        """Finds the invoked subcommand; None when help needs the full tree"""
+        for arg in args if args else []:
+            if arg in Application.HELP_FLAGS:
+                return None
+            if arg in self.subcommands:
+                return None if '--all-help' in args else arg
+        return None
 
     def bootstrap(self, args=None):
         """Runs the application"""
-        parser = self.create_root_parser()
-        parsed_args = Application.parse_args(
-            parser,
-            (
-                args
-                if args
-                else argv[1:]
-            )
-        )[0]
-        self.populate_root_parser(parser)
-        if parsed_args.all_help:
-            Application.print_all_help(parser)
-        else:
-            parsed_args, options = Application.parse_args(
-                parser,
-                (
-                    args
-                    if args
-                    else argv[1:]
-                )
-            )
+        args = args if args else argv[1:]
+        subcommand = None
+        succeeded = False
+        Application.configure()
+        ProcessRunner.clear()
+        Metrics.start()
+        try:
+            with ProcessRunner.phase('parse'):
+                parser = self.create_root_parser()
+                self.populate_root_parser(parser, args)
+                if '--all-help' in args:
+                    # Before parsing, so a subcommand's required arguments
+                    # can't stop the help from printing
+                    Application.print_all_help(parser)
+                    return
+                parsed_args, options = Application.parse_args(parser, args)
+            if parsed_args.subcommand is None:
+                parser.error('a subcommand is required')
+            Application.configure(parsed_args)
             setattr(parsed_args, 'options', options)
-            self.subcommands[parsed_args.subcommand].execute(parsed_args)
+            subcommand = parsed_args.subcommand
+            self.subcommands[subcommand].execute(parsed_args)
+            succeeded = True
+        finally:
+            if ProcessRunner.PROFILE:
+                ProcessRunner.print_summary()
+            Application.write_trace()
+            if subcommand:
+                Application.write_metrics(subcommand, succeeded)
+            Application.configure()
+
+    @staticmethod
+    def configure(parsed_args=None):
+        """Applies the root flags for one run; without any, restores the defaults"""
+        SemVer.GIT_SORT = getattr(parsed_args, 'git_sort', False)
+        ReleaseEngine.NATIVE = getattr(parsed_args, 'native', False)
+        ProcessRunner.PROFILE = getattr(parsed_args, 'profile', False)
+        Tracer.PATH = getattr(parsed_args, 'trace', None)
+        Metrics.PATH = getattr(parsed_args, 'metrics', None)
+
+    @staticmethod
+    def write_trace():
+        """Writes the trace when tracing is on, warning if it can't"""
+        path = Tracer.get_path()
+        if path:
+            try:
+                Tracer.write(path)
+            except (IOError, OSError) as error:
+                print("Could not write the trace to %s: %s" % (path, error), file=stderr)
+
+    @staticmethod
+    def write_metrics(subcommand, succeeded):
+        """Adds the run to the metrics file when metrics are on, warning if it can't"""
+        path = Metrics.get_path()
+        if path:
+            try:
+                Metrics.update(
+                    path,
+                    subcommand,
+                    succeeded,
+                    ProcessRunner.get_elapsed()
+                )
+            except (IOError, OSError) as error:
+                print(
+                    "Could not update the metrics in %s: %s" % (path, error),
+                    file=stderr
+                )
 
     @staticmethod
     def create_root_parser():
@@ -78,10 +138,37 @@ class Application(object):
         )
         parser.add_argument(
             '--all-help',
-            dest='all_help',
-            action='store_true',
+            action=AllHelpAction,
             help='Prints all available help'
         )
+        parser.add_argument(
+            '--git-sort',
+            action='store_true',
+            help='Let git sort tags by version and read only the newest'
+        )
+        parser.add_argument(
+            '--native',
+            action='store_true',
+            help='Run release commands with git directly instead of git-flow'
+        )
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Print where the time went, per phase and child process, at exit'
+        )
+        parser.add_argument(
+            '--trace',
+            metavar='FILE',
+            help="Write a Chrome trace of the run to FILE (or set %s)" % Tracer.ENVIRONMENT
+        )
+        parser.add_argument(
+            '--metrics',
+            metavar='FILE',
+            help=(
+                "Add the run to a Prometheus textfile at FILE (or set %s)"
+                % Metrics.ENVIRONMENT
+            )
+        )
         return parser
 
     @staticmethod
@@ -118,3 +205,22 @@ class Application(object):
                     print("\n%s\n" % Application.all_help_prog_header(value))
                     value.print_help()
         sys_exit(0)
+
+
+class AllHelpAction(Action):
+    """
+    This action prints every available help message and exits as soon as
+    --all-help is parsed, so the root parser only has to run once.
+    """
+
+    def __init__(self, option_strings, dest=SUPPRESS, default=SUPPRESS, **kwargs):
+        kwargs['nargs'] = 0
+        super(AllHelpAction, self).__init__(
+            option_strings,
+            dest,
+            default=default,
+            **kwargs
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        Application.print_all_help(parser)
@@ -0,0 +1,32 @@
+"""
+This file provides a utility function to replace files atomically
+"""
+
+import os
+from os.path import dirname
+from tempfile import NamedTemporaryFile
+
+replace_file = getattr(os, 'replace', os.rename)
+
+
+def atomic_write(path, text, prefix, mode=None):
+    """
+    Writes text, UTF-8 encoded, to a temporary file beside path and renames
+    it over path, so readers never see a partial file. The temporary file is
+    removed if anything fails; mode, when given, is set before the rename.
+    """
+    handle = NamedTemporaryFile(
+        mode='wb',
+        dir=dirname(path),
+        prefix=prefix,
+        delete=False
+    )
+    try:
+        with handle:
+            handle.write(text.encode('utf-8'))
+        if mode is not None:
+            os.chmod(handle.name, mode)
+        replace_file(handle.name, path)
+    except Exception:
+        os.remove(handle.name)
+        raise
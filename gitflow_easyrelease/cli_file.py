@@ -4,7 +4,11 @@ from __future__ import print_function
 
 from collections import OrderedDict
 
-from gitflow_easyrelease import Application, ColorOutput, Subcommand
+from gitflow_easyrelease.application import Application
+from gitflow_easyrelease.color_output import ColorOutput
+from gitflow_easyrelease.latest_subcommand import LatestSubcommand
+from gitflow_easyrelease.resolve_subcommand import ResolveSubcommand
+from gitflow_easyrelease.subcommand import Subcommand
 
 
 def cli():
@@ -107,5 +111,27 @@ def cli():
         version_optional=True,
         has_base=False
     )
+    subcommands['latest'] = LatestSubcommand(
+        'latest',
+        help_string=(
+            "Prints the latest tagged version, optionally on a release line"
+            " like %s or %s"
+            % (
+                color_output('2', style='bold'),
+                color_output('3.4', style='bold'),
+            )
+        )
+    )
+    subcommands['resolve'] = ResolveSubcommand(
+        'resolve',
+        help_string=(
+            "Prints the highest tagged version satisfying a constraint like %s"
+            " or %s"
+            % (
+                color_output('^1.2', style='bold'),
+                color_output('>=2.0,<3', style='bold'),
+            )
+        )
+    )
     app = Application(subcommands)
     app.bootstrap()
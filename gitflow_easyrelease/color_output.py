@@ -2,10 +2,14 @@
 
 from __future__ import print_function
 
+from os import environ
 from subprocess import CalledProcessError, check_output
+from sys import stdout
 
 from colors import color
 
+from gitflow_easyrelease.process_runner import ProcessRunner
+
 
 class ColorOutput(object):
     """
@@ -14,6 +18,9 @@ class ColorOutput(object):
     created color method.
     """
 
+    ANSI_SUPPORT = None
+    MINIMUM_COLORS = 8
+
     def __init__(self, force_color=False, block_color=False):
         self.force_color = force_color
         self.block_color = block_color
@@ -31,15 +38,57 @@ class ColorOutput(object):
 
     @staticmethod
     def can_use_ansi():
-        """Checks if the terminal can handle colors"""
+        """Checks if the terminal can handle colors, probing only once"""
+        if ColorOutput.ANSI_SUPPORT is None:
+            ColorOutput.ANSI_SUPPORT = ColorOutput.detect_ansi()
+        return ColorOutput.ANSI_SUPPORT
+
+    @staticmethod
+    def reset_ansi_support():
+        """Forgets the memoized probe result"""
+        ColorOutput.ANSI_SUPPORT = None
+
+    @staticmethod
+    def detect_ansi():
+        """Resolves color support from the environment, then terminfo"""
+        if 'NO_COLOR' in environ:
+            return False
+        term = environ.get('TERM', '')
+        if not term or 'dumb' == term:
+            return False
+        if not ColorOutput.is_terminal():
+            return False
+        colors = ColorOutput.terminfo_colors(term)
+        if colors is None:
+            colors = ColorOutput.tput_colors()
+        return ColorOutput.MINIMUM_COLORS <= colors
+
+    @staticmethod
+    def is_terminal():
+        """Checks if stdout is attached to a terminal"""
+        try:
+            return stdout.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    @staticmethod
+    def terminfo_colors(term):
+        """Looks up the color count in-process; None when unavailable"""
+        try:
+            import curses
+            curses.setupterm(term, stdout.fileno())
+            return curses.tigetnum('colors')
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    @staticmethod
+    def tput_colors():
+        """Asks tput for the color count"""
         try:
-            check_output(['which', 'tput'])
-            colors = int(check_output(['tput', 'colors']).strip())
-            if 8 <= colors:
-                return True
-        except CalledProcessError:
-            pass
-        return False
+            ProcessRunner.run(check_output, ['which', 'tput'])
+            return int(ProcessRunner.run(check_output, ['tput', 'colors']).strip())
+        except (CalledProcessError, OSError, ValueError):
+            return 0
 
     @staticmethod
     def no_color(text_to_color, **kwargs):  # pylint:disable=unused-argument
@@ -0,0 +1,205 @@
+"""This file provides the GitDir class"""
+
+from __future__ import print_function
+
+from io import open as io_open
+from os import environ, getcwd, listdir
+from os.path import abspath, dirname, isdir, isfile, join
+from re import compile as re_compile
+
+OBJECT_ID_PATTERN = re_compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+
+class UnsupportedLayout(Exception):
+    """Raised when the repo layout needs the git CLI to be read correctly"""
+
+
+class GitDir(object):
+    """
+    This class reads HEAD and refs straight from a repository's git directory.
+    It understands plain repos, linked worktrees (commondir), packed-refs, and
+    loose refs; anything else raises UnsupportedLayout so callers can fall
+    back to git itself.
+    """
+
+    CURRENT = None
+    ENVIRONMENT_OVERRIDES = [
+        'GIT_DIR',
+        'GIT_COMMON_DIR',
+        'GIT_WORK_TREE',
+        'GIT_CEILING_DIRECTORIES',
+    ]
+
+    def __init__(self, git_dir, common_dir=None):
+        self.git_dir = git_dir
+        self.common_dir = common_dir if common_dir else git_dir
+
+    def read_head(self):
+        """Returns the checked-out branch, or HEAD when detached"""
+        head = GitDir.read_file(join(self.git_dir, 'HEAD'))
+        if head.startswith('ref: '):
+            target = head[len('ref: '):]
+            if target.startswith('refs/heads/'):
+                return target[len('refs/heads/'):]
+            raise UnsupportedLayout("HEAD points at %s" % target)
+        if OBJECT_ID_PATTERN.match(head):
+            return 'HEAD'
+        raise UnsupportedLayout('HEAD is unreadable')
+
+    def read_refs(self, prefixes):
+        """Returns the sorted refnames under prefixes"""
+        refs = set(self.read_packed_refs(prefixes))
+        for prefix in prefixes:
+            refs.update(self.read_loose_refs(prefix))
+        return sorted(refs)
+
+    def read_packed_refs(self, prefixes):
+        """Lists the packed refnames under prefixes"""
+        return list(self.iter_packed_refs(prefixes))
+
+    def iter_packed_refs(self, prefixes):
+        """Yields the packed refnames under prefixes as they're read"""
+        path = join(self.common_dir, 'packed-refs')
+        if not isfile(path):
+            return
+        with io_open(path, encoding='utf-8') as packed_refs:
+            for line in packed_refs:
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('^'):
+                    if not OBJECT_ID_PATTERN.match(line[1:]):
+                        raise UnsupportedLayout('packed-refs is malformed')
+                    continue
+                object_id, _, refname = line.partition(' ')
+                if not OBJECT_ID_PATTERN.match(object_id) or not refname:
+                    raise UnsupportedLayout('packed-refs is malformed')
+                if refname.startswith(tuple(prefixes)):
+                    yield refname
+
+    def has_ref(self, refname):
+        """
+        Checks for a single ref, loose first and then in packed-refs, without
+        listing any others
+        """
+        if '..' in refname or refname.endswith('.lock'):
+            raise UnsupportedLayout("%s is not a valid refname" % refname)
+        path = join(self.common_dir, refname)
+        if isfile(path):
+            content = GitDir.read_file(path)
+            if not (OBJECT_ID_PATTERN.match(content) or content.startswith('ref: ')):
+                raise UnsupportedLayout("%s is unreadable" % refname)
+            return True
+        for packed in self.iter_packed_refs([refname]):
+            if packed == refname:
+                return True
+        return False
+
+    def iter_refs(self, prefix):
+        """
+        Returns an iterator over the refnames under prefix, unsorted, holding
+        only the loose refs in memory while packed-refs streams past. The
+        loose refs are read and packed-refs is checked right away, so a broken
+        ref raises here instead of partway through the iteration.
+        """
+        loose = set(self.read_loose_refs(prefix))
+        self.check_packed_refs()
+        return self.chain_refs(prefix, loose)
+
+    def check_packed_refs(self):
+        """Reads through packed-refs once, raising if any line is malformed"""
+        for _ in self.iter_packed_refs(()):
+            pass
+
+    def chain_refs(self, prefix, loose):
+        """Yields the packed refnames under prefix that aren't loose, then loose"""
+        for refname in self.iter_packed_refs([prefix]):
+            if refname not in loose:
+                yield refname
+        for refname in loose:
+            yield refname
+
+    def read_loose_refs(self, prefix):
+        """Lists the loose refnames under prefix"""
+        refs = []
+        directory = join(self.common_dir, prefix)
+        if not isdir(directory):
+            return refs
+        for name in sorted(listdir(directory)):
+            refname = prefix + name
+            path = join(directory, name)
+            if isdir(path):
+                refs.extend(self.read_loose_refs(refname + '/'))
+            elif not name.endswith('.lock'):
+                content = GitDir.read_file(path)
+                if not (
+                        OBJECT_ID_PATTERN.match(content)
+                        or
+                        content.startswith('ref: ')
+                ):
+                    raise UnsupportedLayout("%s is unreadable" % refname)
+                refs.append(refname)
+        return refs
+
+    @staticmethod
+    def current():
+        """Returns the shared GitDir, discovering it on first use"""
+        if GitDir.CURRENT is None:
+            GitDir.CURRENT = GitDir.discover()
+        return GitDir.CURRENT
+
+    @staticmethod
+    def clear():
+        """Drops the shared GitDir"""
+        GitDir.CURRENT = None
+
+    @staticmethod
+    def discover(path=None):
+        """Finds the git directory that contains path"""
+        for variable in GitDir.ENVIRONMENT_OVERRIDES:
+            if variable in environ:
+                raise UnsupportedLayout("%s is set" % variable)
+        path = abspath(path if path else getcwd())
+        while True:
+            candidate = join(path, '.git')
+            if isdir(candidate):
+                return GitDir.from_git_dir(candidate)
+            if isfile(candidate):
+                return GitDir.from_git_file(candidate)
+            parent = dirname(path)
+            if parent == path:
+                raise UnsupportedLayout('no .git found')
+            path = parent
+
+    @staticmethod
+    def from_git_file(path):
+        """Follows a gitdir file, as used by worktrees and submodules"""
+        content = GitDir.read_file(path)
+        if not content.startswith('gitdir: '):
+            raise UnsupportedLayout("%s is malformed" % path)
+        return GitDir.from_git_dir(
+            join(dirname(path), content[len('gitdir: '):])
+        )
+
+    @staticmethod
+    def from_git_dir(git_dir):
+        """Resolves the common directory of a git directory"""
+        git_dir = abspath(git_dir)
+        common_dir = git_dir
+        commondir_file = join(git_dir, 'commondir')
+        if isfile(commondir_file):
+            common_dir = abspath(
+                join(git_dir, GitDir.read_file(commondir_file))
+            )
+        if isdir(join(common_dir, 'reftable')):
+            raise UnsupportedLayout('reftable is not supported')
+        return GitDir(git_dir, common_dir)
+
+    @staticmethod
+    def read_file(path):
+        """Reads a small file, stripped"""
+        try:
+            with io_open(path, encoding='utf-8') as handle:
+                return handle.read().strip()
+        except (IOError, OSError, UnicodeDecodeError):
+            raise UnsupportedLayout("%s is unreadable" % path)
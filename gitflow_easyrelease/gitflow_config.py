@@ -0,0 +1,257 @@
+"""This file provides the GitflowConfig class"""
+
+from __future__ import print_function
+
+from io import open as io_open
+from os import environ
+from os.path import dirname, expanduser, isabs, isfile, join
+from subprocess import CalledProcessError, check_output
+
+from gitflow_easyrelease.git_dir import GitDir, UnsupportedLayout
+from gitflow_easyrelease.process_runner import ProcessRunner
+
+
+class GitflowConfig(object):
+    """
+    This class holds every gitflow.* setting. The system, global, and local
+    config files (and their includes) are parsed in-process once per run;
+    anything the parser doesn't understand, like includeIf or config passed
+    through the environment, falls back to a single git config call. The
+    system file lives wherever git was built to look for it, so it is only
+    parsed when GIT_CONFIG_SYSTEM names it or GIT_CONFIG_NOSYSTEM skips it.
+    """
+
+    CURRENT = None
+    SECTION = 'gitflow'
+    ENVIRONMENT_OVERRIDES = [
+        'GIT_CONFIG',
+        'GIT_CONFIG_COUNT',
+        'GIT_CONFIG_PARAMETERS',
+    ]
+    ESCAPES = {
+        'n': '\n',
+        't': '\t',
+        'b': '\b',
+        '"': '"',
+        '\\': '\\',
+    }
+    MAX_INCLUDE_DEPTH = 10
+
+    def __init__(self, values=None):
+        self.values = values if values else {}
+
+    def get(self, key, default=None):
+        """Returns a gitflow setting, e.g. get('prefix.release')"""
+        return self.values.get("%s.%s" % (GitflowConfig.SECTION, key), default)
+
+    def get_prefixes(self):
+        """Returns every gitflow.prefix.* setting, keyed by name"""
+        return self.get_all('prefix')
+
+    def get_all(self, subsection):
+        """Returns every gitflow.<subsection>.* setting, keyed by name"""
+        start = "%s.%s." % (GitflowConfig.SECTION, subsection)
+        return dict(
+            (key[len(start):], value)
+            for key, value in self.values.items()
+            if key.startswith(start)
+        )
+
+    @staticmethod
+    def current():
+        """Returns the shared config, loading it on first use"""
+        if GitflowConfig.CURRENT is None:
+            GitflowConfig.CURRENT = GitflowConfig.load()
+        return GitflowConfig.CURRENT
+
+    @staticmethod
+    def clear():
+        """Drops the shared config"""
+        GitflowConfig.CURRENT = None
+
+    @staticmethod
+    def load():
+        """Reads the config natively, or through git when that fails"""
+        try:
+            return GitflowConfig(GitflowConfig.read_files())
+        except UnsupportedLayout:
+            return GitflowConfig(GitflowConfig.read_git_config())
+
+    @staticmethod
+    def read_git_config():
+        """Reads every gitflow setting with a single git config call"""
+        try:
+            output = ProcessRunner.run(
+                check_output,
+                [
+                    'git',
+                    'config',
+                    '--get-regexp',
+                    r"^%s\." % GitflowConfig.SECTION
+                ],
+                universal_newlines=True
+            )
+        except CalledProcessError:
+            return {}
+        values = {}
+        for line in output.splitlines():
+            key, _, value = line.partition(' ')
+            values[key] = value
+        return values
+
+    @staticmethod
+    def read_files():
+        """Parses the system, global, and local config files in order"""
+        for variable in GitflowConfig.ENVIRONMENT_OVERRIDES:
+            if variable in environ:
+                raise UnsupportedLayout("%s is set" % variable)
+        values = {}
+        for path in GitflowConfig.get_config_paths():
+            if isfile(path):
+                GitflowConfig.parse_file(path, values)
+        if 'extensions.worktreeconfig' in values:
+            raise UnsupportedLayout('worktree config is not supported')
+        return dict(
+            (key, value)
+            for key, value in values.items()
+            if key.startswith(GitflowConfig.SECTION + '.')
+        )
+
+    @staticmethod
+    def get_config_paths():
+        """Lists config files from lowest to highest precedence"""
+        paths = []
+        if 'GIT_CONFIG_NOSYSTEM' not in environ:
+            if 'GIT_CONFIG_SYSTEM' not in environ:
+                raise UnsupportedLayout('the system config path is unknown')
+            paths.append(environ['GIT_CONFIG_SYSTEM'])
+        if 'GIT_CONFIG_GLOBAL' in environ:
+            paths.append(environ['GIT_CONFIG_GLOBAL'])
+        else:
+            paths.append(join(
+                environ.get('XDG_CONFIG_HOME', expanduser('~/.config')),
+                'git',
+                'config'
+            ))
+            paths.append(expanduser('~/.gitconfig'))
+        paths.append(join(GitDir.current().common_dir, 'config'))
+        return paths
+
+    @staticmethod
+    def parse_file(path, values, depth=0):
+        """Parses one config file into values, following includes"""
+        if GitflowConfig.MAX_INCLUDE_DEPTH < depth:
+            raise UnsupportedLayout('includes nest too deeply')
+        try:
+            with io_open(path, encoding='utf-8') as handle:
+                lines = handle.read().splitlines()
+        except (IOError, OSError, UnicodeDecodeError):
+            raise UnsupportedLayout("%s is unreadable" % path)
+        section = None
+        index = 0
+        while index < len(lines):
+            line = lines[index].strip()
+            index += 1
+            if line.startswith('['):
+                section, line = GitflowConfig.parse_section(line)
+            if not line or line[0] in '#;':
+                continue
+            if section is None:
+                raise UnsupportedLayout("%s has a key outside a section" % path)
+            name, _, raw_value = line.partition('=')
+            name = name.strip().lower()
+            if not name.replace('-', '').isalnum():
+                raise UnsupportedLayout("%s has an invalid key" % path)
+            if not _:
+                value = 'true'
+            else:
+                while GitflowConfig.continues(raw_value) and index < len(lines):
+                    raw_value = raw_value[:-1] + lines[index]
+                    index += 1
+                value = GitflowConfig.parse_value(raw_value)
+            key = "%s.%s" % (section, name)
+            if key.startswith('includeif.'):
+                raise UnsupportedLayout('includeIf is not supported')
+            if 'include.path' == key:
+                include = GitflowConfig.resolve_include(path, value)
+                if isfile(include):
+                    GitflowConfig.parse_file(include, values, depth + 1)
+            else:
+                values[key] = value
+
+    @staticmethod
+    def parse_section(line):
+        """Splits a section header from anything following it"""
+        end = line.find(']')
+        if -1 == end:
+            raise UnsupportedLayout('unterminated section header')
+        header, rest = line[1:end].strip(), line[end + 1:].strip()
+        name, _, subsection = header.partition(' ')
+        if _:
+            subsection = subsection.strip()
+            if not (
+                    2 <= len(subsection)
+                    and
+                    subsection.startswith('"')
+                    and
+                    subsection.endswith('"')
+            ):
+                raise UnsupportedLayout('malformed subsection')
+            subsection = subsection[1:-1].replace('\\"', '"').replace(
+                '\\\\',
+                '\\'
+            )
+            return "%s.%s" % (name.lower(), subsection), rest
+        if '.' in name:
+            name, _, subsection = name.partition('.')
+            return "%s.%s" % (name.lower(), subsection.lower()), rest
+        return name.lower(), rest
+
+    @staticmethod
+    def continues(raw_value):
+        """Checks if a value ends with an unescaped line continuation"""
+        trailing = len(raw_value) - len(raw_value.rstrip('\\'))
+        return 1 == trailing % 2
+
+    @staticmethod
+    def parse_value(raw_value):
+        """Unquotes and unescapes a config value"""
+        value = []
+        pending_space = ''
+        quoted = False
+        index = 0
+        raw_value = raw_value.strip()
+        while index < len(raw_value):
+            character = raw_value[index]
+            index += 1
+            if '"' == character:
+                quoted = not quoted
+                value.append(pending_space)
+                pending_space = ''
+            elif '\\' == character:
+                if index >= len(raw_value):
+                    raise UnsupportedLayout('dangling escape')
+                escaped = raw_value[index]
+                index += 1
+                if escaped not in GitflowConfig.ESCAPES:
+                    raise UnsupportedLayout('unknown escape')
+                value.append(pending_space + GitflowConfig.ESCAPES[escaped])
+                pending_space = ''
+            elif not quoted and character in '#;':
+                break
+            elif not quoted and character.isspace():
+                pending_space += character
+            else:
+                value.append(pending_space + character)
+                pending_space = ''
+        if quoted:
+            raise UnsupportedLayout('unterminated quote')
+        return ''.join(value)
+
+    @staticmethod
+    def resolve_include(path, include):
+        """Resolves an include path relative to the including file"""
+        include = expanduser(include)
+        if isabs(include):
+            return include
+        return join(dirname(path), include)
@@ -2,11 +2,96 @@
 This file provides a utility function to check if a version is proper semver
 """
 
-from re import compile as re_compile, match
+from re import compile as re_compile, MULTILINE
 
-SEMVER_PATTERN = re_compile(r'\s*v?\d+\.\d+\.\d+\s*')
+# Core components keep accepting leading zeros, as they always have; the
+# pre-release and build parts follow the SemVer 2.0 grammar. Digits are
+# spelled [0-9] since \d would also take non-ASCII digits on Python 3
+SEMVER_BODY = (
+    r'v?(?P<major>[0-9]+)\.(?P<minor>[0-9]+)\.(?P<patch>[0-9]+)'
+    r'(?:-(?P<prerelease>'
+    r'(?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)'
+    r'(?:\.(?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*))*'
+    r'))?'
+    r'(?:\+(?P<build>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?'
+)
 
+SEMVER_PATTERN = re_compile(r'\s*%s\s*$' % SEMVER_BODY)
 
-def is_semver(version):
-    """Checks if a version string is semver"""
-    return not match(SEMVER_PATTERN, version) is None
+# Matches one version per line of a newline-joined listing
+SEMVER_LINE_PATTERN = re_compile(
+    r'^[ \t]*(?P<version>%s)[ \t]*$' % SEMVER_BODY,
+    MULTILINE
+)
+
+DIGITS = frozenset('0123456789')
+CORE_CHARACTERS = DIGITS | frozenset('.')
+IDENTIFIER_CHARACTERS = CORE_CHARACTERS | frozenset(
+    '-abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+)
+
+
+def tokenize_semver(version, strict=False):
+    """
+    Validates and splits a version in a single pass without a regex, returning
+    (major, minor, patch, prerelease, build) or None when it isn't semver.
+    Lenient mode accepts what SEMVER_PATTERN does, surrounding whitespace, a
+    leading v, and zero-padded components included; strict mode only accepts
+    versions exactly as SemVer 2.0 spells them.
+    """
+    if not strict:
+        version = version.strip()
+        if version[:1] == 'v':
+            version = version[1:]
+    # Most tags that aren't semver are words, so reject them before splitting
+    if version[:1] not in DIGITS:
+        return None
+    core, plus, build = version.partition('+')
+    core, dash, prerelease = core.partition('-')
+    if not CORE_CHARACTERS.issuperset(core):
+        return None
+    try:
+        major, minor, patch = core.split('.')
+    except ValueError:
+        return None
+    if not (major and minor and patch):
+        return None
+    if strict and (
+            (major[0] == '0' and major != '0')
+            or (minor[0] == '0' and minor != '0')
+            or (patch[0] == '0' and patch != '0')
+    ):
+        return None
+    if dash:
+        if not IDENTIFIER_CHARACTERS.issuperset(prerelease):
+            return None
+        for identifier in prerelease.split('.'):
+            if not identifier or (
+                    identifier[0] == '0'
+                    and 1 < len(identifier)
+                    and DIGITS.issuperset(identifier)
+            ):
+                return None
+    if plus and (
+            not IDENTIFIER_CHARACTERS.issuperset(build)
+            or '' in build.split('.')
+    ):
+        return None
+    return (
+        int(major),
+        int(minor),
+        int(patch),
+        prerelease if prerelease else None,
+        build if build else None
+    )
+
+
+def is_semver(version, strict=False):
+    """
+    Checks if a version string is semver. A lenient yes/no is answered by the
+    regex, which CPython runs in C and which bails out of junk sooner; strict
+    checks go through the tokenizer.
+    """
+    if strict:
+        return tokenize_semver(version, True) is not None
+    return SEMVER_PATTERN.match(version) is not None
@@ -0,0 +1,67 @@
+"""This file provides the LatestSubcommand class"""
+
+from __future__ import print_function
+
+from argparse_color_formatter import ColorHelpFormatter
+
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.semver import SemVer
+from gitflow_easyrelease.subcommand import Subcommand
+
+
+class LatestSubcommand(Subcommand):
+    """This class prints the latest tagged versions instead of releasing."""
+
+    def __init__(self, subcommand='latest', help_string=''):
+        super(LatestSubcommand, self).__init__(
+            subcommand,
+            help_string,
+            has_version=False,
+            has_base=False
+        )
+
+    def attach_subparser(self, subparsers):
+        """Adds its subparser to the parent parser"""
+        parser = subparsers.add_parser(
+            self.subcommand,
+            description=self.help_string,
+            formatter_class=ColorHelpFormatter,
+            help=self.help_string
+        )
+        parser.add_argument(
+            'line',
+            nargs='?',
+            default=None,
+            help='Optional release line, e.g. 2 or 3.4',
+            type=Subcommand.release_line
+        )
+        parser.add_argument(
+            '--per-major',
+            action='store_true',
+            help='Print the latest version of every major release'
+        )
+        parser.add_argument(
+            '--pre',
+            action='store_true',
+            help='Consider pre-release tags too'
+        )
+
+    def execute(self, parsed_args):
+        """Prints the requested versions"""
+        with ProcessRunner.phase('version'):
+            index = SemVer.get_version_index()
+            if getattr(parsed_args, 'pre', False) is not True:
+                index = index.get_releases()
+            if getattr(parsed_args, 'per_major', False) is True:
+                for version in index.latest_per_major().values():
+                    print(version)
+                return
+            line = getattr(parsed_args, 'line', None)
+            latest = index.latest(line)
+        if latest is None:
+            raise ValueError(
+                "No tags were found on the %s line" % line
+                if line
+                else 'No semver tags were found'
+            )
+        print(latest)
@@ -0,0 +1,243 @@
+"""This file provides the Metrics class"""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+from io import open as io_open
+from os import environ
+from os.path import abspath
+from time import time
+
+try:
+    from fcntl import flock, LOCK_EX
+except ImportError:  # pragma: no cover
+    flock = None
+
+from gitflow_easyrelease.atomic_file import atomic_write
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.semver import SemVer
+
+
+class Metrics(object):
+    """
+    This class keeps cumulative run metrics in a Prometheus textfile collector
+    file. Each run adds its own samples to whatever is already there while
+    holding an exclusive lock on a sibling .lock file, then atomically
+    replaces the file, so concurrent runs never lose each other's samples and
+    the collector never reads a partial file.
+    """
+
+    ENVIRONMENT = 'EASYRELEASE_METRICS'
+    PATH = None
+    BASELINE = {'hits': 0, 'misses': 0}
+    BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+    FAMILIES = OrderedDict([
+        ('easyrelease_runs_total', (
+            'counter',
+            'Runs by subcommand and outcome'
+        )),
+        ('easyrelease_run_duration_seconds', (
+            'histogram',
+            'Wall time of each run'
+        )),
+        ('easyrelease_child_processes_total', (
+            'counter',
+            'Child processes started, by command'
+        )),
+        ('easyrelease_child_process_seconds_total', (
+            'counter',
+            'Wall time spent in child processes, by command'
+        )),
+        ('easyrelease_version_cache_hits_total', (
+            'counter',
+            'Version strings parsed from the SemVer cache'
+        )),
+        ('easyrelease_version_cache_misses_total', (
+            'counter',
+            'Version strings parsed without the SemVer cache'
+        )),
+        ('easyrelease_last_run_timestamp_seconds', (
+            'gauge',
+            'When the last run finished'
+        )),
+    ])
+    SUFFIXES = ['_bucket', '_sum', '_count']
+
+    @staticmethod
+    def get_path():
+        """Returns the file to update, or None when metrics are off"""
+        if Metrics.PATH:
+            return Metrics.PATH
+        return environ.get(Metrics.ENVIRONMENT) or None
+
+    @staticmethod
+    def start():
+        """Notes the SemVer cache counters, so a run only counts its own lookups"""
+        Metrics.BASELINE = SemVer.get_cache_info()
+
+    @staticmethod
+    def collect(subcommand, succeeded, duration):
+        """Returns this run's samples, keyed by (name, labels)"""
+        samples = OrderedDict()
+        labels = {'subcommand': subcommand}
+        Metrics.add(samples, 'easyrelease_runs_total', 1, {
+            'subcommand': subcommand,
+            'outcome': 'success' if succeeded else 'failure',
+        })
+        family = 'easyrelease_run_duration_seconds'
+        for bucket in Metrics.BUCKETS + [None]:
+            Metrics.add(
+                samples,
+                family + '_bucket',
+                1 if bucket is None or duration <= bucket else 0,
+                dict(labels, le='+Inf' if bucket is None else "%g" % bucket)
+            )
+        Metrics.add(samples, family + '_sum', duration, labels)
+        Metrics.add(samples, family + '_count', 1, labels)
+        for record in ProcessRunner.RECORDS:
+            command = dict(labels, command=Metrics.get_command_name(record['command']))
+            Metrics.add(samples, 'easyrelease_child_processes_total', 1, command)
+            Metrics.add(
+                samples,
+                'easyrelease_child_process_seconds_total',
+                record['duration'],
+                command
+            )
+        cache = SemVer.get_cache_info()
+        Metrics.add(
+            samples,
+            'easyrelease_version_cache_hits_total',
+            cache['hits'] - Metrics.BASELINE['hits'],
+            labels
+        )
+        Metrics.add(
+            samples,
+            'easyrelease_version_cache_misses_total',
+            cache['misses'] - Metrics.BASELINE['misses'],
+            labels
+        )
+        Metrics.add(
+            samples,
+            'easyrelease_last_run_timestamp_seconds',
+            time(),
+            labels
+        )
+        return samples
+
+    @staticmethod
+    def add(samples, name, value, labels):
+        """Adds value to a sample"""
+        key = (name, Metrics.format_labels(labels))
+        samples[key] = samples.get(key, 0) + value
+
+    @staticmethod
+    def get_command_name(command):
+        """Names a command by its program and subcommand, e.g. git for-each-ref"""
+        words = [command[0]] if command else []
+        index = 1
+        while index < len(command):
+            if '-c' == command[index]:
+                index += 2
+            elif command[index].startswith('-'):
+                index += 1
+            else:
+                words.append(command[index])
+                break
+        return ' '.join(words)
+
+    @staticmethod
+    def format_labels(labels):
+        """Renders labels in a stable order, escaped for the text format"""
+        return '{%s}' % ','.join(
+            '%s="%s"' % (
+                name,
+                ("%s" % value).replace('\\', '\\\\').replace('"', '\\"').replace(
+                    '\n',
+                    '\\n'
+                )
+            )
+            for name, value in sorted(labels.items())
+        )
+
+    @staticmethod
+    def get_family(name):
+        """Finds the family a sample belongs to"""
+        if name in Metrics.FAMILIES:
+            return name
+        for suffix in Metrics.SUFFIXES:
+            if name.endswith(suffix) and name[:-len(suffix)] in Metrics.FAMILIES:
+                return name[:-len(suffix)]
+        return None
+
+    @staticmethod
+    def parse(text):
+        """Reads the samples back out of a file it wrote, skipping anything else"""
+        samples = OrderedDict()
+        for line in text.splitlines():
+            if not line or line.startswith('#'):
+                continue
+            sample, _, value = line.rpartition(' ')
+            name, brace, labels = sample.partition('{')
+            if Metrics.get_family(name) is None:
+                continue
+            try:
+                samples[(name, brace + labels)] = float(value)
+            except ValueError:
+                continue
+        return samples
+
+    @staticmethod
+    def merge(existing, increments):
+        """Adds counters and histograms together; gauges take the new value"""
+        merged = OrderedDict(existing)
+        for key, value in increments.items():
+            family = Metrics.get_family(key[0])
+            if 'gauge' == Metrics.FAMILIES[family][0]:
+                merged[key] = value
+            else:
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    @staticmethod
+    def render(samples):
+        """Writes the samples out family by family, with HELP and TYPE lines"""
+        families = OrderedDict((family, []) for family in Metrics.FAMILIES)
+        for (name, labels), value in samples.items():
+            families[Metrics.get_family(name)].append(
+                "%s%s %s" % (name, labels, Metrics.format_value(value))
+            )
+        lines = []
+        for family, family_lines in families.items():
+            if family_lines:
+                kind, help_string = Metrics.FAMILIES[family]
+                lines.append("# HELP %s %s" % (family, help_string))
+                lines.append("# TYPE %s %s" % (family, kind))
+                lines.extend(family_lines)
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def format_value(value):
+        """Prints whole numbers without a decimal point"""
+        if float(value).is_integer():
+            return "%d" % value
+        return repr(float(value))
+
+    @staticmethod
+    def update(path, subcommand, succeeded, duration):
+        """Merges this run into the file under an exclusive lock"""
+        path = abspath(path)
+        increments = Metrics.collect(subcommand, succeeded, duration)
+        with open(path + '.lock', 'a') as lock:
+            if flock is not None:
+                flock(lock.fileno(), LOCK_EX)
+            try:
+                with io_open(path, encoding='utf-8') as handle:
+                    existing = Metrics.parse(handle.read())
+            except (IOError, OSError, UnicodeDecodeError):
+                existing = OrderedDict()
+            Metrics.write(path, Metrics.merge(existing, increments))
+
+    @staticmethod
+    def write(path, samples):
+        """Atomically replaces the file"""
+        atomic_write(path, Metrics.render(samples), '.metrics.', 0o644)
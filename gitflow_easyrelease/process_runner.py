@@ -0,0 +1,211 @@
+"""This file provides the ProcessRunner class"""
+
+from __future__ import print_function
+
+from contextlib import contextmanager
+from subprocess import CalledProcessError
+from sys import stderr
+
+try:
+    from time import perf_counter as clock
+except ImportError:  # pragma: no cover
+    from time import time as clock
+
+
+class ProcessRunner(object):
+    """
+    This class is the one place child processes are started from. Callers pass
+    in the function that spawns the process (check_output, call, or Popen),
+    so every command is recorded with its phase, wall time, and exit status
+    no matter how it's run. The records feed the --profile summary and the
+    trace.
+    """
+
+    STARTED = clock()
+    PROFILE = False
+    PHASE = 'setup'
+    RECORDS = []
+    PHASES = []
+    SPANS = []
+    PENDING = {}
+    SLOWEST = 10
+
+    @staticmethod
+    def run(function, command, **kwargs):
+        """
+        Calls function(command, **kwargs) and records how long it took; a
+        CalledProcessError's status is recorded before it's re-raised
+        """
+        record = ProcessRunner.begin(command)
+        try:
+            result = function(command, **kwargs)
+        except CalledProcessError as error:
+            ProcessRunner.end(record, error.returncode)
+            raise
+        except OSError:
+            ProcessRunner.end(record, None)
+            raise
+        ProcessRunner.end(
+            record,
+            result if isinstance(result, int) and not isinstance(result, bool) else 0
+        )
+        return result
+
+    @staticmethod
+    def spawn(function, command, **kwargs):
+        """Starts a process with function, usually Popen, to be finished by wait"""
+        record = ProcessRunner.begin(command)
+        try:
+            process = function(command, **kwargs)
+        except OSError:
+            ProcessRunner.end(record, None)
+            raise
+        ProcessRunner.PENDING[id(process)] = record
+        return process
+
+    @staticmethod
+    def wait(process):
+        """Waits for a spawned process and records its exit status"""
+        returncode = process.wait()
+        record = ProcessRunner.PENDING.pop(id(process), None)
+        if record is not None:
+            ProcessRunner.end(record, returncode)
+        return returncode
+
+    @staticmethod
+    def get_elapsed():
+        """Returns the seconds since the run started"""
+        return clock() - ProcessRunner.STARTED
+
+    @staticmethod
+    def begin(command):
+        """Starts a record for a command in the current phase"""
+        return {
+            'command': list(command),
+            'phase': ProcessRunner.PHASE,
+            'start': clock() - ProcessRunner.STARTED,
+            'duration': None,
+            'status': None,
+        }
+
+    @staticmethod
+    def end(record, status):
+        """Completes a record and keeps it"""
+        record['duration'] = clock() - ProcessRunner.STARTED - record['start']
+        record['status'] = status
+        ProcessRunner.RECORDS.append(record)
+
+    @staticmethod
+    @contextmanager
+    def phase(name):
+        """Attributes everything run inside the block to a named phase"""
+        previous = ProcessRunner.PHASE
+        ProcessRunner.PHASE = name
+        start = clock() - ProcessRunner.STARTED
+        try:
+            yield
+        finally:
+            ProcessRunner.PHASE = previous
+            ProcessRunner.PHASES.append({
+                'name': name,
+                'start': start,
+                'duration': clock() - ProcessRunner.STARTED - start,
+            })
+
+    @staticmethod
+    @contextmanager
+    def span(name, category):
+        """Times a block for the trace without changing the phase"""
+        start = clock() - ProcessRunner.STARTED
+        try:
+            yield
+        finally:
+            ProcessRunner.SPANS.append({
+                'name': name,
+                'category': category,
+                'start': start,
+                'duration': clock() - ProcessRunner.STARTED - start,
+            })
+
+    @staticmethod
+    def clear():
+        """Forgets every record and restarts the clock"""
+        ProcessRunner.STARTED = clock()
+        ProcessRunner.PHASE = 'setup'
+        ProcessRunner.RECORDS = []
+        ProcessRunner.PHASES = []
+        ProcessRunner.SPANS = []
+        ProcessRunner.PENDING = {}
+
+    @staticmethod
+    def get_summary():
+        """
+        Totals the time spent overall and in children, and, per phase, its
+        wall time (None outside any phase), process count, and child time
+        """
+        total = ProcessRunner.get_elapsed()
+        children = sum(record['duration'] for record in ProcessRunner.RECORDS)
+        phases = {}
+        for phase in ProcessRunner.PHASES:
+            wall, count, duration = phases.get(phase['name'], (0.0, 0, 0.0))
+            phases[phase['name']] = (wall + phase['duration'], count, duration)
+        for record in ProcessRunner.RECORDS:
+            wall, count, duration = phases.get(record['phase'], (None, 0, 0.0))
+            phases[record['phase']] = (
+                wall,
+                count + 1,
+                duration + record['duration']
+            )
+        return {
+            'total': total,
+            'children': children,
+            'python': max(total - children, 0.0),
+            'processes': len(ProcessRunner.RECORDS),
+            'phases': sorted(
+                phases.items(),
+                key=lambda item: (item[1][0] or 0.0, item[1][2]),
+                reverse=True
+            ),
+            'slowest': sorted(
+                ProcessRunner.RECORDS,
+                key=lambda record: record['duration'],
+                reverse=True
+            )[:ProcessRunner.SLOWEST],
+        }
+
+    @staticmethod
+    def print_summary(stream=None):
+        """Prints the profile, slowest phases and commands first"""
+        stream = stream if stream else stderr
+        summary = ProcessRunner.get_summary()
+        print(
+            "Total %.3fs: %.3fs in Python, %.3fs in %d child processes"
+            % (
+                summary['total'],
+                summary['python'],
+                summary['children'],
+                summary['processes']
+            ),
+            file=stream
+        )
+        for name, (wall, count, duration) in summary['phases']:
+            print(
+                "  %-20s %9s %3d processes %8.3fs" % (
+                    name,
+                    '-' if wall is None else "%.3fs" % wall,
+                    count,
+                    duration
+                ),
+                file=stream
+            )
+        if summary['slowest']:
+            print('Slowest commands:', file=stream)
+        for record in summary['slowest']:
+            print(
+                "  %8.3fs  %-6s %s" % (
+                    record['duration'],
+                    'failed' if record['status'] is None else record['status'],
+                    ' '.join(record['command'])
+                ),
+                file=stream
+            )
@@ -0,0 +1,87 @@
+"""This file provides the ReachabilityCache class"""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+from io import open as io_open
+from os import makedirs
+from os.path import dirname, isdir, join
+from time import time
+
+from gitflow_easyrelease.atomic_file import atomic_write
+from gitflow_easyrelease.git_dir import GitDir
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.tag_index import TagIndex
+
+
+class ReachabilityCache(object):
+    """
+    This class remembers the highest semver tag reachable from each commit
+    it has been asked about, so repeated bumps from the same base don't walk
+    history again. Entries are keyed by commit id and dropped wholesale when
+    the tags change, using the same fingerprint as TagIndex.
+    """
+
+    FORMAT = 'easyrelease-reachable 1'
+    PATH = join('easyrelease', 'reachable')
+    MAX_ENTRIES = 256
+
+    def __init__(self, fingerprint='', entries=None, path=None):
+        self.fingerprint = fingerprint
+        self.entries = entries if entries is not None else OrderedDict()
+        self.path = path
+
+    def write(self):
+        """Atomically replaces the cache file"""
+        directory = dirname(self.path)
+        if not isdir(directory):
+            makedirs(directory)
+        lines = [ReachabilityCache.FORMAT, self.fingerprint]
+        lines.extend(
+            "%s %s" % (commit, tag)
+            for commit, tag in self.entries.items()
+        )
+        atomic_write(self.path, '\n'.join(lines) + '\n', 'reachable.')
+
+    @staticmethod
+    def lookup(commit, find):
+        """
+        Returns the highest semver tag reachable from commit, or '' when none
+        is. find is only called for commits the cache hasn't seen since the
+        tags last changed.
+        """
+        with ProcessRunner.span('ReachabilityCache.lookup', 'cache'):
+            git_dir = GitDir.current()
+            path = join(git_dir.common_dir, ReachabilityCache.PATH)
+            fingerprint, newest = TagIndex.get_fingerprint(git_dir)
+            cache = ReachabilityCache.read(path)
+            if cache is None or cache.fingerprint != fingerprint:
+                cache = ReachabilityCache(fingerprint, path=path)
+            if commit in cache.entries:
+                return cache.entries[commit]
+            tag = find(commit) or ''
+            cache.entries[commit] = tag
+            while ReachabilityCache.MAX_ENTRIES < len(cache.entries):
+                cache.entries.popitem(last=False)
+            if TagIndex.RACY_SECONDS < time() - newest:
+                try:
+                    cache.write()
+                except (IOError, OSError):
+                    pass
+            return tag
+
+    @staticmethod
+    def read(path):
+        """Reads the cache, or None when it's missing or outdated"""
+        try:
+            with io_open(path, encoding='utf-8') as handle:
+                lines = handle.read().splitlines()
+        except (IOError, OSError, UnicodeDecodeError):
+            return None
+        if len(lines) < 2 or ReachabilityCache.FORMAT != lines[0]:
+            return None
+        entries = OrderedDict()
+        for line in lines[2:]:
+            commit, _, tag = line.partition(' ')
+            entries[commit] = tag
+        return ReachabilityCache(lines[1], entries, path)
@@ -0,0 +1,275 @@
+"""This file provides the ReleaseEngine class"""
+
+from __future__ import print_function
+
+from os import access, listdir, X_OK
+from os.path import isfile, join
+from subprocess import call, check_output
+
+from gitflow_easyrelease.git_dir import GitDir, UnsupportedLayout
+from gitflow_easyrelease.gitflow_config import GitflowConfig
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.repo_snapshot import RepoSnapshot
+
+
+class UnsupportedRelease(Exception):
+    """Raised when a release action needs git-flow to be performed correctly"""
+
+
+class ReleaseEngine(object):
+    """
+    This class performs git flow release actions with plain git commands
+    instead of the git-flow scripts, which fork dozens of processes per
+    action. Branch names, the origin, and release.<action>.* defaults come
+    from the gitflow config. Anything it can't reproduce exactly (hooks,
+    filters, or options it doesn't know) raises UnsupportedRelease before
+    touching the repo, so git-flow can take over.
+    """
+
+    NATIVE = False
+    FLAGS = {
+        'finish': {
+            '-k': 'keep',
+            '--keep': 'keep',
+            '-n': 'notag',
+            '--notag': 'notag',
+            '-p': 'push',
+            '--push': 'push',
+            '-b': 'nobackmerge',
+            '--nobackmerge': 'nobackmerge',
+        },
+        'delete': {
+            '-f': 'force',
+            '--force': 'force',
+            '-r': 'remote',
+            '--remote': 'remote',
+        },
+    }
+    MESSAGE_OPTIONS = ['-m', '--message']
+    TRUE_VALUES = ['true', 'yes', 'on', '1']
+
+    def __init__(self, version, base=None, options=None):
+        self.version = "%s" % version
+        self.base = base
+        self.options = options if options else []
+        self.config = GitflowConfig.current()
+        self.snapshot = RepoSnapshot.current()
+        self.branch = self.snapshot.get_prefix('release', 'release/') + self.version
+        self.tag = self.snapshot.get_prefix('versiontag', '') + self.version
+        self.master = self.config.get('branch.master', 'master')
+        self.develop = self.config.get('branch.develop', 'develop')
+        self.origin = self.config.get('origin', 'origin')
+        self.flags = {}
+        self.message = None
+
+    def run(self, action):
+        """Performs an action, raising UnsupportedRelease before any change"""
+        if not hasattr(self, "run_%s" % action):
+            raise UnsupportedRelease("'%s' is not supported" % action)
+        self.check_hooks(action)
+        self.parse_options(action)
+        try:
+            getattr(self, "run_%s" % action)()
+        finally:
+            RepoSnapshot.clear()
+            GitflowConfig.clear()
+
+    def run_start(self):
+        """Branches the release off of base, or develop"""
+        base = self.base if self.base else self.develop
+        prefix = self.snapshot.get_prefix('release', 'release/')
+        for branch in self.snapshot.branches:
+            if branch.startswith(prefix):
+                raise ValueError(
+                    "There is an existing release branch '%s'. Finish that one first."
+                    % branch
+                )
+        if self.tag in self.snapshot.tags:
+            raise ValueError("Tag '%s' already exists" % self.tag)
+        if not self.snapshot.has_branch(base):
+            raise ValueError("'%s' is not a local or remote branch" % base)
+        self.require_clean_working_tree()
+        ReleaseEngine.git('checkout', '-q', '-b', self.branch, base)
+        if base != self.develop:
+            ReleaseEngine.git(
+                'config',
+                "gitflow.branch.%s.base" % self.branch,
+                base
+            )
+
+    def run_finish(self):
+        """Merges the release into master, tags it, and merges it back"""
+        self.require_branch()
+        self.require_clean_working_tree()
+        develop = self.get_base_branch()
+        head = self.snapshot.head
+        if not ReleaseEngine.is_merged(self.branch, self.master):
+            ReleaseEngine.git('checkout', '-q', self.master)
+            ReleaseEngine.git('merge', '-q', '--no-ff', '--no-edit', self.branch)
+            head = self.master
+        if not self.flags['notag'] and self.tag not in self.snapshot.tags:
+            ReleaseEngine.git(
+                'tag',
+                '-a',
+                '-m',
+                self.message if self.message else self.tag,
+                self.tag,
+                self.master
+            )
+        if self.flags['nobackmerge']:
+            backmerge = self.branch
+        else:
+            backmerge = self.master if self.flags['notag'] else self.tag
+        if not ReleaseEngine.is_merged(backmerge, develop):
+            ReleaseEngine.git('checkout', '-q', develop)
+            ReleaseEngine.git('merge', '-q', '--no-ff', '--no-edit', backmerge)
+            head = develop
+        if not self.flags['keep']:
+            if head == self.branch:
+                ReleaseEngine.git('checkout', '-q', develop)
+            self.delete_branch()
+        if self.flags['push']:
+            refspecs = [self.master, develop]
+            if not self.flags['notag']:
+                refspecs.append("refs/tags/%s" % self.tag)
+            if not self.flags['keep'] and self.has_remote_branch():
+                refspecs.append(":refs/heads/%s" % self.branch)
+            ReleaseEngine.git('push', '-q', self.origin, *refspecs)
+
+    def run_publish(self):
+        """Pushes the release branch and tracks it"""
+        self.require_branch()
+        self.require_clean_working_tree()
+        if self.has_remote_branch():
+            raise ValueError(
+                "Branch '%s/%s' already exists" % (self.origin, self.branch)
+            )
+        ReleaseEngine.git(
+            'push',
+            '-q',
+            '--set-upstream',
+            self.origin,
+            "%s:refs/heads/%s" % (self.branch, self.branch)
+        )
+        if self.snapshot.head != self.branch:
+            ReleaseEngine.git('checkout', '-q', self.branch)
+
+    def run_delete(self):
+        """Deletes the release branch, and its remote with -r"""
+        self.require_branch()
+        if self.snapshot.head == self.branch:
+            ReleaseEngine.git('checkout', '-q', self.master)
+        self.delete_branch(self.flags['force'])
+        if self.flags['remote'] and self.has_remote_branch():
+            ReleaseEngine.git(
+                'push',
+                '-q',
+                self.origin,
+                ":refs/heads/%s" % self.branch
+            )
+
+    def require_branch(self):
+        """Ensures the release branch exists locally"""
+        if not self.snapshot.has_branch(self.branch):
+            raise ValueError("Branch '%s' does not exist" % self.branch)
+
+    @staticmethod
+    def require_clean_working_tree():
+        """Ensures nothing tracked has been changed"""
+        if ReleaseEngine.git(
+                'status',
+                '--porcelain',
+                '--untracked-files=no',
+                '--ignore-submodules'
+        ).strip():
+            raise ValueError(
+                'Working tree contains unstaged or uncommitted changes'
+            )
+
+    def has_remote_branch(self):
+        """Checks if the origin has the release branch"""
+        return self.snapshot.has_branch("%s/%s" % (self.origin, self.branch))
+
+    def get_base_branch(self):
+        """Returns the branch the release was started from"""
+        return self.config.get("branch.%s.base" % self.branch, self.develop)
+
+    def delete_branch(self, force=False):
+        """Deletes the local release branch and its recorded base"""
+        ReleaseEngine.git('branch', '-q', '-D' if force else '-d', self.branch)
+        if self.config.get("branch.%s.base" % self.branch) is not None:
+            ReleaseEngine.git(
+                'config',
+                '--unset',
+                "gitflow.branch.%s.base" % self.branch
+            )
+
+    def parse_options(self, action):
+        """
+        Reads the flags an action takes, starting from the config defaults
+        git-flow would use, then the options passed through
+        """
+        flags = ReleaseEngine.FLAGS.get(action, {})
+        defaults = self.config.get_all("release.%s" % action)
+        for key, value in defaults.items():
+            if 'message' == key and 'finish' == action:
+                self.message = value
+            elif key in flags.values():
+                self.flags[key] = value.lower() in ReleaseEngine.TRUE_VALUES
+            elif value.lower() not in ['', 'false', 'no', 'off', '0']:
+                raise UnsupportedRelease(
+                    "gitflow.release.%s.%s is set" % (action, key)
+                )
+        for name in flags.values():
+            self.flags.setdefault(name, False)
+        options = list(self.options)
+        while options:
+            option = options.pop(0)
+            name, equals, value = option.partition('=')
+            if name in ReleaseEngine.MESSAGE_OPTIONS and 'finish' == action:
+                if not equals:
+                    if not options:
+                        raise UnsupportedRelease("%s needs a value" % name)
+                    value = options.pop(0)
+                self.message = value
+            elif option in flags:
+                self.flags[flags[option]] = True
+            elif option.startswith('--no') and "--%s" % option[4:] in flags:
+                self.flags[flags["--%s" % option[4:]]] = False
+            else:
+                raise UnsupportedRelease("'%s' needs git-flow" % option)
+
+    def check_hooks(self, action):
+        """Ensures no git-flow hook or filter applies to the action"""
+        path = self.config.get('path.hooks')
+        if not path:
+            try:
+                path = join(GitDir.current().common_dir, 'hooks')
+            except UnsupportedLayout as error:
+                raise UnsupportedRelease(str(error))
+        try:
+            names = listdir(path)
+        except (IOError, OSError):
+            return
+        marker = "-flow-release-%s" % action
+        for name in names:
+            hook = join(path, name)
+            if marker in name and isfile(hook) and access(hook, X_OK):
+                raise UnsupportedRelease("%s needs git-flow" % name)
+
+    @staticmethod
+    def git(*args):
+        """Runs a git command and returns its output"""
+        return ProcessRunner.run(
+            check_output,
+            ('git',) + args,
+            universal_newlines=True
+        )
+
+    @staticmethod
+    def is_merged(commit, branch):
+        """Checks if commit is already part of branch"""
+        return 0 == ProcessRunner.run(
+            call,
+            ['git', 'merge-base', '--is-ancestor', commit, branch]
+        )
@@ -2,14 +2,25 @@
 
 from __future__ import print_function
 
-from subprocess import CalledProcessError, check_output
+from subprocess import CalledProcessError, check_output, PIPE, Popen
 
-from gitflow_easyrelease import is_semver
+try:
+    from shutil import which
+except ImportError:  # pragma: no cover
+    from distutils.spawn import find_executable as which
+
+from gitflow_easyrelease.git_dir import GitDir, UnsupportedLayout
+from gitflow_easyrelease.is_semver import is_semver, SEMVER_PATTERN, tokenize_semver
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.repo_snapshot import RepoSnapshot
 
 
 class RepoInfo(object):
     """This utility class provides information about the underlying repo"""
 
+    GIT_FLOW = None
+    TAG_PREFIX = 'refs/tags/'
+
     def __init__(self):
         self.prefix = RepoInfo.get_release_prefix()
         self.branch = RepoInfo.get_active_branch()
@@ -26,52 +37,51 @@ class RepoInfo(object):
         """Converts the active branch to semver or returns None"""
         if self.is_release_branch():
             branch = self.tidy_branch()
+            found = SEMVER_PATTERN.match(branch)
+            if found:
+                return list(found.group(
+                    'major',
+                    'minor',
+                    'patch',
+                    'prerelease',
+                    'build'
+                ))
             return branch.split('.')
         return None
 
     @staticmethod
     def ensure_git_flow():
-        """Ensures git flow is available"""
-        check_output(['which', 'git-flow'])
+        """Ensures git flow is available, searching PATH once per process"""
+        if RepoInfo.GIT_FLOW is None:
+            RepoInfo.GIT_FLOW = which('git-flow') or ''
+        if not RepoInfo.GIT_FLOW:
+            raise OSError('git-flow was not found on the PATH')
+        return RepoInfo.GIT_FLOW
 
     @staticmethod
     def get_release_prefix():
         """Determines the git flow release branch prefix"""
-        try:
-            return check_output([
-                'git',
-                'config',
-                'gitflow.prefix.release'
-            ]).strip()
-        except CalledProcessError:
-            return 'release/'
+        return RepoSnapshot.current().get_prefix('release', 'release/')
 
     @staticmethod
     def get_active_branch():
         """Determines the active branch"""
-        return check_output([
-            'git',
-            'rev-parse',
-            '--abbrev-ref',
-            'HEAD'
-        ]).strip()
+        return RepoSnapshot.current().head
 
     @staticmethod
     def get_branches():
         """Gets all available branches"""
-        return check_output([
-            'git',
-            'for-each-ref',
-            '--format',
-            '%(refname:short)',
-            'refs/heads/',
-            'refs/remotes/'
-        ]).strip().split('\n')
+        return list(RepoSnapshot.current().branches)
+
+    @staticmethod
+    def has_branch(branch):
+        """Checks if a local or remote branch exists"""
+        return RepoSnapshot.current().has_branch(branch)
 
     @staticmethod
     def get_tags():
         """Returns all defined tags"""
-        return check_output(['git', 'tag']).strip().split('\n')
+        return list(RepoSnapshot.current().tags)
 
     @staticmethod
     def get_semver_tags():
@@ -81,3 +91,118 @@ class RepoInfo(object):
             for version in RepoInfo.get_tags()
             if is_semver(version)
         ]
+
+    @staticmethod
+    def iter_tags():
+        """
+        Yields tags one at a time, without buffering the whole listing. The
+        git directory is checked before anything is yielded; when it can't be
+        read, git lists the tags instead.
+        """
+        try:
+            refnames = GitDir.current().iter_refs(RepoInfo.TAG_PREFIX)
+        except UnsupportedLayout:
+            refnames = RepoInfo.stream_refs(RepoInfo.TAG_PREFIX)
+        for refname in refnames:
+            yield refname[len(RepoInfo.TAG_PREFIX):]
+
+    @staticmethod
+    def iter_semver_tags():
+        """Yields semver tags one at a time"""
+        for tag in RepoInfo.iter_tags():
+            if is_semver(tag):
+                yield tag
+
+    @staticmethod
+    def get_newest_semver_tags():
+        """
+        Has git sort the versiontag-prefixed tags newest first, then reads only
+        the semver tags sharing the newest major.minor.patch. git can't order
+        pre-release identifiers exactly, so those few are left to the caller.
+        Tags with and without a leading v are sorted apart, since git would
+        put every v tag above every bare one.
+        """
+        with ProcessRunner.span('RepoInfo.get_newest_semver_tags', 'repo'):
+            prefix = RepoSnapshot.current().get_prefix('versiontag', '')
+            patterns = [prefix + '[0-9]*']
+            if 'v' != prefix[-1:]:
+                patterns.append(prefix + 'v[0-9]*')
+            tags = []
+            for pattern in patterns:
+                tags.extend(RepoInfo.read_newest_core(RepoInfo.TAG_PREFIX + pattern))
+        if not tags:
+            return []
+        cores = [tokenize_semver(tag)[:3] for tag in tags]
+        newest = max(cores)
+        return [tag for tag, core in zip(tags, cores) if core == newest]
+
+    @staticmethod
+    def read_newest_core(pattern):
+        """Reads the semver tags matching pattern that share the newest core"""
+        refnames = RepoInfo.stream_refs(pattern, '-version:refname')
+        tags = []
+        core = None
+        try:
+            for refname in refnames:
+                tag = refname[len(RepoInfo.TAG_PREFIX):]
+                tokens = tokenize_semver(tag)
+                if not tokens:
+                    continue
+                if core is None:
+                    core = tokens[:3]
+                elif core != tokens[:3]:
+                    break
+                tags.append(tag)
+        finally:
+            refnames.close()
+        return tags
+
+    @staticmethod
+    def resolve_commit(revision):
+        """Resolves a revision, like a branch, to its commit id"""
+        return ProcessRunner.run(
+            check_output,
+            ['git', 'rev-parse', '--verify', "%s^{commit}" % revision],
+            universal_newlines=True
+        ).strip()
+
+    @staticmethod
+    def iter_reachable_semver_tags(commit):
+        """Yields the semver tags reachable from commit with one history walk"""
+        for refname in RepoInfo.stream_refs(RepoInfo.TAG_PREFIX, merged=commit):
+            tag = refname[len(RepoInfo.TAG_PREFIX):]
+            if is_semver(tag):
+                yield tag
+
+    @staticmethod
+    def stream_refs(pattern, sort=None, merged=None):
+        """
+        Streams refnames from for-each-ref as git prints them. Sorted output
+        puts pre-releases below their release; merged limits the refs to those
+        reachable from that commit.
+        """
+        command = ['git', 'for-each-ref', '--format', '%(refname)']
+        if sort:
+            command[1:1] = ['-c', 'versionsort.suffix=-']
+            command.append("--sort=%s" % sort)
+        if merged:
+            command.append("--merged=%s" % merged)
+        command.append(pattern)
+        process = ProcessRunner.spawn(
+            Popen,
+            command,
+            stdout=PIPE,
+            universal_newlines=True
+        )
+        completed = False
+        try:
+            for line in process.stdout:
+                yield line.rstrip('\n')
+            completed = True
+        finally:
+            process.stdout.close()
+            if not completed and process.poll() is None:
+                process.kill()
+            returncode = ProcessRunner.wait(process)
+        if returncode:
+            raise CalledProcessError(returncode, command)
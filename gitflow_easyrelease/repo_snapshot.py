@@ -0,0 +1,191 @@
+"""This file provides the RepoSnapshot class"""
+
+from __future__ import print_function
+
+from subprocess import check_output
+
+from gitflow_easyrelease.git_dir import GitDir, UnsupportedLayout
+from gitflow_easyrelease.gitflow_config import GitflowConfig
+from gitflow_easyrelease.process_runner import ProcessRunner
+
+
+class RepoSnapshot(object):
+    """
+    This class gathers everything an invocation needs to know about the repo
+    (HEAD, branches, tags, and the gitflow prefixes). Refs come straight from
+    the git directory when its layout is understood and from a single
+    for-each-ref otherwise; prefixes come from the shared GitflowConfig. The
+    shared instance lives until clear is called.
+    """
+
+    CURRENT = None
+    REF_KINDS = [
+        ('branches', 'refs/heads/'),
+        ('branches', 'refs/remotes/'),
+        ('tags', 'refs/tags/'),
+    ]
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            head='HEAD',
+            branches=None,
+            tags=None,
+            prefixes=None,
+            refs_loader=None
+    ):
+        self.head = head
+        self.prefixes = prefixes if prefixes else {}
+        self.refs_loader = refs_loader
+        self.refs = (
+            None
+            if refs_loader
+            else {
+                'branches': branches if branches else [],
+                'tags': tags if tags else [],
+            }
+        )
+        self.cached_branch_set = None
+
+    def get_prefix(self, name, default=''):
+        """Returns a gitflow prefix"""
+        return self.prefixes.get(name, default)
+
+    def get_refs(self):
+        """Returns the branches and tags, listing them on first use"""
+        if self.refs is None:
+            with ProcessRunner.span('RepoSnapshot.get_refs', 'repo'):
+                self.refs = self.refs_loader()
+        return self.refs
+
+    @property
+    def branches(self):
+        """All local and remote branches"""
+        return self.get_refs()['branches']
+
+    @property
+    def tags(self):
+        """All tags"""
+        return self.get_refs()['tags']
+
+    @property
+    def branch_set(self):
+        """The branches as a set, for membership checks"""
+        if self.cached_branch_set is None:
+            self.cached_branch_set = frozenset(self.branches)
+        return self.cached_branch_set
+
+    def has_branch(self, branch):
+        """
+        Checks if a local or remote branch exists. Until the refs have been
+        listed, only refs/heads/<branch> and refs/remotes/<branch> are read.
+        """
+        if self.refs is not None:
+            return branch in self.branch_set
+        refnames = [
+            prefix + branch
+            for kind, prefix in RepoSnapshot.REF_KINDS
+            if 'branches' == kind
+        ]
+        try:
+            git_dir = GitDir.current()
+            return any(git_dir.has_ref(refname) for refname in refnames)
+        except UnsupportedLayout:
+            output = ProcessRunner.run(
+                check_output,
+                ['git', 'for-each-ref', '--format', '%(refname)'] + refnames,
+                universal_newlines=True
+            )
+            return bool(set(refnames) & set(output.splitlines()))
+
+    @staticmethod
+    def current():
+        """Returns the shared snapshot, loading it on first use"""
+        if RepoSnapshot.CURRENT is None:
+            with ProcessRunner.span('RepoSnapshot.load', 'repo'):
+                RepoSnapshot.CURRENT = RepoSnapshot.load()
+        return RepoSnapshot.CURRENT
+
+    @staticmethod
+    def clear():
+        """Drops the shared snapshot so the next use reloads it"""
+        RepoSnapshot.CURRENT = None
+
+    @staticmethod
+    def load():
+        """
+        Builds a snapshot from the repo. When the git directory is readable
+        only HEAD is read up front; refs are listed the first time they're
+        needed.
+        """
+        prefixes = GitflowConfig.current().get_prefixes()
+        try:
+            head = GitDir.current().read_head()
+        except UnsupportedLayout:
+            head, refs = RepoSnapshot.read_refs()
+            return RepoSnapshot(head, refs['branches'], refs['tags'], prefixes)
+        return RepoSnapshot(
+            head,
+            prefixes=prefixes,
+            refs_loader=RepoSnapshot.load_refs
+        )
+
+    @staticmethod
+    def load_refs():
+        """Lists branches and tags, preferring the git directory"""
+        try:
+            return RepoSnapshot.read_git_dir()[1]
+        except UnsupportedLayout:
+            return RepoSnapshot.read_refs()[1]
+
+    @staticmethod
+    def read_git_dir():
+        """Reads HEAD, branches, and tags without spawning git"""
+        git_dir = GitDir.current()
+        head = git_dir.read_head()
+        return RepoSnapshot.split_refs(
+            git_dir.read_refs(
+                [prefix for _, prefix in RepoSnapshot.REF_KINDS]
+            ),
+            "refs/heads/%s" % head
+        )
+
+    @staticmethod
+    def read_refs():
+        """Lists HEAD, branches, and tags with a single for-each-ref"""
+        output = ProcessRunner.run(
+            check_output,
+            [
+                'git',
+                'for-each-ref',
+                '--format',
+                '%(HEAD) %(refname)',
+            ] + [prefix for _, prefix in RepoSnapshot.REF_KINDS],
+            universal_newlines=True
+        )
+        return RepoSnapshot.parse_refs(output.splitlines())
+
+    @staticmethod
+    def parse_refs(lines):
+        """Splits for-each-ref output into HEAD, branches, and tags"""
+        head_refname = None
+        refnames = []
+        for line in lines:
+            if '*' == line[:1]:
+                head_refname = line[2:]
+            refnames.append(line[2:])
+        return RepoSnapshot.split_refs(refnames, head_refname)
+
+    @staticmethod
+    def split_refs(refnames, head_refname=None):
+        """Sorts refnames into branches and tags and finds HEAD among them"""
+        head = 'HEAD'
+        refs = {'branches': [], 'tags': []}
+        for refname in refnames:
+            for kind, prefix in RepoSnapshot.REF_KINDS:
+                if refname.startswith(prefix):
+                    name = refname[len(prefix):]
+                    refs[kind].append(name)
+                    if refname == head_refname:
+                        head = name
+                    break
+        return head, refs
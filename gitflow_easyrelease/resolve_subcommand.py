@@ -0,0 +1,62 @@
+"""This file provides the ResolveSubcommand class"""
+
+from __future__ import print_function
+
+from argparse import ArgumentTypeError
+
+from argparse_color_formatter import ColorHelpFormatter
+
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.subcommand import Subcommand
+from gitflow_easyrelease.version_constraint import VersionConstraint
+
+
+class ResolveSubcommand(Subcommand):
+    """This class prints the highest tag satisfying a version constraint."""
+
+    def __init__(self, subcommand='resolve', help_string=''):
+        super(ResolveSubcommand, self).__init__(
+            subcommand,
+            help_string,
+            has_version=False,
+            has_base=False
+        )
+
+    def attach_subparser(self, subparsers):
+        """Adds its subparser to the parent parser"""
+        parser = subparsers.add_parser(
+            self.subcommand,
+            description=self.help_string,
+            formatter_class=ColorHelpFormatter,
+            help=self.help_string
+        )
+        parser.add_argument(
+            'constraint',
+            help="A constraint like '^1.2', '~1.2.3', or '>=2.0,<3'",
+            type=ResolveSubcommand.version_constraint
+        )
+        parser.add_argument(
+            '--pre',
+            action='store_true',
+            help='Consider pre-release tags too'
+        )
+
+    def execute(self, parsed_args):
+        """Prints the highest matching version"""
+        constraint = parsed_args.constraint
+        with ProcessRunner.phase('version'):
+            version = VersionConstraint.find_highest(
+                constraint.constraint,
+                getattr(parsed_args, 'pre', False) is True
+            )
+        if version is None:
+            raise ValueError("No tags satisfy '%s'" % constraint)
+        print(version)
+
+    @staticmethod
+    def version_constraint(constraint):
+        """Validates a supplied constraint"""
+        try:
+            return VersionConstraint(constraint)
+        except ValueError as error:
+            raise ArgumentTypeError(str(error))
@@ -2,35 +2,97 @@
 
 from __future__ import print_function
 
-from gitflow_easyrelease import is_semver, RepoInfo
+from collections import OrderedDict
+
+from gitflow_easyrelease.git_dir import UnsupportedLayout
+from gitflow_easyrelease.is_semver import tokenize_semver
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.reachability_cache import ReachabilityCache
+from gitflow_easyrelease.repo_info import RepoInfo
+from gitflow_easyrelease.tag_index import TagIndex
+from gitflow_easyrelease.version_columns import VersionColumns
+from gitflow_easyrelease.version_index import VersionIndex
 
 
 class SemVer(object):
-    """This class encapsulates semantic versioning logic."""
+    """
+    This class encapsulates semantic versioning logic. Instances are immutable
+    and ordered by a precomputed SemVer 2.0 precedence key, so sorting, max,
+    bisect, and hashing don't need to inspect components. Build metadata is
+    kept for display but doesn't affect precedence.
+    """
+
+    # __init__ sets the slots through object.__setattr__, which pylint can't
+    # follow
+    # pylint: disable=no-member
+    __slots__ = ('key', 'prerelease', 'build')
 
     PATCH_KEYS = ['p', 'patch', '~']
     MINOR_KEYS = ['m', 'minor', '^']
     MAJOR_KEYS = ['M', 'major']
     ALL_KEYS = PATCH_KEYS + MINOR_KEYS + MAJOR_KEYS
+    GIT_SORT = False
+
+    RELEASE_KEY = (1,)
+    CACHE = OrderedDict()
+    CACHE_SIZE = 4096
+    CACHE_HITS = 0
+    CACHE_MISSES = 0
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            major=0,
+            minor=0,
+            patch=0,
+            prerelease=None,
+            build=None
+    ):
+        prerelease = prerelease if prerelease else None
+        object.__setattr__(self, 'prerelease', prerelease)
+        object.__setattr__(self, 'build', build if build else None)
+        object.__setattr__(self, 'key', (
+            int(major),
+            int(minor),
+            int(patch),
+            SemVer.prerelease_key(prerelease)
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SemVer is immutable; can't set %s" % name)
+
+    def __delattr__(self, name):
+        raise AttributeError("SemVer is immutable; can't delete %s" % name)
+
+    def __reduce__(self):
+        return (
+            SemVer,
+            self.key[:3] + (self.prerelease, self.build)
+        )
 
-    def __init__(self, major=0, minor=0, patch=0):
-        self.major = int(major)
-        self.minor = int(minor)
-        self.patch = int(patch)
+    @property
+    def major(self):
+        """The major component"""
+        return self.key[0]
+
+    @property
+    def minor(self):
+        """The minor component"""
+        return self.key[1]
+
+    @property
+    def patch(self):
+        """The patch component"""
+        return self.key[2]
 
     def compare(self, version=None):
-        """Compares its own semver against version"""
+        """
+        Compares its own semver against version; 1 means version is higher,
+        -1 means it's lower or missing
+        """
         if not isinstance(version, SemVer):
             version = SemVer.from_version(version)
         if version:
-            for component in ['major', 'minor', 'patch']:
-                comparison = SemVer.compare_component(
-                    getattr(self, component),
-                    getattr(version, component)
-                )
-                if 0 != comparison:
-                    return comparison
-            return 0
+            return SemVer.compare_component(self.key, version.key)
         return -1
 
     def greater(self, version=None):
@@ -46,25 +108,88 @@ class SemVer(object):
         return 0 == self.compare(version)
 
     def bump(self, component=None):
-        """Increases the semver using the specified component"""
-        if component in SemVer.ALL_KEYS:
-            if component in SemVer.PATCH_KEYS:
-                self.patch = self.patch + 1
-            else:
-                self.patch = 0
-                if component in SemVer.MINOR_KEYS:
-                    self.minor = self.minor + 1
-                else:
-                    self.minor = 0
-                    self.major = self.major + 1
+        """
+        Returns the semver increased using the specified component. A
+        pre-release is bumped to its own release when that is what the
+        component points at, e.g. a minor bump of 1.4.0-rc.2 is 1.4.0.
+        """
+        major, minor, patch = self.key[:3]
+        if component in SemVer.PATCH_KEYS:
+            if self.prerelease:
+                return SemVer(major, minor, patch)
+            return SemVer(major, minor, patch + 1)
+        if component in SemVer.MINOR_KEYS:
+            if self.prerelease and 0 == patch:
+                return SemVer(major, minor)
+            return SemVer(major, minor + 1)
+        if component in SemVer.MAJOR_KEYS:
+            if self.prerelease and 0 == minor and 0 == patch:
+                return SemVer(major)
+            return SemVer(major + 1)
         return self
 
+    def __eq__(self, other):
+        if isinstance(other, SemVer):
+            return self.key == other.key
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, SemVer):
+            return self.key != other.key
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, SemVer):
+            return self.key < other.key
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, SemVer):
+            return self.key <= other.key
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, SemVer):
+            return self.key > other.key
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, SemVer):
+            return self.key >= other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
+
     def __repr__(self):
-        return "%d.%d.%d" % (self.major, self.minor, self.patch)
+        version = "%d.%d.%d" % self.key[:3]
+        if self.prerelease:
+            version += '-' + self.prerelease
+        if self.build:
+            version += '+' + self.build
+        return version
+
+    @staticmethod
+    def prerelease_key(prerelease=None):
+        """
+        Builds the precedence key for a pre-release. Releases outrank any
+        pre-release; numeric identifiers compare numerically and rank below
+        alphanumeric ones, which compare in ASCII order; a longer list of
+        identifiers wins when the shorter one is its prefix.
+        """
+        if not prerelease:
+            return SemVer.RELEASE_KEY
+        key = [0]
+        for identifier in prerelease.split('.'):
+            if identifier.isdigit():
+                key.append((0, int(identifier), ''))
+            else:
+                key.append((1, 0, identifier))
+        return tuple(key)
 
     @staticmethod
     def compare_component(first, second):
-        """Compares two semver components"""
+        """Compares two semver components or keys"""
         if first < second:
             return 1
         elif first > second:
@@ -73,11 +198,89 @@ class SemVer(object):
 
     @staticmethod
     def from_version(version):
-        """Creates a SemVer object from a version string"""
-        if is_semver(version):
-            return SemVer(*version.replace('v', '').split('.'))
+        """
+        Returns the SemVer for a version string, or 0.0.0 when it isn't semver.
+        Instances are immutable, so the most recently used CACHE_SIZE of them
+        are shared between callers.
+        """
+        semver = SemVer.lookup(version)
+        return semver if semver is not None else SemVer()
+
+    @staticmethod
+    def lookup(version):
+        """
+        Returns the cached SemVer for a version string, or None when it isn't
+        semver, tokenizing it only the first time it's seen
+        """
+        try:
+            semver = SemVer.CACHE.pop(version)
+        except KeyError:
+            SemVer.CACHE_MISSES += 1
+            tokens = tokenize_semver(version)
+            semver = SemVer(*tokens) if tokens else None
+            while SemVer.CACHE_SIZE <= len(SemVer.CACHE):
+                try:
+                    SemVer.CACHE.popitem(last=False)
+                except KeyError:
+                    break
+        else:
+            SemVer.CACHE_HITS += 1
+        if 0 < SemVer.CACHE_SIZE:
+            SemVer.CACHE[version] = semver
+        return semver
+
+    @staticmethod
+    def get_cache_info():
+        """Reports how well from_version's cache is doing"""
+        return {
+            'hits': SemVer.CACHE_HITS,
+            'misses': SemVer.CACHE_MISSES,
+            'size': len(SemVer.CACHE),
+            'max_size': SemVer.CACHE_SIZE,
+        }
+
+    @staticmethod
+    def clear_cache():
+        """Empties from_version's cache and resets its counters"""
+        SemVer.CACHE.clear()
+        SemVer.CACHE_HITS = 0
+        SemVer.CACHE_MISSES = 0
+
+    @staticmethod
+    def parse_version(version, strict=False):
+        """Creates a SemVer object from a version string, uncached"""
+        tokens = tokenize_semver(version, strict)
+        if tokens:
+            return SemVer(*tokens)
         return SemVer()
 
+    @staticmethod
+    def parse_many(versions, use_numpy=False):
+        """
+        Parses a whole listing with a single regex pass into VersionColumns,
+        dropping anything that isn't semver
+        """
+        return VersionColumns.parse('\n'.join(versions), use_numpy)
+
+    @staticmethod
+    def from_columns(columns, index):
+        """Creates a SemVer object from one row of VersionColumns"""
+        return SemVer(
+            columns.major[index],
+            columns.minor[index],
+            columns.patch[index],
+            columns.prerelease[index],
+            columns.build[index]
+        )
+
+    @staticmethod
+    def get_latest_in(columns):
+        """Finds the highest version in VersionColumns, or None"""
+        return SemVer.get_max_version(
+            SemVer.from_columns(columns, index)
+            for index in columns.newest()
+        )
+
     @staticmethod
     def is_component(version):
         """Checks if a version string is a semver component"""
@@ -92,28 +295,119 @@ class SemVer(object):
         return args
 
     @staticmethod
-    def get_current_version():
-        """Gets either the active semver or the topmost semver"""
+    def sort_key(version):
+        """Orders version strings by their semver components"""
+        return SemVer.from_version(version).key
+
+    @staticmethod
+    def get_sorted_tags():
+        """Returns the semver tags from lowest to highest"""
+        return sorted(RepoInfo.iter_semver_tags(), key=SemVer.sort_key)
+
+    @staticmethod
+    def iter_versions(tags):
+        """Parses tags into SemVer objects as they arrive"""
+        for tag in tags:
+            yield SemVer.from_version(tag)
+
+    @staticmethod
+    def get_max_version(versions):
+        """Finds the highest version in a single pass, or None"""
+        max_version = None
+        for version in versions:
+            if max_version is None or max_version.key < version.key:
+                max_version = version
+        return max_version
+
+    @staticmethod
+    def get_latest_version():
+        """
+        Finds the highest tagged version through the tag index, or by streaming
+        every tag once when there's no usable git directory. With GIT_SORT set,
+        git orders the tags and only the newest one is read.
+        """
+        if SemVer.GIT_SORT:
+            return SemVer.get_max_version(
+                SemVer.iter_versions(RepoInfo.get_newest_semver_tags())
+            )
+        try:
+            latest = TagIndex.load(SemVer.get_sorted_tags).latest
+        except UnsupportedLayout:
+            return SemVer.get_max_version(
+                SemVer.iter_versions(RepoInfo.iter_semver_tags())
+            )
+        return SemVer.from_version(latest) if latest else None
+
+    @staticmethod
+    def get_version_index():
+        """Builds a VersionIndex over every semver tag"""
+        with ProcessRunner.span('SemVer.get_version_index', 'version'):
+            try:
+                tags = TagIndex.load(SemVer.get_sorted_tags).get_tags()
+            except UnsupportedLayout:
+                tags = SemVer.get_sorted_tags()
+            return VersionIndex(list(SemVer.iter_versions(tags)))
+
+    @staticmethod
+    def get_line_version(line):
+        """Gets the topmost semver on a release line like 2 or 3.4"""
+        latest = SemVer.get_version_index().latest(line)
+        if latest is None:
+            raise ValueError("No tags were found on the %s line" % line)
+        return latest
+
+    @staticmethod
+    def find_reachable_tag(commit):
+        """Finds the highest semver tag reachable from commit, or None"""
+        tags = list(RepoInfo.iter_reachable_semver_tags(commit))
+        return max(tags, key=SemVer.sort_key) if tags else None
+
+    @staticmethod
+    def get_reachable_version(revision='HEAD'):
+        """
+        Gets the topmost semver reachable from revision, reusing the answer
+        cached for its commit when the tags haven't changed
+        """
+        commit = RepoInfo.resolve_commit(revision)
+        try:
+            tag = ReachabilityCache.lookup(commit, SemVer.find_reachable_tag)
+        except UnsupportedLayout:
+            tag = SemVer.find_reachable_tag(commit)
+        return SemVer.from_version(tag) if tag else None
+
+    @staticmethod
+    def get_current_version(line=None, reachable_from=None):
+        """
+        Gets either the active semver or the topmost semver, or the topmost
+        semver on line or reachable from a revision when one is given
+        """
+        if line:
+            return SemVer.get_line_version(line)
+        if reachable_from:
+            reachable = SemVer.get_reachable_version(reachable_from)
+            return reachable if reachable else SemVer()
         active = SemVer.get_active_branch()
         if active:
             return active
-        versions = RepoInfo.get_semver_tags()
-        if versions:
-            max_version = SemVer.from_version(versions.pop())
-            for version in versions:
-                semver = SemVer.from_version(version)
-                if semver.greater(max_version):
-                    max_version = semver
-            return max_version
+        latest = SemVer.get_latest_version()
+        if latest:
+            return latest
         return SemVer()
 
     @staticmethod
-    def process_version(version=None):
-        """Creates a new SemVer from the version input"""
+    def process_version(version=None, line=None, reachable_from=None):
+        """
+        Creates a new SemVer from the version input; bumps start from the top
+        of line, or from what's reachable from a revision, when one is given
+        """
         if version:
-            if is_semver(version):
-                return SemVer.from_version(version)
+            semver = SemVer.lookup(version)
+            if semver is not None:
+                return semver
             elif SemVer.is_component(version):
-                return SemVer.get_current_version().bump(version)
+                return SemVer.get_current_version(
+                    line,
+                    reachable_from
+                ).bump(version)
             return version
         return SemVer.get_active_branch()
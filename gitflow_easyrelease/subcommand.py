@@ -2,16 +2,38 @@
 
 from __future__ import print_function
 
-from subprocess import check_output
+from argparse import ArgumentTypeError
+from collections import deque
+from subprocess import CalledProcessError, PIPE, Popen, STDOUT
+from sys import stdout
 
 from argparse_color_formatter import ColorHelpFormatter
 
-from gitflow_easyrelease import ColorOutput, RepoInfo, SemVer
+from gitflow_easyrelease.color_output import ColorOutput
+from gitflow_easyrelease.process_runner import ProcessRunner
+from gitflow_easyrelease.release_engine import ReleaseEngine, UnsupportedRelease
+from gitflow_easyrelease.repo_info import RepoInfo
+from gitflow_easyrelease.repo_snapshot import RepoSnapshot
+from gitflow_easyrelease.semver import SemVer
+from gitflow_easyrelease.version_index import VersionIndex
+
+
+class ReleaseCommandError(CalledProcessError):
+    """Raised when a release command fails, carrying the tail of its output"""
+
+    def __str__(self):
+        message = super(ReleaseCommandError, self).__str__()
+        if self.output:
+            return "%s Its last output was:\n%s" % (message, self.output.rstrip())
+        return message
 
 
 class Subcommand(object):
     """This class defines a subcommand to be run against the main app."""
 
+    OUTPUT = None
+    OUTPUT_LINES = 100
+
     def __init__(  # pylint: disable=too-many-arguments
             self,
             subcommand='',
@@ -42,32 +64,49 @@ class Subcommand(object):
         )
         if self.has_version:
             Subcommand.attach_version_argument(parser, self.version_optional)
+            starting_point = parser.add_mutually_exclusive_group()
+            Subcommand.attach_line_argument(starting_point)
+            Subcommand.attach_reachable_argument(starting_point)
         if self.has_base:
             Subcommand.attach_base_argument(parser)
 
     def execute(self, parsed_args):
         """Executes its action"""
-        version = (
-            SemVer.process_version(parsed_args.version)
-            if self.has_version and hasattr(parsed_args, 'version')
-            else SemVer()
-        )
-        if version is None:
-            raise ValueError(
-                'Version was not passed in and the repo is not on a release branch'
-            )
         base = (
             parsed_args.base
             if self.has_base and hasattr(parsed_args, 'base')
             else None
         )
+        reachable_from = getattr(parsed_args, 'reachable_from', None)
+        if getattr(parsed_args, 'reachable', False) is True:
+            reachable_from = base if base else 'HEAD'
+        with ProcessRunner.phase('version'):
+            version = (
+                SemVer.process_version(
+                    parsed_args.version,
+                    getattr(parsed_args, 'line', None),
+                    reachable_from
+                )
+                if self.has_version and hasattr(parsed_args, 'version')
+                else SemVer()
+            )
+        if version is None:
+            raise ValueError(
+                'Version was not passed in and the repo is not on a release branch'
+            )
         options = (
             parsed_args.options
             if hasattr(parsed_args, 'options')
             else None
         )
+        if self.release_commands and not ReleaseEngine.NATIVE:
+            with ProcessRunner.phase('git-flow lookup'):
+                RepoInfo.ensure_git_flow()
         for command in self.release_commands:
-            Subcommand.execute_release_command(command, version, base, options)
+            with ProcessRunner.phase("release %s" % command):
+                Subcommand.run_release_command(command, version, base, options)
+        if self.release_commands:
+            RepoSnapshot.clear()
 
     @staticmethod
     def attach_version_argument(parser, version_optional=True):
@@ -90,6 +129,40 @@ class Subcommand(object):
             options['nargs'] = '?'
         parser.add_argument('version', **options)
 
+    @staticmethod
+    def attach_line_argument(parser):
+        """Adds an option to bump from the top of a release line"""
+        parser.add_argument(
+            '--line',
+            default=None,
+            help='Bump from the latest tag on this release line, e.g. 2 or 3.4',
+            type=Subcommand.release_line
+        )
+
+    @staticmethod
+    def attach_reachable_argument(parser):
+        """Adds options to bump from the topmost tag reachable from a commit"""
+        parser.add_argument(
+            '--reachable',
+            action='store_true',
+            help='Bump from the latest tag reachable from base, or HEAD'
+        )
+        parser.add_argument(
+            '--reachable-from',
+            default=None,
+            metavar='REVISION',
+            help='Bump from the latest tag reachable from REVISION'
+        )
+
+    @staticmethod
+    def release_line(line):
+        """Validates a supplied release line"""
+        try:
+            VersionIndex.parse_line(line)
+        except ValueError as error:
+            raise ArgumentTypeError(str(error))
+        return line
+
     @staticmethod
     def attach_base_argument(parser):
         """Adds a base branch argument"""
@@ -98,10 +171,32 @@ class Subcommand(object):
             nargs="?",
             default=None,
             help="Optional base branch",
-            choices=RepoInfo.get_branches(),
-            type=str
+            type=Subcommand.base_branch
         )
 
+    @staticmethod
+    def base_branch(branch):
+        """Validates a supplied base branch"""
+        if RepoInfo.has_branch(branch):
+            return branch
+        raise ArgumentTypeError(
+            "'%s' is not a local or remote branch" % branch
+        )
+
+    @staticmethod
+    def run_release_command(command, version, base=None, options=None):
+        """
+        Runs a release subcommand with the native engine when it's enabled
+        and can handle it, and through git flow otherwise
+        """
+        if ReleaseEngine.NATIVE:
+            try:
+                ReleaseEngine(version, base, options).run(command)
+                return
+            except UnsupportedRelease:
+                RepoInfo.ensure_git_flow()
+        Subcommand.execute_release_command(command, version, base, options)
+
     @staticmethod
     def execute_release_command(command, version, base=None, options=None):
         """Executes a specific git flow release subcommand"""
@@ -110,4 +205,36 @@ class Subcommand(object):
             command.append(base)
         if options:
             command = command + options
-        check_output(command)
+        Subcommand.stream_command(command)
+
+    @staticmethod
+    def stream_command(command, sink=None):
+        """
+        Copies a command's combined stdout and stderr to sink, or OUTPUT, or
+        stdout, line by line as it runs. Only the last OUTPUT_LINES lines are
+        kept, to report if the command fails.
+        """
+        sink = sink if sink else (Subcommand.OUTPUT if Subcommand.OUTPUT else stdout)
+        tail = deque(maxlen=Subcommand.OUTPUT_LINES)
+        process = ProcessRunner.spawn(
+            Popen,
+            command,
+            stdout=PIPE,
+            stderr=STDOUT,
+            universal_newlines=True
+        )
+        completed = False
+        try:
+            # readline doesn't read ahead, so every line shows up immediately
+            for line in iter(process.stdout.readline, ''):
+                sink.write(line)
+                sink.flush()
+                tail.append(line)
+            completed = True
+        finally:
+            process.stdout.close()
+            if not completed and process.poll() is None:
+                process.kill()
+            returncode = ProcessRunner.wait(process)
+        if returncode:
+            raise ReleaseCommandError(returncode, command, ''.join(tail))
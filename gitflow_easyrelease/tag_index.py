@@ -0,0 +1,120 @@
+"""This file provides the TagIndex class"""
+
+from __future__ import print_function
+
+from io import open as io_open
+from os import listdir, makedirs, stat
+from os.path import dirname, isdir, join
+from time import time
+
+from gitflow_easyrelease.atomic_file import atomic_write
+from gitflow_easyrelease.git_dir import GitDir
+from gitflow_easyrelease.process_runner import ProcessRunner
+
+
+class TagIndex(object):
+    """
+    This class persists the sorted semver tags under the git directory so the
+    latest version can be answered without listing or parsing tags. The index
+    is keyed by the mtimes of packed-refs and the refs/tags directories and is
+    rebuilt whenever they change. Tags are stored newest first, so reading the
+    latest one only touches the header.
+    """
+
+    FORMAT = 'easyrelease-tags 2'
+    RACY_SECONDS = 2
+    PATH = join('easyrelease', 'tags.idx')
+
+    def __init__(self, fingerprint='', latest=None, tags=None, path=None):
+        self.fingerprint = fingerprint
+        self.latest = latest
+        self.path = path
+        self.cached_tags = tags
+
+    def get_tags(self):
+        """Returns every indexed tag, lowest version first"""
+        if self.cached_tags is None:
+            with io_open(self.path, encoding='utf-8') as handle:
+                lines = handle.read().splitlines()
+            self.cached_tags = list(reversed(lines[2:]))
+        return self.cached_tags
+
+    def write(self):
+        """Atomically replaces the index file"""
+        directory = dirname(self.path)
+        if not isdir(directory):
+            makedirs(directory)
+        lines = [TagIndex.FORMAT, self.fingerprint]
+        lines.extend(reversed(self.get_tags()))
+        atomic_write(self.path, '\n'.join(lines) + '\n', 'tags.idx.')
+
+    @staticmethod
+    def load(build):
+        """
+        Returns the index for the current repo. build is only called, and the
+        file only rewritten, when the refs have changed since the last run; it
+        must return the semver tags sorted from lowest to highest.
+        """
+        with ProcessRunner.span('TagIndex.load', 'cache'):
+            git_dir = GitDir.current()
+            path = join(git_dir.common_dir, TagIndex.PATH)
+            fingerprint, newest = TagIndex.get_fingerprint(git_dir)
+            index = TagIndex.read(path)
+            if index is None or index.fingerprint != fingerprint:
+                tags = build()
+                index = TagIndex(
+                    fingerprint,
+                    tags[-1] if tags else None,
+                    tags,
+                    path
+                )
+                # A ref written within the mtime granularity could change again
+                # without changing the fingerprint, so only trust settled refs
+                if TagIndex.RACY_SECONDS < time() - newest:
+                    try:
+                        index.write()
+                    except (IOError, OSError):
+                        pass
+            return index
+
+    @staticmethod
+    def read(path):
+        """Reads the index header, or None when it's missing or outdated"""
+        try:
+            with io_open(path, encoding='utf-8') as handle:
+                if TagIndex.FORMAT != handle.readline().rstrip('\n'):
+                    return None
+                fingerprint = handle.readline().rstrip('\n')
+                latest = handle.readline().rstrip('\n')
+        except (IOError, OSError, UnicodeDecodeError):
+            return None
+        return TagIndex(fingerprint, latest if latest else None, path=path)
+
+    @staticmethod
+    def get_fingerprint(git_dir):
+        """
+        Summarizes every file whose change could add or remove a tag. Returns
+        the summary and the newest mtime involved.
+        """
+        parts = []
+        newest = 0
+        pending = [
+            join(git_dir.common_dir, 'refs', 'tags'),
+            join(git_dir.common_dir, 'packed-refs'),
+        ]
+        while pending:
+            path = pending.pop()
+            try:
+                status = stat(path)
+            except OSError:
+                parts.append('-')
+                continue
+            parts.append("%r:%d" % (status.st_mtime, status.st_size))
+            newest = max(newest, status.st_mtime)
+            if isdir(path):
+                pending.extend(
+                    join(path, name)
+                    for name in sorted(listdir(path), reverse=True)
+                    if isdir(join(path, name))
+                )
+        return ' '.join(parts), newest
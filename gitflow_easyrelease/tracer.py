@@ -0,0 +1,114 @@
+"""This file provides the Tracer class"""
+
+from __future__ import print_function
+
+from os import environ, getpid
+from os.path import abspath
+from sys import argv
+from time import time
+
+from gitflow_easyrelease.atomic_file import atomic_write
+from gitflow_easyrelease.process_runner import ProcessRunner
+
+
+class Tracer(object):
+    """
+    This class exports a run as Chrome trace events, which chrome://tracing
+    and Perfetto both open. Phases and spans are on one track and child
+    processes on another, so it's clear how they overlap. Tracing is off
+    unless --trace or EASYRELEASE_TRACE names a file.
+    """
+
+    ENVIRONMENT = 'EASYRELEASE_TRACE'
+    PATH = None
+    MAIN_TRACK = 0
+    PROCESS_TRACK = 1
+
+    @staticmethod
+    def get_path():
+        """Returns the file to trace to, or None when tracing is off"""
+        if Tracer.PATH:
+            return Tracer.PATH
+        return environ.get(Tracer.ENVIRONMENT) or None
+
+    @staticmethod
+    def get_events():
+        """Converts the recorded phases, spans, and processes to trace events"""
+        pid = getpid()
+        events = [
+            Tracer.create_metadata(pid, Tracer.MAIN_TRACK, 'git easyrelease'),
+            Tracer.create_metadata(pid, Tracer.PROCESS_TRACK, 'child processes'),
+        ]
+        for phase in ProcessRunner.PHASES:
+            events.append(Tracer.create_event(
+                pid,
+                Tracer.MAIN_TRACK,
+                phase['name'],
+                'phase',
+                phase
+            ))
+        for span in ProcessRunner.SPANS:
+            events.append(Tracer.create_event(
+                pid,
+                Tracer.MAIN_TRACK,
+                span['name'],
+                span['category'],
+                span
+            ))
+        for record in ProcessRunner.RECORDS:
+            event = Tracer.create_event(
+                pid,
+                Tracer.PROCESS_TRACK,
+                ' '.join(record['command'][:3]),
+                'process',
+                record
+            )
+            event['args'] = {
+                'command': ' '.join(record['command']),
+                'phase': record['phase'],
+                'status': record['status'],
+            }
+            events.append(event)
+        return events
+
+    @staticmethod
+    def create_event(pid, tid, name, category, timing):
+        """Creates a complete event, in microseconds from the start of the run"""
+        return {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': int(timing['start'] * 1000000),
+            'dur': int(timing['duration'] * 1000000),
+            'pid': pid,
+            'tid': tid,
+        }
+
+    @staticmethod
+    def create_metadata(pid, tid, name):
+        """Names a track"""
+        return {
+            'name': 'thread_name',
+            'ph': 'M',
+            'pid': pid,
+            'tid': tid,
+            'args': {'name': name},
+        }
+
+    @staticmethod
+    def write(path):
+        """
+        Atomically writes the trace. otherData records the arguments and when
+        the run started, so traces from many runs can be told apart.
+        """
+        from json import dumps
+        path = abspath(path)
+        trace = {
+            'traceEvents': Tracer.get_events(),
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'arguments': ' '.join(argv[1:]),
+                'started': time() - ProcessRunner.get_elapsed(),
+            },
+        }
+        atomic_write(path, dumps(trace, sort_keys=True), '.trace.')
@@ -0,0 +1,105 @@
+"""This file provides the VersionColumns class"""
+
+from __future__ import print_function
+
+from array import array
+from collections import defaultdict
+
+from gitflow_easyrelease.is_semver import SEMVER_LINE_PATTERN
+
+
+class VersionColumns(object):
+    """
+    This class holds a parsed tag listing column by column. major, minor, and
+    patch are compact integer arrays (NumPy arrays when requested), so
+    ordering and grouping a large listing doesn't build a SemVer per tag.
+    """
+
+    COMPONENTS = ['major', 'minor', 'patch']
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            versions=None,
+            major=None,
+            minor=None,
+            patch=None,
+            prerelease=None,
+            build=None
+    ):
+        self.versions = versions if versions else ()
+        self.major = major if major is not None else array('l')
+        self.minor = minor if minor is not None else array('l')
+        self.patch = patch if patch is not None else array('l')
+        self.prerelease = prerelease if prerelease else ()
+        self.build = build if build else ()
+
+    def __len__(self):
+        return len(self.versions)
+
+    def is_numpy(self):
+        """Checks if the components are NumPy arrays"""
+        return not isinstance(self.major, array)
+
+    def argsort(self):
+        """
+        Returns the indices ordered by major, minor, then patch. Pre-release
+        order within a core version is left to SemVer.
+        """
+        if self.is_numpy():
+            from numpy import lexsort
+            return lexsort((self.patch, self.minor, self.major))
+        cores = list(zip(self.major, self.minor, self.patch))
+        return sorted(range(len(cores)), key=cores.__getitem__)
+
+    def newest(self):
+        """Returns the indices sharing the highest major.minor.patch"""
+        if not self.versions:
+            return []
+        if self.is_numpy():
+            rows = self.major == self.major.max()
+            rows &= self.minor == self.minor[rows].max()
+            rows &= self.patch == self.patch[rows].max()
+            return list(rows.nonzero()[0])
+        cores = list(zip(self.major, self.minor, self.patch))
+        top = max(cores)
+        return [index for index, core in enumerate(cores) if core == top]
+
+    def group_by(self, component='major'):
+        """Maps each value of a component to the indices holding it"""
+        column = getattr(self, component)
+        if self.is_numpy():
+            from numpy import unique
+            values, inverse = unique(column, return_inverse=True)
+            order = inverse.argsort(kind='stable')
+            bounds = inverse[order].searchsorted(range(len(values) + 1))
+            return dict(
+                (int(value), list(order[bounds[index]:bounds[index + 1]]))
+                for index, value in enumerate(values)
+            )
+        groups = defaultdict(list)
+        for index, value in enumerate(column):
+            groups[value].append(index)
+        return dict(groups)
+
+    @staticmethod
+    def parse(text, use_numpy=False):
+        """
+        Parses a newline-joined listing in one regex pass, skipping anything
+        that isn't semver
+        """
+        found = SEMVER_LINE_PATTERN.findall(text)
+        if not found:
+            return VersionColumns()
+        versions, major, minor, patch, prerelease, build = zip(*found)
+        if use_numpy:
+            from numpy import fromstring, int64
+            columns = [
+                fromstring(' '.join(column), dtype=int64, sep=' ')
+                for column in [major, minor, patch]
+            ]
+        else:
+            columns = [
+                array('l', map(int, column))
+                for column in [major, minor, patch]
+            ]
+        return VersionColumns(versions, *(columns + [prerelease, build]))
@@ -0,0 +1,194 @@
+"""This file provides the VersionConstraint class"""
+
+from __future__ import print_function
+
+from bisect import bisect_left, bisect_right
+from re import compile as re_compile
+
+from gitflow_easyrelease.is_semver import SEMVER_PATTERN
+from gitflow_easyrelease.semver import SemVer
+
+
+class VersionConstraint(object):
+    """
+    This class parses constraints like ^1.2, ~1.2.3, >=2.0,<3, 1.2 - 1.4, or
+    any of those joined with ||, and resolves them against a VersionIndex.
+    Each comparator becomes a pair of key bounds, so resolving is a couple of
+    bisects per comparator instead of a scan.
+    """
+
+    OPERATOR_PATTERN = re_compile(r'(>=|<=|>|<|=|\^|~)\s+')
+    COMPARATOR_PATTERN = re_compile(r'^(>=|<=|>|<|=|\^|~)?(.+)$')
+    WILDCARDS = ['x', 'X', '*']
+
+    def __init__(self, constraint):
+        self.constraint = constraint
+        self.alternatives = VersionConstraint.parse(constraint)
+
+    def __repr__(self):
+        return self.constraint
+
+    def matches(self, version):
+        """Checks if a SemVer satisfies the constraint"""
+        return any(
+            all(
+                VersionConstraint.within(version.key, lower, upper)
+                for lower, upper in bounds
+            )
+            for bounds in self.alternatives
+        )
+
+    def resolve(self, index):
+        """Finds the highest version in a VersionIndex that satisfies it"""
+        best = None
+        for bounds in self.alternatives:
+            start, end = 0, len(index.keys)
+            for lower, upper in bounds:
+                start = max(start, VersionConstraint.find_start(index.keys, lower))
+                end = min(end, VersionConstraint.find_end(index.keys, upper))
+            if start < end and (best is None or best < end - 1):
+                best = end - 1
+        return None if best is None else index.versions[best]
+
+    @staticmethod
+    def find_highest(constraint, include_prereleases=False):
+        """
+        Finds the highest tagged version satisfying a constraint string, only
+        considering releases unless include_prereleases is set
+        """
+        index = SemVer.get_version_index()
+        if not include_prereleases:
+            index = index.get_releases()
+        return VersionConstraint(constraint).resolve(index)
+
+    @staticmethod
+    def within(key, lower, upper):
+        """Checks a key against a pair of bounds"""
+        if lower:
+            bound, inclusive = lower
+            if key < bound or (key == bound and not inclusive):
+                return False
+        if upper:
+            bound, inclusive = upper
+            if key > bound or (key == bound and not inclusive):
+                return False
+        return True
+
+    @staticmethod
+    def find_start(keys, lower):
+        """Finds the first index a lower bound admits"""
+        if not lower:
+            return 0
+        bound, inclusive = lower
+        return (bisect_left if inclusive else bisect_right)(keys, bound)
+
+    @staticmethod
+    def find_end(keys, upper):
+        """Finds the index past the last one an upper bound admits"""
+        if not upper:
+            return len(keys)
+        bound, inclusive = upper
+        return (bisect_right if inclusive else bisect_left)(keys, bound)
+
+    @staticmethod
+    def parse(constraint):
+        """Splits a constraint into alternatives of (lower, upper) bounds"""
+        alternatives = []
+        for alternative in constraint.split('||'):
+            tokens = VersionConstraint.OPERATOR_PATTERN.sub(
+                r'\1',
+                alternative.replace(',', ' ')
+            ).split()
+            bounds = []
+            while tokens:
+                if 3 <= len(tokens) and '-' == tokens[1]:
+                    bounds.append(VersionConstraint.parse_hyphen(
+                        tokens[0],
+                        tokens[2]
+                    ))
+                    tokens = tokens[3:]
+                else:
+                    bounds.append(VersionConstraint.parse_comparator(tokens[0]))
+                    tokens = tokens[1:]
+            alternatives.append(bounds if bounds else [(None, None)])
+        return alternatives
+
+    @staticmethod
+    def parse_hyphen(first, last):
+        """Converts an inclusive first - last range into bounds"""
+        lower, _ = VersionConstraint.parse_comparator(first)
+        _, upper = VersionConstraint.parse_comparator('<=' + last)
+        return lower, upper
+
+    @staticmethod
+    def parse_comparator(comparator):
+        """Converts a single comparator into (lower, upper) bounds"""
+        operator, version = VersionConstraint.COMPARATOR_PATTERN.match(
+            comparator
+        ).groups()
+        prefix = VersionConstraint.parse_version(version, comparator)
+        if isinstance(prefix, SemVer):
+            return VersionConstraint.bound_version(operator, prefix)
+        return VersionConstraint.bound_prefix(operator, prefix)
+
+    @staticmethod
+    def bound_version(operator, version):
+        """Bounds a comparator on a complete version"""
+        key = version.key
+        if '>=' == operator:
+            return (key, True), None
+        if '>' == operator:
+            return (key, False), None
+        if '<=' == operator:
+            return None, (key, True)
+        if '<' == operator:
+            return None, (key, False)
+        major, minor, patch = key[:3]
+        if '^' == operator:
+            if major:
+                return (key, True), ((major + 1,), False)
+            if minor:
+                return (key, True), ((0, minor + 1), False)
+            return (key, True), ((0, 0, patch + 1), False)
+        if '~' == operator:
+            return (key, True), ((major, minor + 1), False)
+        return (key, True), (key, True)
+
+    @staticmethod
+    def bound_prefix(operator, prefix):
+        """Bounds a comparator on a partial version like 1, 1.2, or *"""
+        if not prefix:
+            if operator in ['<', '>']:
+                # Nothing sorts below or above every version
+                return None, ((), False)
+            return None, None
+        following = prefix[:-1] + (prefix[-1] + 1,)
+        if '>=' == operator:
+            return (prefix, True), None
+        if '>' == operator:
+            return (following, True), None
+        if '<=' == operator:
+            return None, (following, False)
+        if '<' == operator:
+            return None, (prefix, False)
+        if '^' == operator:
+            significant = 0
+            while significant < len(prefix) - 1 and 0 == prefix[significant]:
+                significant += 1
+            upper = prefix[:significant] + (prefix[significant] + 1,)
+            return (prefix, True), (upper, False)
+        if '~' == operator and 1 < len(prefix):
+            return (prefix, True), ((prefix[0], prefix[1] + 1), False)
+        return (prefix, True), (following, False)
+
+    @staticmethod
+    def parse_version(version, comparator):
+        """Returns a SemVer for complete versions or a key prefix otherwise"""
+        if SEMVER_PATTERN.match(version):
+            return SemVer.from_version(version)
+        parts = version.lstrip('v').split('.')
+        while parts and parts[-1] in VersionConstraint.WILDCARDS:
+            parts.pop()
+        if len(parts) > 2 or not all(part.isdigit() for part in parts):
+            raise ValueError("'%s' is not a valid constraint" % comparator)
+        return tuple(int(part) for part in parts)
@@ -0,0 +1,78 @@
+"""This file provides the VersionIndex class"""
+
+from __future__ import print_function
+
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+class VersionIndex(object):
+    """
+    This class answers release line queries, like the latest 2.x or 3.4.x,
+    over versions sorted by precedence. Every lookup is a bisect over the
+    versions' keys rather than a scan.
+    """
+
+    def __init__(self, versions=None):
+        self.versions = versions if versions else []
+        self.keys = [version.key for version in self.versions]
+        self.releases = None
+
+    def __len__(self):
+        return len(self.versions)
+
+    def get_releases(self):
+        """Returns an index of the versions that aren't pre-releases"""
+        if self.releases is None:
+            self.releases = VersionIndex([
+                version
+                for version in self.versions
+                if not version.prerelease
+            ])
+        return self.releases
+
+    def get_bounds(self, line=None):
+        """Finds the slice of versions on a release line"""
+        if not line:
+            return 0, len(self.keys)
+        prefix = VersionIndex.parse_line(line)
+        following = prefix[:-1] + (prefix[-1] + 1,)
+        return (
+            bisect_left(self.keys, prefix),
+            bisect_left(self.keys, following)
+        )
+
+    def get_line(self, line=None):
+        """Returns every version on a release line, lowest first"""
+        start, end = self.get_bounds(line)
+        return self.versions[start:end]
+
+    def latest(self, line=None):
+        """Returns the highest version on a release line, or None"""
+        start, end = self.get_bounds(line)
+        if start < end:
+            return self.versions[end - 1]
+        return None
+
+    def latest_per_major(self):
+        """Maps each major version to its highest version, lowest major first"""
+        latest = []
+        end = len(self.keys)
+        while 0 < end:
+            version = self.versions[end - 1]
+            latest.append((version.major, version))
+            end = bisect_left(self.keys, (version.major,))
+        return OrderedDict(reversed(latest))
+
+    @staticmethod
+    def parse_line(line):
+        """Converts a line like 2, 3.4, or v3.4.x into a key prefix"""
+        parts = line.strip().lstrip('v').split('.')
+        if parts and parts[-1] in ['x', 'X', '*']:
+            parts.pop()
+        if not 1 <= len(parts) <= 2 or not all(
+                part.isdigit()
+                for part in parts
+        ):
+            raise ValueError("'%s' is not a release line like 2 or 3.4" % line)
+        return tuple(int(part) for part in parts)
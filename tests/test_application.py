@@ -2,13 +2,21 @@
 
 from __future__ import print_function
 
-from argparse import Namespace
+from argparse import ArgumentParser, Namespace
 from collections import OrderedDict
 from unittest import TestCase
 
-from mock import call, MagicMock, patch
+from mock import MagicMock, patch
 
-from gitflow_easyrelease import Application
+from gitflow_easyrelease import (
+    Application,
+    Metrics,
+    ProcessRunner,
+    ReleaseEngine,
+    SemVer,
+    Subcommand,
+    Tracer,
+)
 
 
 class ApplicationTestCase(TestCase):
@@ -23,7 +31,7 @@ class ApplicationTestCase(TestCase):
 
     def construct_application(self):
         ensure_git_flow_patcher = patch(
-            'gitflow_easyrelease.application.RepoInfo.ensure_git_flow',
+            'gitflow_easyrelease.subcommand.RepoInfo.ensure_git_flow',
             return_value=True
         )
         self.mock_ensure_git_flow = ensure_git_flow_patcher.start()
@@ -48,8 +56,8 @@ class ApplicationTestCase(TestCase):
 
 class ConstructorUnitTests(ApplicationTestCase):
 
-    def test_flow(self):
-        self.mock_ensure_git_flow.assert_called_once_with()
+    def test_flow_deferred(self):
+        self.mock_ensure_git_flow.assert_not_called()
 
 
 class AttachSubparsersUnitTests(ApplicationTestCase):
@@ -64,6 +72,15 @@ class AttachSubparsersUnitTests(ApplicationTestCase):
         self.application.attach_subparsers(self.parser)
         self.mock_sub_attach.assert_called_once_with(self.subparsers)
 
+    def test_selected_attach(self):
+        self.application.attach_subparsers(self.parser, self.SUBCOMMAND_KEY)
+        self.mock_sub_attach.assert_called_once_with(self.subparsers)
+
+    def test_unselected_skip(self):
+        self.application.attach_subparsers(self.parser, 'other')
+        self.mock_parser_add.assert_called_once()
+        self.mock_sub_attach.assert_not_called()
+
 
 class PopulateRootParserUnitTests(ApplicationTestCase):
 
@@ -84,7 +101,47 @@ class PopulateRootParserUnitTests(ApplicationTestCase):
     def test_subparsers_add(self):
         self.mock_attach_subparsers.assert_not_called()
         self.application.populate_root_parser(self.parser)
-        self.mock_attach_subparsers.assert_called_once()
+        self.mock_attach_subparsers.assert_called_once_with(self.parser, None)
+
+    def test_selected_subparser_add(self):
+        self.application.populate_root_parser(
+            self.parser,
+            [self.SUBCOMMAND_KEY, 'patch']
+        )
+        self.mock_attach_subparsers.assert_called_once_with(
+            self.parser,
+            self.SUBCOMMAND_KEY
+        )
+
+
+class SelectSubcommandUnitTests(ApplicationTestCase):
+
+    def test_without_args(self):
+        self.assertIsNone(self.application.select_subcommand())
+
+    def test_subcommand(self):
+        self.assertEqual(
+            self.application.select_subcommand(
+                [self.SUBCOMMAND_KEY, 'patch', '--show-commands']
+            ),
+            self.SUBCOMMAND_KEY
+        )
+
+    def test_help_first(self):
+        for flag in Application.HELP_FLAGS:
+            self.assertIsNone(
+                self.application.select_subcommand([flag, self.SUBCOMMAND_KEY])
+            )
+
+    def test_trailing_all_help(self):
+        self.assertIsNone(
+            self.application.select_subcommand(
+                [self.SUBCOMMAND_KEY, 'patch', '--all-help']
+            )
+        )
+
+    def test_unknown_subcommand(self):
+        self.assertIsNone(self.application.select_subcommand(['qqq']))
 
 
 class BootstrapUnitTests(ApplicationTestCase):
@@ -118,31 +175,29 @@ class BootstrapUnitTests(ApplicationTestCase):
 
     def test_print_all_help(self):
         parsed = Namespace()
-        parsed.all_help = True
-        options = []
+        parsed.subcommand = self.SUBCOMMAND_KEY
+        options = ['--all-help']
         self.mock_parse_args.return_value = [parsed, options]
         self.mock_create_root_parser.assert_not_called()
         self.mock_parse_args.assert_not_called()
         self.mock_populate_root_parser.assert_not_called()
         self.mock_print_all_help.assert_not_called()
         self.mock_sub_execute.assert_not_called()
-        self.application.bootstrap(['--all-help'])
+        self.application.bootstrap([self.SUBCOMMAND_KEY, '--all-help'])
         self.mock_create_root_parser.assert_called_once_with()
-        self.mock_parse_args.assert_called_once_with(
+        self.mock_parse_args.assert_not_called()
+        self.mock_populate_root_parser.assert_called_once_with(
             self.parser,
-            ['--all-help']
+            [self.SUBCOMMAND_KEY, '--all-help']
         )
-        self.mock_populate_root_parser.assert_called_once_with(self.parser)
         self.mock_print_all_help.assert_called_once_with(self.parser)
         self.mock_sub_execute.assert_not_called()
 
     def test_execute(self):
         parsed = Namespace()
-        parsed.all_help = False
         parsed.subcommand = self.SUBCOMMAND_KEY
         options = ['--show-commands']
         final = Namespace()
-        final.all_help = False
         final.subcommand = self.SUBCOMMAND_KEY
         final.options = options
         self.mock_parse_args.return_value = [parsed, options]
@@ -153,15 +208,195 @@ class BootstrapUnitTests(ApplicationTestCase):
         self.mock_sub_execute.assert_not_called()
         self.application.bootstrap([self.SUBCOMMAND_KEY, '--show-commands'])
         self.mock_create_root_parser.assert_called_once_with()
-        self.mock_parse_args.assert_has_calls([
-            call(self.parser, [self.SUBCOMMAND_KEY, '--show-commands']),
-            call(self.parser, [self.SUBCOMMAND_KEY, '--show-commands'])
-        ])
-        self.mock_populate_root_parser.assert_called_once_with(self.parser)
+        self.mock_parse_args.assert_called_once_with(
+            self.parser,
+            [self.SUBCOMMAND_KEY, '--show-commands']
+        )
+        self.mock_populate_root_parser.assert_called_once_with(
+            self.parser,
+            [self.SUBCOMMAND_KEY, '--show-commands']
+        )
         self.mock_print_all_help.assert_not_called()
         self.mock_sub_execute.assert_called_once_with(final)
 
 
+class BootstrapParserCountTests(TestCase):
+
+    def setUp(self):
+        execute_patcher = patch.object(Subcommand, 'execute')
+        self.mock_execute = execute_patcher.start()
+        self.addCleanup(execute_patcher.stop)
+        sys_exit_patcher = patch(
+            'gitflow_easyrelease.application.sys_exit',
+            side_effect=SystemExit
+        )
+        sys_exit_patcher.start()
+        self.addCleanup(sys_exit_patcher.stop)
+        init_patcher = patch.object(
+            ArgumentParser,
+            '__init__',
+            autospec=True,
+            side_effect=ArgumentParser.__init__
+        )
+        self.mock_init = init_patcher.start()
+        self.addCleanup(init_patcher.stop)
+        parse_patcher = patch.object(
+            ArgumentParser,
+            'parse_known_args',
+            autospec=True,
+            side_effect=ArgumentParser.parse_known_args
+        )
+        self.mock_parse = parse_patcher.start()
+        self.addCleanup(parse_patcher.stop)
+        subcommands = OrderedDict()
+        for key in ['start', 'finish', 'publish']:
+            subcommands[key] = Subcommand(key, has_base=False)
+        self.application = Application(subcommands)
+
+    def test_subcommand_invocation(self):
+        self.application.bootstrap(['start', '1.2.3', '--show-commands'])
+        self.assertEqual(self.mock_init.call_count, 2)
+        self.assertEqual(self.mock_parse.call_count, 2)
+        parsed_args = self.mock_execute.call_args[0][0]
+        self.assertEqual(parsed_args.subcommand, 'start')
+        self.assertEqual(parsed_args.version, '1.2.3')
+        self.assertEqual(parsed_args.options, ['--show-commands'])
+
+    def record_flags(self, parsed_args):
+        self.flags = (
+            SemVer.GIT_SORT,
+            ReleaseEngine.NATIVE,
+            ProcessRunner.PROFILE,
+            Tracer.PATH,
+            Metrics.PATH,
+        )
+
+    def test_git_sort(self):
+        self.mock_execute.side_effect = self.record_flags
+        self.application.bootstrap(['--git-sort', 'start', '1.2.3'])
+        self.assertEqual(self.flags, (True, False, False, None, None))
+        self.assertFalse(SemVer.GIT_SORT)
+        parsed_args = self.mock_execute.call_args[0][0]
+        self.assertEqual(parsed_args.version, '1.2.3')
+        self.assertEqual(parsed_args.options, [])
+
+    def test_native(self):
+        self.mock_execute.side_effect = self.record_flags
+        self.application.bootstrap(['--native', 'finish', '1.2.3', '-k'])
+        self.assertEqual(self.flags, (False, True, False, None, None))
+        self.assertFalse(ReleaseEngine.NATIVE)
+        parsed_args = self.mock_execute.call_args[0][0]
+        self.assertEqual(parsed_args.version, '1.2.3')
+        self.assertEqual(parsed_args.options, ['-k'])
+
+    @patch.object(ProcessRunner, 'print_summary')
+    def test_profile(self, mock_summary):
+        self.application.bootstrap(['start', '1.2.3'])
+        mock_summary.assert_not_called()
+        self.mock_execute.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.application.bootstrap(['--profile', 'start', '1.2.3'])
+        mock_summary.assert_called_once_with()
+        self.assertFalse(ProcessRunner.PROFILE)
+
+    @patch.object(ProcessRunner, 'print_summary')
+    def test_profile_per_run(self, mock_summary):
+        self.addCleanup(ProcessRunner.clear)
+        processes = []
+        self.mock_execute.side_effect = (
+            lambda parsed_args: ProcessRunner.run(lambda command: 0, ['git'])
+        )
+        mock_summary.side_effect = (
+            lambda: processes.append(ProcessRunner.get_summary()['processes'])
+        )
+        for _ in range(2):
+            self.application.bootstrap(['--profile', 'start', '1.2.3'])
+        self.assertEqual(processes, [1, 1])
+        self.assertEqual(len(ProcessRunner.PHASES), 1)
+
+    @patch.dict('gitflow_easyrelease.tracer.environ', {}, clear=True)
+    @patch.object(Tracer, 'write')
+    def test_trace(self, mock_write):
+        self.application.bootstrap(['--trace', 'run.json', 'start', '1.2.3'])
+        mock_write.assert_called_once_with('run.json')
+        self.assertIsNone(Tracer.PATH)
+        parsed_args = self.mock_execute.call_args[0][0]
+        self.assertEqual(parsed_args.version, '1.2.3')
+
+    @patch.object(Tracer, 'get_path', return_value='run.json')
+    @patch.object(Tracer, 'write', side_effect=IOError('denied'))
+    @patch('gitflow_easyrelease.application.print')
+    def test_trace_failure(self, mock_print, mock_write, mock_path):
+        Application.write_trace()
+        mock_write.assert_called_once_with('run.json')
+        self.assertIn('run.json', mock_print.call_args[0][0])
+
+    @patch.dict('gitflow_easyrelease.metrics.environ', {}, clear=True)
+    @patch.object(Metrics, 'update')
+    def test_metrics(self, mock_update):
+        self.application.bootstrap(['--metrics', 'run.prom', 'start', '1.2.3'])
+        self.assertEqual(mock_update.call_args[0][:3], ('run.prom', 'start', True))
+        self.mock_execute.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.application.bootstrap(['--metrics', 'run.prom', 'start', '1.2.3'])
+        self.assertEqual(mock_update.call_args[0][:3], ('run.prom', 'start', False))
+        self.mock_execute.side_effect = None
+        self.application.bootstrap(['start', '1.2.3'])
+        self.assertEqual(mock_update.call_count, 2)
+
+    @patch.object(Metrics, 'update')
+    @patch.object(Tracer, 'write')
+    def test_flags_reset(self, mock_write, mock_update):
+        self.mock_execute.side_effect = self.record_flags
+        self.application.bootstrap([
+            '--git-sort',
+            '--native',
+            '--trace', 'run.json',
+            '--metrics', 'run.prom',
+            'start',
+            '1.2.3',
+        ])
+        self.assertEqual(self.flags, (True, True, False, 'run.json', 'run.prom'))
+        with patch.dict('gitflow_easyrelease.tracer.environ', {}, clear=True):
+            with patch.dict('gitflow_easyrelease.metrics.environ', {}, clear=True):
+                self.application.bootstrap(['start', '1.2.3'])
+        self.assertEqual(self.flags, (False, False, False, None, None))
+        mock_write.assert_called_once_with('run.json')
+        self.assertEqual(mock_update.call_count, 1)
+
+    @patch.object(Metrics, 'update')
+    @patch.object(Tracer, 'write')
+    def test_missing_subcommand(self, mock_write, mock_update):
+        with self.assertRaises(SystemExit):
+            self.application.bootstrap(['--git-sort', '--trace', 'run.json'])
+        self.mock_execute.assert_not_called()
+        mock_update.assert_not_called()
+
+    @patch.object(Metrics, 'get_path', return_value='run.prom')
+    @patch.object(Metrics, 'update', side_effect=OSError('denied'))
+    @patch('gitflow_easyrelease.application.print')
+    def test_metrics_failure(self, mock_print, mock_update, mock_path):
+        Application.write_metrics('start', True)
+        self.assertIn('run.prom', mock_print.call_args[0][0])
+
+    @patch('gitflow_easyrelease.application.print')
+    def test_all_help(self, mock_print):
+        with self.assertRaises(SystemExit):
+            self.application.bootstrap(['--all-help'])
+        self.assertEqual(self.mock_init.call_count, 4)
+        self.assertEqual(self.mock_parse.call_count, 0)
+        self.assertEqual(mock_print.call_count, 4)
+        self.mock_execute.assert_not_called()
+
+    @patch('gitflow_easyrelease.application.print')
+    def test_trailing_all_help_without_version(self, mock_print):
+        with self.assertRaises(SystemExit):
+            self.application.bootstrap(['start', '--all-help'])
+        self.assertEqual(self.mock_parse.call_count, 0)
+        self.assertEqual(mock_print.call_count, 4)
+        self.mock_execute.assert_not_called()
+
+
 class CreateRootParserUnitTests(ApplicationTestCase):
 
     def setUp(self):
@@ -181,7 +416,7 @@ class CreateRootParserUnitTests(ApplicationTestCase):
             self.parser
         )
         self.mock_argumentparser.assert_called_once()
-        self.mock_parser_add.assert_called_once()
+        self.assertEqual(self.mock_parser_add.call_count, 6)
 
 
 class ParseArgsUnitTests(ApplicationTestCase):
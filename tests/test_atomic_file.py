@@ -0,0 +1,48 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from io import open as io_open
+from os import listdir, stat
+from os.path import join
+from shutil import rmtree
+from stat import S_IMODE
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from mock import patch
+
+from gitflow_easyrelease.atomic_file import atomic_write
+
+
+class AtomicWriteUnitTests(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.path = join(self.root, 'file')
+
+    def read(self):
+        with io_open(self.path, encoding='utf-8') as handle:
+            return handle.read()
+
+    def test_replaces(self):
+        atomic_write(self.path, u'one\n', '.file.')
+        atomic_write(self.path, u'two \u2713\n', '.file.')
+        self.assertEqual(self.read(), u'two \u2713\n')
+        self.assertEqual(listdir(self.root), ['file'])
+
+    def test_mode(self):
+        atomic_write(self.path, u'one\n', '.file.', 0o640)
+        self.assertEqual(S_IMODE(stat(self.path).st_mode), 0o640)
+
+    def test_cleanup(self):
+        atomic_write(self.path, u'one\n', '.file.')
+        with patch(
+            'gitflow_easyrelease.atomic_file.replace_file',
+            side_effect=OSError
+        ):
+            with self.assertRaises(OSError):
+                atomic_write(self.path, u'two\n', '.file.')
+        self.assertEqual(self.read(), u'one\n')
+        self.assertEqual(listdir(self.root), ['file'])
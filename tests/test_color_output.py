@@ -109,13 +109,111 @@ class CallUnitTests(ColorOutputTestCase):
 
 class CanUseAnsiUnitTests(ColorOutputTestCase):
 
+    def setUp(self):
+        ColorOutputTestCase.setUp(self)
+        ColorOutput.reset_ansi_support()
+        self.addCleanup(ColorOutput.reset_ansi_support)
+
+    @patch.object(ColorOutput, 'detect_ansi', return_value=True)
+    def test_memoized(self, mock_detect):
+        mock_detect.assert_not_called()
+        self.assertTrue(ColorOutput.can_use_ansi())
+        self.assertTrue(ColorOutput.can_use_ansi())
+        self.assertTrue(ColorOutput().color_factory())
+        mock_detect.assert_called_once_with()
+        self.assertTrue(ColorOutput.ANSI_SUPPORT)
+
+    @patch.object(ColorOutput, 'detect_ansi', return_value=False)
+    def test_reset(self, mock_detect):
+        self.assertFalse(ColorOutput.can_use_ansi())
+        ColorOutput.reset_ansi_support()
+        self.assertIsNone(ColorOutput.ANSI_SUPPORT)
+        self.assertFalse(ColorOutput.can_use_ansi())
+        self.assertEqual(mock_detect.call_count, 2)
+
+
+class DetectAnsiUnitTests(ColorOutputTestCase):
+    TERMINAL = {'TERM': 'xterm-256color'}
+
+    def setUp(self):
+        ColorOutputTestCase.setUp(self)
+        is_terminal_patcher = patch.object(
+            ColorOutput,
+            'is_terminal',
+            return_value=True
+        )
+        self.mock_is_terminal = is_terminal_patcher.start()
+        self.addCleanup(is_terminal_patcher.stop)
+        terminfo_colors_patcher = patch.object(
+            ColorOutput,
+            'terminfo_colors',
+            return_value=256
+        )
+        self.mock_terminfo_colors = terminfo_colors_patcher.start()
+        self.addCleanup(terminfo_colors_patcher.stop)
+        tput_colors_patcher = patch.object(
+            ColorOutput,
+            'tput_colors',
+            return_value=256
+        )
+        self.mock_tput_colors = tput_colors_patcher.start()
+        self.addCleanup(tput_colors_patcher.stop)
+
+    @patch.dict('gitflow_easyrelease.color_output.environ', TERMINAL, clear=True)
+    def test_terminfo(self):
+        self.assertTrue(ColorOutput.detect_ansi())
+        self.mock_terminfo_colors.assert_called_once_with('xterm-256color')
+        self.mock_tput_colors.assert_not_called()
+
+    @patch.dict('gitflow_easyrelease.color_output.environ', TERMINAL, clear=True)
+    def test_tput_fallback(self):
+        self.mock_terminfo_colors.return_value = None
+        self.mock_tput_colors.return_value = 7
+        self.assertFalse(ColorOutput.detect_ansi())
+        self.mock_tput_colors.assert_called_once_with()
+
+    @patch.dict(
+        'gitflow_easyrelease.color_output.environ',
+        {'TERM': 'xterm', 'NO_COLOR': ''},
+        clear=True
+    )
+    def test_no_color(self):
+        self.assertFalse(ColorOutput.detect_ansi())
+        self.mock_terminfo_colors.assert_not_called()
+        self.mock_tput_colors.assert_not_called()
+
+    @patch.dict(
+        'gitflow_easyrelease.color_output.environ',
+        {'TERM': 'dumb'},
+        clear=True
+    )
+    def test_dumb_terminal(self):
+        self.assertFalse(ColorOutput.detect_ansi())
+        self.mock_terminfo_colors.assert_not_called()
+        self.mock_tput_colors.assert_not_called()
+
+    @patch.dict('gitflow_easyrelease.color_output.environ', {}, clear=True)
+    def test_no_term(self):
+        self.assertFalse(ColorOutput.detect_ansi())
+        self.mock_is_terminal.assert_not_called()
+
+    @patch.dict('gitflow_easyrelease.color_output.environ', TERMINAL, clear=True)
+    def test_not_a_tty(self):
+        self.mock_is_terminal.return_value = False
+        self.assertFalse(ColorOutput.detect_ansi())
+        self.mock_terminfo_colors.assert_not_called()
+        self.mock_tput_colors.assert_not_called()
+
+
+class TputColorsUnitTests(ColorOutputTestCase):
+
     @patch(
         'gitflow_easyrelease.color_output.check_output',
         return_value=' 256 '
     )
     def test_easy_mode(self, mock_output):
         mock_output.assert_not_called()
-        self.assertTrue(ColorOutput.can_use_ansi())
+        self.assertEqual(ColorOutput.tput_colors(), 256)
         mock_output.assert_has_calls([
             call(['which', 'tput']),
             call(['tput', 'colors'])
@@ -127,7 +225,7 @@ class CanUseAnsiUnitTests(ColorOutputTestCase):
     )
     def test_weird_terminal(self, mock_output):
         mock_output.assert_not_called()
-        self.assertFalse(ColorOutput.can_use_ansi())
+        self.assertEqual(ColorOutput.tput_colors(), 7)
         mock_output.assert_has_calls([
             call(['which', 'tput']),
             call(['tput', 'colors'])
@@ -139,7 +237,7 @@ class CanUseAnsiUnitTests(ColorOutputTestCase):
     )
     def test_no_tput(self, mock_output):
         mock_output.assert_not_called()
-        self.assertFalse(ColorOutput.can_use_ansi())
+        self.assertEqual(ColorOutput.tput_colors(), 0)
         mock_output.assert_called_once_with(['which', 'tput'])
 
 
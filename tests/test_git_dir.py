@@ -0,0 +1,247 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os import chdir, getcwd, makedirs
+from os.path import dirname, join
+from shutil import rmtree
+from subprocess import check_call, check_output
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from mock import patch
+from pytest import mark
+
+from gitflow_easyrelease import GitDir, RepoInfo, RepoSnapshot, SemVer
+from gitflow_easyrelease.git_dir import UnsupportedLayout
+
+try:
+    from shutil import which
+except ImportError:  # pragma: no cover
+    from distutils.spawn import find_executable as which
+
+FIRST = 'a' * 40
+SECOND = 'b' * 40
+PEELED = 'c' * 40
+
+
+class GitDirTestCase(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.git_dir = join(self.root, '.git')
+        environ_patcher = patch.dict(
+            'gitflow_easyrelease.git_dir.environ',
+            {},
+            clear=True
+        )
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+        self.write('.git/HEAD', 'ref: refs/heads/develop\n')
+        makedirs(join(self.git_dir, 'refs', 'heads'))
+
+    def write(self, path, content):
+        full_path = join(self.root, path)
+        try:
+            makedirs(dirname(full_path))
+        except OSError:
+            pass
+        with open(full_path, 'w') as handle:
+            handle.write(content)
+
+
+class DiscoverUnitTests(GitDirTestCase):
+
+    def test_plain_repo(self):
+        makedirs(join(self.root, 'nested', 'deeper'))
+        git_dir = GitDir.discover(join(self.root, 'nested', 'deeper'))
+        self.assertEqual(git_dir.git_dir, self.git_dir)
+        self.assertEqual(git_dir.common_dir, self.git_dir)
+
+    def test_worktree(self):
+        self.write('.git/worktrees/other/HEAD', 'ref: refs/heads/feature\n')
+        self.write('.git/worktrees/other/commondir', '../..\n')
+        self.write('other/.git', 'gitdir: ../.git/worktrees/other\n')
+        git_dir = GitDir.discover(join(self.root, 'other'))
+        self.assertEqual(
+            git_dir.git_dir,
+            join(self.git_dir, 'worktrees', 'other')
+        )
+        self.assertEqual(git_dir.common_dir, self.git_dir)
+        self.assertEqual(git_dir.read_head(), 'feature')
+
+    def test_reftable(self):
+        makedirs(join(self.git_dir, 'reftable'))
+        with self.assertRaises(UnsupportedLayout):
+            GitDir.discover(self.root)
+
+    def test_environment_override(self):
+        with patch.dict(
+            'gitflow_easyrelease.git_dir.environ',
+            {'GIT_DIR': self.git_dir}
+        ):
+            with self.assertRaises(UnsupportedLayout):
+                GitDir.discover(self.root)
+
+    def test_malformed_git_file(self):
+        self.write('other/.git', 'nonsense\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitDir.discover(join(self.root, 'other'))
+
+
+class ReadHeadUnitTests(GitDirTestCase):
+
+    def test_branch(self):
+        self.assertEqual(GitDir(self.git_dir).read_head(), 'develop')
+
+    def test_detached(self):
+        self.write('.git/HEAD', FIRST + '\n')
+        self.assertEqual(GitDir(self.git_dir).read_head(), 'HEAD')
+
+    def test_garbage(self):
+        self.write('.git/HEAD', 'qqq\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitDir(self.git_dir).read_head()
+
+
+class ReadRefsUnitTests(GitDirTestCase):
+    PREFIXES = ['refs/heads/', 'refs/remotes/', 'refs/tags/']
+
+    def setUp(self):
+        GitDirTestCase.setUp(self)
+        self.write(
+            '.git/packed-refs',
+            (
+                '# pack-refs with: peeled fully-peeled sorted \n'
+                '%s refs/heads/master\n'
+                '%s refs/notes/commits\n'
+                '%s refs/tags/1.0.0\n'
+                '^%s\n'
+                '%s refs/tags/1.1.0\n'
+            ) % (FIRST, FIRST, FIRST, PEELED, FIRST)
+        )
+        self.write('.git/refs/heads/develop', FIRST + '\n')
+        self.write('.git/refs/heads/release/1.2.0', SECOND + '\n')
+        self.write('.git/refs/heads/master.lock', SECOND + '\n')
+        self.write('.git/refs/tags/1.1.0', SECOND + '\n')
+        self.write(
+            '.git/refs/remotes/origin/HEAD',
+            'ref: refs/remotes/origin/master\n'
+        )
+
+    def test_merged(self):
+        self.assertEqual(
+            GitDir(self.git_dir).read_refs(self.PREFIXES),
+            [
+                'refs/heads/develop',
+                'refs/heads/master',
+                'refs/heads/release/1.2.0',
+                'refs/remotes/origin/HEAD',
+                'refs/tags/1.0.0',
+                'refs/tags/1.1.0',
+            ]
+        )
+
+    def test_iter_refs(self):
+        self.assertEqual(
+            sorted(GitDir(self.git_dir).iter_refs('refs/tags/')),
+            ['refs/tags/1.0.0', 'refs/tags/1.1.0']
+        )
+
+    def test_malformed_packed_refs(self):
+        self.write('.git/packed-refs', 'qqq refs/heads/master\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitDir(self.git_dir).read_refs(self.PREFIXES)
+
+    def test_iter_refs_malformed_packed_refs(self):
+        self.write(
+            '.git/packed-refs',
+            '%s refs/tags/1.0.0\nqqq refs/tags/1.1.0\n' % FIRST
+        )
+        with self.assertRaises(UnsupportedLayout):
+            GitDir(self.git_dir).iter_refs('refs/tags/')
+
+    def test_malformed_loose_ref(self):
+        self.write('.git/refs/tags/broken', '\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitDir(self.git_dir).read_refs(self.PREFIXES)
+
+    def test_iter_refs_malformed_loose_ref(self):
+        self.write('.git/refs/tags/broken', 'garbage\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitDir(self.git_dir).iter_refs('refs/tags/')
+
+    def test_has_ref(self):
+        git_dir = GitDir(self.git_dir)
+        self.assertTrue(git_dir.has_ref('refs/heads/develop'))
+        self.assertTrue(git_dir.has_ref('refs/heads/master'))
+        self.assertTrue(git_dir.has_ref('refs/remotes/origin/HEAD'))
+        self.assertFalse(git_dir.has_ref('refs/heads/missing'))
+        self.assertFalse(git_dir.has_ref('refs/heads/release'))
+        self.assertFalse(git_dir.has_ref('refs/remotes/origin'))
+
+    def test_has_ref_invalid(self):
+        git_dir = GitDir(self.git_dir)
+        with self.assertRaises(UnsupportedLayout):
+            git_dir.has_ref('refs/heads/master.lock')
+        with self.assertRaises(UnsupportedLayout):
+            git_dir.has_ref('refs/heads/../../HEAD')
+        self.write('.git/refs/heads/broken', 'garbage\n')
+        with self.assertRaises(UnsupportedLayout):
+            git_dir.has_ref('refs/heads/broken')
+
+
+@mark.skipif(not which('git'), reason='git is not installed')
+class CliParityTests(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.git('init', '-q', '-b', 'develop')
+        self.git('commit', '-q', '--allow-empty', '-m', 'one')
+        self.git('tag', '-a', '-m', 'one', '1.0.0')
+        self.git('branch', 'master')
+        self.git('pack-refs', '--all')
+        self.git('commit', '-q', '--allow-empty', '-m', 'two')
+        self.git('tag', '1.1.0')
+        self.git('branch', 'release/1.2.0')
+
+    def git(self, *args):
+        check_call(
+            [
+                'git',
+                '-c', 'user.name=test',
+                '-c', 'user.email=test@example.com',
+                '-C', self.root,
+            ] + list(args)
+        )
+
+    def test_parity(self):
+        with patch(
+            'gitflow_easyrelease.git_dir.getcwd',
+            return_value=self.root
+        ):
+            GitDir.clear()
+            in_process = RepoSnapshot.read_git_dir()
+            GitDir.clear()
+        with patch(
+            'gitflow_easyrelease.repo_snapshot.check_output',
+            side_effect=self.check_output
+        ):
+            self.assertEqual(in_process, RepoSnapshot.read_refs())
+
+    def check_output(self, command, **kwargs):
+        return check_output(command, cwd=self.root, **kwargs)
+
+    def test_broken_loose_ref(self):
+        with open(join(self.root, '.git', 'refs', 'tags', 'broken'), 'w') as handle:
+            handle.write('garbage\n')
+        self.addCleanup(chdir, getcwd())
+        chdir(self.root)
+        GitDir.clear()
+        RepoSnapshot.clear()
+        self.addCleanup(GitDir.clear)
+        self.addCleanup(RepoSnapshot.clear)
+        self.assertEqual(sorted(RepoInfo.iter_tags()), ['1.0.0', '1.1.0'])
+        self.assertEqual('%s' % SemVer.get_current_version(), '1.1.0')
@@ -0,0 +1,243 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os.path import join
+from shutil import rmtree
+from subprocess import CalledProcessError
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from mock import MagicMock, patch
+from pytest import mark, raises
+
+from gitflow_easyrelease import GitflowConfig
+from gitflow_easyrelease.git_dir import UnsupportedLayout
+
+
+class GitflowConfigTestCase(TestCase):
+
+    def setUp(self):
+        GitflowConfig.clear()
+        self.addCleanup(GitflowConfig.clear)
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+
+    def write(self, name, content):
+        path = join(self.root, name)
+        with open(path, 'w') as handle:
+            handle.write(content)
+        return path
+
+    def parse(self, content):
+        values = {}
+        GitflowConfig.parse_file(self.write('config', content), values)
+        return values
+
+
+class AccessorUnitTests(GitflowConfigTestCase):
+    CONFIG = GitflowConfig({
+        'gitflow.branch.master': 'main',
+        'gitflow.prefix.release': 'rel/',
+        'gitflow.prefix.versiontag': 'v',
+    })
+
+    def test_get(self):
+        self.assertEqual(self.CONFIG.get('branch.master'), 'main')
+        self.assertEqual(self.CONFIG.get('branch.develop', 'develop'), 'develop')
+
+    def test_get_prefixes(self):
+        self.assertEqual(
+            self.CONFIG.get_prefixes(),
+            {'release': 'rel/', 'versiontag': 'v'}
+        )
+
+
+class CurrentUnitTests(GitflowConfigTestCase):
+
+    @patch.object(GitflowConfig, 'load', return_value=GitflowConfig())
+    def test_cached(self, mock_load):
+        self.assertIs(GitflowConfig.current(), GitflowConfig.current())
+        mock_load.assert_called_once_with()
+
+
+class LoadUnitTests(GitflowConfigTestCase):
+
+    @patch.object(GitflowConfig, 'read_git_config')
+    @patch.object(GitflowConfig, 'read_files', return_value={'gitflow.a': 'b'})
+    def test_native(self, mock_files, mock_git):
+        self.assertEqual(GitflowConfig.load().get('a'), 'b')
+        mock_files.assert_called_once_with()
+        mock_git.assert_not_called()
+
+    @patch.object(
+        GitflowConfig,
+        'read_git_config',
+        return_value={'gitflow.a': 'c'}
+    )
+    @patch.object(
+        GitflowConfig,
+        'read_files',
+        side_effect=UnsupportedLayout('includeIf')
+    )
+    def test_fallback(self, mock_files, mock_git):
+        self.assertEqual(GitflowConfig.load().get('a'), 'c')
+        mock_files.assert_called_once_with()
+        mock_git.assert_called_once_with()
+
+
+class ReadGitConfigUnitTests(GitflowConfigTestCase):
+    SIGNATURE = ['git', 'config', '--get-regexp', r'^gitflow\.']
+
+    @patch(
+        'gitflow_easyrelease.gitflow_config.check_output',
+        return_value='gitflow.prefix.release rel/\ngitflow.branch.master main\n'
+    )
+    def test_configured(self, mock_check):
+        self.assertEqual(
+            GitflowConfig.read_git_config(),
+            {
+                'gitflow.prefix.release': 'rel/',
+                'gitflow.branch.master': 'main',
+            }
+        )
+        mock_check.assert_called_once_with(
+            self.SIGNATURE,
+            universal_newlines=True
+        )
+
+    @patch(
+        'gitflow_easyrelease.gitflow_config.check_output',
+        side_effect=CalledProcessError(1, 'git config')
+    )
+    def test_unconfigured(self, mock_check):
+        self.assertEqual(GitflowConfig.read_git_config(), {})
+        mock_check.assert_called_once_with(
+            self.SIGNATURE,
+            universal_newlines=True
+        )
+
+
+class ReadFilesUnitTests(GitflowConfigTestCase):
+
+    def setUp(self):
+        GitflowConfigTestCase.setUp(self)
+        environ_patcher = patch.dict(
+            'gitflow_easyrelease.gitflow_config.environ',
+            {},
+            clear=True
+        )
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+        current_patcher = patch(
+            'gitflow_easyrelease.gitflow_config.GitDir.current',
+            return_value=MagicMock(common_dir=self.root)
+        )
+        current_patcher.start()
+        self.addCleanup(current_patcher.stop)
+
+    def test_precedence(self):
+        system = self.write(
+            'system',
+            '[gitflow "prefix"]\n\trelease = sys/\n\thotfix = hot/\n'
+        )
+        self.write('config', '[gitflow "prefix"]\n\trelease = local/\n[core]\n\tbare = false\n')
+        with patch.dict(
+            'gitflow_easyrelease.gitflow_config.environ',
+            {
+                'GIT_CONFIG_SYSTEM': system,
+                'GIT_CONFIG_GLOBAL': join(self.root, 'missing'),
+            }
+        ):
+            self.assertEqual(
+                GitflowConfig.read_files(),
+                {
+                    'gitflow.prefix.release': 'local/',
+                    'gitflow.prefix.hotfix': 'hot/',
+                }
+            )
+
+    def test_environment_override(self):
+        with patch.dict(
+            'gitflow_easyrelease.gitflow_config.environ',
+            {'GIT_CONFIG_COUNT': '1'}
+        ):
+            with self.assertRaises(UnsupportedLayout):
+                GitflowConfig.read_files()
+
+    def test_unknown_system_config(self):
+        self.write('config', '[gitflow "prefix"]\n\trelease = local/\n')
+        with patch.dict(
+            'gitflow_easyrelease.gitflow_config.environ',
+            {'GIT_CONFIG_GLOBAL': '/dev/null'}
+        ):
+            with self.assertRaises(UnsupportedLayout):
+                GitflowConfig.read_files()
+
+    def test_worktree_config(self):
+        self.write('config', '[extensions]\n\tworktreeConfig = true\n')
+        with patch.dict(
+            'gitflow_easyrelease.gitflow_config.environ',
+            {'GIT_CONFIG_NOSYSTEM': '1', 'GIT_CONFIG_GLOBAL': '/dev/null'}
+        ):
+            with self.assertRaises(UnsupportedLayout):
+                GitflowConfig.read_files()
+
+
+class ParseFileUnitTests(GitflowConfigTestCase):
+
+    def test_syntax(self):
+        self.assertEqual(
+            self.parse(
+                '# comment\n'
+                '[gitflow "prefix"] release = rel/\n'
+                '\tFeature = "feat/ " ; trailing\n'
+                '\tversiontag = v#comment\n'
+                '\thotfix = "a\\"b\\\\c"\n'
+                '\tsupport = one \\\n'
+                'two\n'
+                '[gitflow.Branch]\n'
+                '\tmaster\n'
+            ),
+            {
+                'gitflow.prefix.release': 'rel/',
+                'gitflow.prefix.feature': 'feat/ ',
+                'gitflow.prefix.versiontag': 'v',
+                'gitflow.prefix.hotfix': 'a"b\\c',
+                'gitflow.prefix.support': 'one two',
+                'gitflow.branch.master': 'true',
+            }
+        )
+
+    def test_include(self):
+        self.write('included', '[gitflow "prefix"]\n\trelease = inc/\n')
+        self.assertEqual(
+            self.parse('[include]\n\tpath = included\n[include]\n\tpath = missing\n'),
+            {'gitflow.prefix.release': 'inc/'}
+        )
+
+    def test_include_loop(self):
+        self.write('config', '[include]\n\tpath = config\n')
+        with self.assertRaises(UnsupportedLayout):
+            GitflowConfig.parse_file(join(self.root, 'config'), {})
+
+
+@mark.parametrize('content', [
+    '[includeIf "gitdir:~/work/"]\n\tpath = work\n',
+    'release = rel/\n',
+    '[gitflow "prefix"\n',
+    '[gitflow prefix]\n',
+    '[gitflow "prefix"]\n\trelease = "rel/\n',
+    '[gitflow "prefix"]\n\trelease = \\q\n',
+    '[gitflow "prefix"]\n\tre lease = rel/\n',
+])
+def test_unsupported(content):
+    root = mkdtemp()
+    try:
+        path = join(root, 'config')
+        with open(path, 'w') as handle:
+            handle.write(content)
+        with raises(UnsupportedLayout):
+            GitflowConfig.parse_file(path, {})
+    finally:
+        rmtree(root)
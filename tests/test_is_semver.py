@@ -2,7 +2,7 @@
 
 from pytest import mark
 
-from gitflow_easyrelease import is_semver
+from gitflow_easyrelease import is_semver, SEMVER_PATTERN, tokenize_semver
 
 
 @mark.parametrize(
@@ -16,7 +16,73 @@ from gitflow_easyrelease import is_semver
         ('X.Y.Z', False),
         ('vqqq', False),
         ('qqq', False),
+        ('1.4.0-rc.2+build.77', True),
+        ('v1.0.0-0A.is.legal', True),
+        ('1.0.0+001', True),
+        ('1.0.0-01', False),
+        ('1.0.0-rc..1', False),
+        ('1.0.0+', False),
+        ('1.2.3.4', False),
+        ('1.2', False),
     ]
 )
 def test_is_semver(version, expected):
     assert expected == is_semver(version)
+
+
+@mark.parametrize(
+    "version,strict,expected",
+    [
+        ('1.2.3', False, (1, 2, 3, None, None)),
+        ('1.2.3', True, (1, 2, 3, None, None)),
+        (' v1.2.3\n', False, (1, 2, 3, None, None)),
+        (' v1.2.3\n', True, None),
+        ('v1.2.3', True, None),
+        ('01.2.3', False, (1, 2, 3, None, None)),
+        ('01.2.3', True, None),
+        ('1.2.03', True, None),
+        ('0.10.0', True, (0, 10, 0, None, None)),
+        ('1.4.0-rc.2+build.77', True, (1, 4, 0, 'rc.2', 'build.77')),
+        ('1.0.0-x-y.0', True, (1, 0, 0, 'x-y.0', None)),
+        ('1.0.0+001', True, (1, 0, 0, None, '001')),
+        ('1.0.0-01', False, None),
+        ('1.0.0-', False, None),
+        ('1.0.0-rc..1', False, None),
+        ('1.0.0-rc.1+a+b', False, None),
+        ('1.0.0+build.', False, None),
+        ('1..3', False, None),
+        ('1.2.3 garbage', False, None),
+        ('v 1.2.3', False, None),
+        ('', False, None),
+    ]
+)
+def test_tokenize_semver(version, strict, expected):
+    assert expected == tokenize_semver(version, strict)
+    assert (expected is not None) == is_semver(version, strict)
+
+
+@mark.parametrize(
+    "version",
+    [
+        'v0.0.0', '1.2.3', '01.2.3', ' 1.2.3 ', 'v1.0.0-0A.is.legal',
+        '1.0.0-alpha-beta.1', '1.0.0-01', '1.0.0-rc..1', '1.0.0+', '1.2',
+        '1.2.3.4', 'release-1', 'v1.2.3-', '1.2.3+a..b', '-1.2.3', 'vv1.2.3',
+        u'\u0661.2.3', u'1.\u0662.3', u'1.2.\uff13', u'v1.2.3-\u0661',
+    ]
+)
+def test_lenient_matches_pattern(version):
+    found = SEMVER_PATTERN.match(version)
+    tokens = tokenize_semver(version)
+    if found is None:
+        assert tokens is None
+    else:
+        major, minor, patch, prerelease, build = found.group(
+            'major',
+            'minor',
+            'patch',
+            'prerelease',
+            'build'
+        )
+        assert (
+            int(major), int(minor), int(patch), prerelease, build
+        ) == tokens
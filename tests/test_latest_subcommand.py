@@ -0,0 +1,95 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from argparse import ArgumentParser
+from unittest import TestCase
+
+from mock import call, patch
+
+from gitflow_easyrelease import (
+    LatestSubcommand,
+    ProcessRunner,
+    SemVer,
+    VersionIndex,
+)
+
+
+class LatestSubcommandTestCase(TestCase):
+
+    def setUp(self):
+        self.subcommand = LatestSubcommand('latest')
+        self.parser = ArgumentParser()
+        self.subcommand.attach_subparser(
+            self.parser.add_subparsers(dest='subcommand')
+        )
+        index_patcher = patch.object(
+            SemVer,
+            'get_version_index',
+            return_value=VersionIndex([
+                SemVer.from_version(version)
+                for version in ['1.2.0', '2.0.0', '2.1.0', '3.0.0-rc.1']
+            ])
+        )
+        index_patcher.start()
+        self.addCleanup(index_patcher.stop)
+        print_patcher = patch('gitflow_easyrelease.latest_subcommand.print')
+        self.mock_print = print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def run_latest(self, *args):
+        self.subcommand.execute(self.parser.parse_args(['latest'] + list(args)))
+
+
+class ExecuteUnitTests(LatestSubcommandTestCase):
+
+    def test_global(self):
+        self.run_latest()
+        self.mock_print.assert_called_once_with(SemVer(2, 1, 0))
+
+    def test_global_pre(self):
+        self.run_latest('--pre')
+        self.mock_print.assert_called_once_with(SemVer(3, 0, 0, 'rc.1'))
+
+    def test_line_pre(self):
+        with self.assertRaises(ValueError):
+            self.run_latest('3')
+        self.run_latest('3', '--pre')
+        self.mock_print.assert_called_once_with(SemVer(3, 0, 0, 'rc.1'))
+
+    def test_line(self):
+        self.run_latest('2')
+        self.mock_print.assert_called_once_with(SemVer(2, 1, 0))
+
+    def test_missing_line(self):
+        with self.assertRaises(ValueError):
+            self.run_latest('4.1')
+
+    def test_per_major(self):
+        self.run_latest('--per-major')
+        self.assertEqual(
+            self.mock_print.call_args_list,
+            [call(SemVer(1, 2, 0)), call(SemVer(2, 1, 0))]
+        )
+
+    def test_phase(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        self.run_latest('--per-major')
+        self.assertEqual(
+            [phase['name'] for phase in ProcessRunner.PHASES],
+            ['version']
+        )
+
+    def test_per_major_pre(self):
+        self.run_latest('--per-major', '--pre')
+        self.mock_print.assert_has_calls([
+            call(SemVer(1, 2, 0)),
+            call(SemVer(2, 1, 0)),
+            call(SemVer(3, 0, 0, 'rc.1')),
+        ])
+
+    @patch('sys.stderr')
+    def test_invalid_line(self, mock_stderr):
+        with self.assertRaises(SystemExit):
+            self.run_latest('qqq')
@@ -1,6 +1,96 @@
 # pylint: disable=missing-docstring
 # pylint: disable=unused-import
 
+from __future__ import print_function
+
+from os import listdir
+from os.path import dirname, join
+from subprocess import check_output
+from sys import executable, version_info
+
+from pytest import mark
+
 import gitflow_easyrelease
 
-# Does absolutely nothing
+HEAVY_MODULES = ['argparse', 'argparse_color_formatter', 'colors', 'numpy']
+
+
+def modules_loaded_after(statement):
+    return check_output([
+        executable,
+        '-c',
+        (
+            "import sys\n"
+            "%s\n"
+            "print(' '.join(sorted(sys.modules)))"
+            % statement
+        )
+    ]).decode().split()
+
+
+@mark.skipif(
+    version_info < (3, 7),
+    reason='lazy module attributes need PEP 562'
+)
+def test_semver_import_stays_light():
+    loaded = modules_loaded_after('from gitflow_easyrelease import SemVer')
+    assert 'gitflow_easyrelease.semver' in loaded
+    for module in HEAVY_MODULES:
+        assert module not in loaded
+
+
+def test_public_names():
+    for name in [
+            'SEMVER_PATTERN',
+            'is_semver',
+            'RepoInfo',
+            'SemVer',
+            'ColorOutput',
+            'Subcommand',
+            'Application',
+            'cli',
+    ]:
+        assert name in dir(gitflow_easyrelease)
+        assert getattr(gitflow_easyrelease, name)
+    assert callable(gitflow_easyrelease.is_semver)
+
+
+def test_is_semver_after_submodule_import():
+    output = check_output([
+        executable,
+        '-c',
+        (
+            "from gitflow_easyrelease import VersionColumns\n"
+            "import gitflow_easyrelease.is_semver\n"
+            "from gitflow_easyrelease import is_semver\n"
+            "print(is_semver('1.2.3'))"
+        )
+    ]).decode().strip()
+    assert 'True' == output
+
+
+def test_eager_resolution():
+    output = check_output([
+        executable,
+        '-c',
+        (
+            "import sys\n"
+            "sys.version_info = (3, 6, 0)\n"
+            "import gitflow_easyrelease\n"
+            "print(' '.join(sorted(\n"
+            "    name for name in gitflow_easyrelease._LAZY_MEMBERS\n"
+            "    if name in vars(gitflow_easyrelease)\n"
+            ")))"
+        )
+    ]).decode().split()
+    assert sorted(gitflow_easyrelease._LAZY_MEMBERS) == output
+
+
+def test_no_namespace_imports():
+    # Before 3.7 the namespace has no __getattr__, so a module importing
+    # from it would depend on the eager loop's order
+    package = dirname(gitflow_easyrelease.__file__)
+    for name in listdir(package):
+        if name.endswith('.py') and '__init__.py' != name:
+            with open(join(package, name)) as handle:
+                assert 'from gitflow_easyrelease import' not in handle.read(), name
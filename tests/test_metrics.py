@@ -0,0 +1,273 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os import environ, listdir, stat
+from os.path import join
+from shutil import rmtree
+from stat import S_IMODE
+from tempfile import mkdtemp
+from threading import Thread
+from unittest import TestCase
+
+from mock import patch
+from pytest import mark
+
+from gitflow_easyrelease import (
+    Application,
+    Metrics,
+    ProcessRunner,
+    SemVer,
+    Subcommand,
+    Tracer,
+)
+
+
+class MetricsTestCase(TestCase):
+
+    def setUp(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        SemVer.clear_cache()
+        self.addCleanup(SemVer.clear_cache)
+        Metrics.start()
+        time_patcher = patch('gitflow_easyrelease.metrics.time', return_value=100.5)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+
+    @staticmethod
+    def record(command, duration):
+        ProcessRunner.RECORDS.append({
+            'command': command,
+            'phase': 'version',
+            'start': 0.0,
+            'duration': duration,
+            'status': 0,
+        })
+
+
+class GetPathUnitTests(TestCase):
+
+    @patch.object(Metrics, 'PATH', None)
+    @patch.dict(environ, {}, clear=True)
+    def test_off(self):
+        self.assertIsNone(Metrics.get_path())
+
+    @patch.object(Metrics, 'PATH', 'flag.prom')
+    @patch.dict(environ, {Metrics.ENVIRONMENT: 'env.prom'})
+    def test_flag_wins(self):
+        self.assertEqual(Metrics.get_path(), 'flag.prom')
+
+    @patch.object(Metrics, 'PATH', None)
+    @patch.dict(environ, {Metrics.ENVIRONMENT: 'env.prom'})
+    def test_environment(self):
+        self.assertEqual(Metrics.get_path(), 'env.prom')
+
+
+@mark.parametrize(
+    "command,name",
+    [
+        (['git', 'rev-parse', '--verify', 'HEAD'], 'git rev-parse'),
+        (
+            ['git', '-c', 'versionsort.suffix=-', 'for-each-ref', '--sort=x'],
+            'git for-each-ref'
+        ),
+        (['git', 'flow', 'release', 'finish'], 'git flow'),
+        (['tput', 'colors'], 'tput colors'),
+        (['git'], 'git'),
+        ([], ''),
+    ]
+)
+def test_get_command_name(command, name):
+    assert name == Metrics.get_command_name(command)
+
+
+def test_format_labels():
+    assert '{a="1",b="x\\"y\\\\z\\n"}' == Metrics.format_labels({
+        'b': 'x"y\\z\n',
+        'a': 1,
+    })
+
+
+class CollectUnitTests(MetricsTestCase):
+
+    def test_collect(self):
+        self.record(['git', 'for-each-ref'], 0.25)
+        self.record(['git', 'for-each-ref'], 0.5)
+        self.record(['git', 'rev-parse'], 0.125)
+        SemVer.from_version('1.2.3')
+        SemVer.from_version('1.2.3')
+        samples = Metrics.collect('quick', False, 0.3)
+        self.assertEqual(
+            samples[(
+                'easyrelease_runs_total',
+                '{outcome="failure",subcommand="quick"}'
+            )],
+            1
+        )
+        buckets = [
+            value
+            for (name, _), value in samples.items()
+            if name == 'easyrelease_run_duration_seconds_bucket'
+        ]
+        self.assertEqual(buckets, [0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1])
+        self.assertEqual(
+            samples[(
+                'easyrelease_child_processes_total',
+                '{command="git for-each-ref",subcommand="quick"}'
+            )],
+            2
+        )
+        self.assertEqual(
+            samples[(
+                'easyrelease_child_process_seconds_total',
+                '{command="git for-each-ref",subcommand="quick"}'
+            )],
+            0.75
+        )
+        self.assertEqual(
+            samples[(
+                'easyrelease_version_cache_hits_total',
+                '{subcommand="quick"}'
+            )],
+            1
+        )
+        self.assertEqual(
+            samples[(
+                'easyrelease_last_run_timestamp_seconds',
+                '{subcommand="quick"}'
+            )],
+            100.5
+        )
+
+
+class RoundTripUnitTests(MetricsTestCase):
+
+    def test_parse_render(self):
+        samples = Metrics.collect('latest', True, 0.07)
+        text = Metrics.render(samples)
+        self.assertEqual(Metrics.parse(text), samples)
+        self.assertIn(
+            '# TYPE easyrelease_run_duration_seconds histogram\n',
+            text
+        )
+        self.assertIn('easyrelease_run_duration_seconds_sum{subcommand="latest"} 0.07\n', text)
+        self.assertNotIn('easyrelease_child_processes_total', text)
+
+    def test_parse_skips_foreign_lines(self):
+        self.assertEqual(
+            list(Metrics.parse(
+                '# HELP other\n'
+                'other_total 3\n'
+                'easyrelease_runs_total{subcommand="x"} nope\n'
+                'easyrelease_runs_total{subcommand="x"} 2\n'
+            ).items()),
+            [(('easyrelease_runs_total', '{subcommand="x"}'), 2.0)]
+        )
+
+    def test_merge(self):
+        first = Metrics.collect('latest', True, 0.07)
+        with patch('gitflow_easyrelease.metrics.time', return_value=200.0):
+            second = Metrics.collect('latest', True, 0.2)
+        merged = Metrics.merge(first, second)
+        self.assertEqual(
+            merged[('easyrelease_runs_total', '{outcome="success",subcommand="latest"}')],
+            2
+        )
+        self.assertEqual(
+            merged[('easyrelease_run_duration_seconds_count', '{subcommand="latest"}')],
+            2
+        )
+        self.assertEqual(
+            merged[('easyrelease_last_run_timestamp_seconds', '{subcommand="latest"}')],
+            200.0
+        )
+
+
+class UpdateTests(MetricsTestCase):
+
+    def setUp(self):
+        MetricsTestCase.setUp(self)
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.path = join(self.root, 'easyrelease.prom')
+
+    def read(self):
+        with open(self.path) as handle:
+            return Metrics.parse(handle.read())
+
+    def test_accumulates(self):
+        Metrics.update(self.path, 'start', True, 0.1)
+        Metrics.update(self.path, 'start', False, 0.1)
+        Metrics.update(self.path, 'finish', True, 0.1)
+        samples = self.read()
+        self.assertEqual(
+            samples[('easyrelease_runs_total', '{outcome="success",subcommand="start"}')],
+            1
+        )
+        self.assertEqual(
+            samples[('easyrelease_runs_total', '{outcome="failure",subcommand="start"}')],
+            1
+        )
+        self.assertEqual(
+            samples[('easyrelease_run_duration_seconds_count', '{subcommand="start"}')],
+            2
+        )
+        self.assertEqual(
+            sorted(listdir(self.root)),
+            ['easyrelease.prom', 'easyrelease.prom.lock']
+        )
+        self.assertEqual(S_IMODE(stat(self.path).st_mode), 0o644)
+
+    def test_concurrent(self):
+        threads = [
+            Thread(target=Metrics.update, args=(self.path, 'latest', True, 0.1))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            self.read()[(
+                'easyrelease_runs_total',
+                '{outcome="success",subcommand="latest"}'
+            )],
+            8
+        )
+
+    @patch('gitflow_easyrelease.atomic_file.replace_file', side_effect=OSError)
+    def test_failure_cleans_up(self, mock_replace):
+        with self.assertRaises(OSError):
+            Metrics.update(self.path, 'start', True, 0.1)
+        self.assertEqual(listdir(self.root), ['easyrelease.prom.lock'])
+
+    @patch.object(Tracer, 'write')
+    @patch.object(Subcommand, 'execute')
+    def test_runs_counted_apart(self, mock_execute, mock_write):
+        def execute(parsed_args):
+            for _ in range(3):
+                ProcessRunner.run(lambda command: 0, ['git', 'rev-parse'])
+            SemVer.from_version('1.2.3')
+            SemVer.from_version('1.2.3')
+        mock_execute.side_effect = execute
+        application = Application({'start': Subcommand('start', has_base=False)})
+        for _ in range(2):
+            application.bootstrap(['--metrics', self.path, 'start', '1.2.3'])
+        samples = self.read()
+        labels = '{subcommand="start"}'
+        self.assertEqual(
+            samples[(
+                'easyrelease_child_processes_total',
+                '{command="git rev-parse",subcommand="start"}'
+            )],
+            6
+        )
+        self.assertEqual(
+            samples[('easyrelease_version_cache_misses_total', labels)],
+            1
+        )
+        self.assertEqual(
+            samples[('easyrelease_version_cache_hits_total', labels)],
+            3
+        )
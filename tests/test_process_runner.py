@@ -0,0 +1,150 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from subprocess import call, CalledProcessError, check_output, PIPE, Popen
+from sys import executable
+from unittest import TestCase
+
+from mock import MagicMock
+
+from gitflow_easyrelease import ProcessRunner
+
+
+class ProcessRunnerTestCase(TestCase):
+
+    def setUp(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+
+
+class RunUnitTests(ProcessRunnerTestCase):
+
+    def test_output(self):
+        output = ProcessRunner.run(
+            check_output,
+            [executable, '-c', 'print("one")'],
+            universal_newlines=True
+        )
+        self.assertEqual(output, 'one\n')
+        record, = ProcessRunner.RECORDS
+        self.assertEqual(record['command'], [executable, '-c', 'print("one")'])
+        self.assertEqual(record['phase'], 'setup')
+        self.assertEqual(record['status'], 0)
+        self.assertLessEqual(0, record['duration'])
+
+    def test_call_status(self):
+        self.assertEqual(
+            ProcessRunner.run(call, [executable, '-c', 'exit(2)']),
+            2
+        )
+        self.assertEqual(ProcessRunner.RECORDS[0]['status'], 2)
+
+    def test_failure(self):
+        with self.assertRaises(CalledProcessError):
+            ProcessRunner.run(check_output, [executable, '-c', 'exit(3)'])
+        self.assertEqual(ProcessRunner.RECORDS[0]['status'], 3)
+
+    def test_missing(self):
+        function = MagicMock(side_effect=OSError)
+        with self.assertRaises(OSError):
+            ProcessRunner.run(function, ['qqq'])
+        self.assertIsNone(ProcessRunner.RECORDS[0]['status'])
+
+
+class SpawnUnitTests(ProcessRunnerTestCase):
+
+    def test_spawn_and_wait(self):
+        process = ProcessRunner.spawn(
+            Popen,
+            [executable, '-c', 'exit(4)'],
+            stdout=PIPE
+        )
+        self.assertEqual(ProcessRunner.RECORDS, [])
+        process.stdout.close()
+        self.assertEqual(ProcessRunner.wait(process), 4)
+        self.assertEqual(ProcessRunner.RECORDS[0]['status'], 4)
+        self.assertEqual(ProcessRunner.PENDING, {})
+
+    def test_wait_unknown(self):
+        process = MagicMock()
+        process.wait.return_value = 0
+        self.assertEqual(ProcessRunner.wait(process), 0)
+        self.assertEqual(ProcessRunner.RECORDS, [])
+
+
+class PhaseUnitTests(ProcessRunnerTestCase):
+
+    def test_nested(self):
+        function = MagicMock(return_value='')
+        with ProcessRunner.phase('outer'):
+            ProcessRunner.run(function, ['one'])
+            with ProcessRunner.phase('inner'):
+                ProcessRunner.run(function, ['two'])
+            ProcessRunner.run(function, ['three'])
+        ProcessRunner.run(function, ['four'])
+        self.assertEqual(
+            [record['phase'] for record in ProcessRunner.RECORDS],
+            ['outer', 'inner', 'outer', 'setup']
+        )
+        self.assertEqual(
+            [phase['name'] for phase in ProcessRunner.PHASES],
+            ['inner', 'outer']
+        )
+
+    def test_restored_on_error(self):
+        with self.assertRaises(ValueError):
+            with ProcessRunner.phase('broken'):
+                raise ValueError
+        self.assertEqual(ProcessRunner.PHASE, 'setup')
+
+
+class SummaryUnitTests(ProcessRunnerTestCase):
+
+    def setUp(self):
+        ProcessRunnerTestCase.setUp(self)
+        with ProcessRunner.phase('release'):
+            ProcessRunner.RECORDS.extend([
+                {
+                    'command': ['git', 'merge'],
+                    'phase': 'release',
+                    'start': 0.0,
+                    'duration': 0.25,
+                    'status': 0,
+                },
+                {
+                    'command': ['git', 'tag'],
+                    'phase': 'release',
+                    'start': 0.25,
+                    'duration': 0.5,
+                    'status': 1,
+                },
+            ])
+        ProcessRunner.RECORDS.append({
+            'command': ['tput', 'colors'],
+            'phase': 'setup',
+            'start': 0.0,
+            'duration': 0.125,
+            'status': None,
+        })
+
+    def test_summary(self):
+        summary = ProcessRunner.get_summary()
+        self.assertEqual(summary['processes'], 3)
+        self.assertEqual(summary['children'], 0.875)
+        phases = dict(summary['phases'])
+        self.assertEqual(phases['release'][1:], (2, 0.75))
+        self.assertEqual(phases['setup'], (None, 1, 0.125))
+        self.assertEqual(
+            [record['command'][1] for record in summary['slowest']],
+            ['tag', 'merge', 'colors']
+        )
+
+    def test_print(self):
+        stream = MagicMock()
+        ProcessRunner.print_summary(stream)
+        lines = ''.join(args[0] for args, _ in stream.write.call_args_list)
+        self.assertIn('in 3 child processes', lines)
+        self.assertIn('2 processes    0.750s', lines)
+        self.assertIn('0.500s  1      git tag', lines)
+        self.assertIn('failed tput colors', lines)
@@ -0,0 +1,92 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os import makedirs, utime
+from os.path import exists, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from gitflow_easyrelease import GitDir, ProcessRunner, ReachabilityCache
+
+FIRST = 'a' * 40
+SECOND = 'b' * 40
+
+
+class ReachabilityCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        makedirs(join(self.root, 'refs', 'tags'))
+        current_patcher = patch.object(
+            GitDir,
+            'current',
+            return_value=GitDir(self.root)
+        )
+        current_patcher.start()
+        self.addCleanup(current_patcher.stop)
+        self.find = MagicMock(side_effect=lambda commit: {
+            FIRST: 'v1.2.0',
+            SECOND: None,
+        }[commit])
+        self.path = join(self.root, 'easyrelease', 'reachable')
+        self.settle()
+
+    def settle(self):
+        past = time() - 60
+        utime(join(self.root, 'refs', 'tags'), (past, past))
+
+
+class LookupUnitTests(ReachabilityCacheTestCase):
+
+    def test_cached_per_commit(self):
+        self.assertEqual(ReachabilityCache.lookup(FIRST, self.find), 'v1.2.0')
+        self.assertEqual(ReachabilityCache.lookup(SECOND, self.find), '')
+        self.assertEqual(ReachabilityCache.lookup(FIRST, self.find), 'v1.2.0')
+        self.assertEqual(ReachabilityCache.lookup(SECOND, self.find), '')
+        self.assertEqual(self.find.call_count, 2)
+        self.assertTrue(exists(self.path))
+
+    def test_span(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        ReachabilityCache.lookup(FIRST, self.find)
+        ReachabilityCache.lookup(FIRST, self.find)
+        self.assertEqual(
+            [span['name'] for span in ProcessRunner.SPANS],
+            ['ReachabilityCache.lookup', 'ReachabilityCache.lookup']
+        )
+
+    def test_tags_changed(self):
+        ReachabilityCache.lookup(FIRST, self.find)
+        with open(join(self.root, 'refs', 'tags', '1.3.0'), 'w') as handle:
+            handle.write(FIRST + '\n')
+        self.settle()
+        ReachabilityCache.lookup(FIRST, self.find)
+        self.assertEqual(self.find.call_count, 2)
+
+    def test_racy_tags_not_persisted(self):
+        now = time()
+        utime(join(self.root, 'refs', 'tags'), (now, now))
+        ReachabilityCache.lookup(FIRST, self.find)
+        self.assertFalse(exists(self.path))
+
+    @patch.object(ReachabilityCache, 'MAX_ENTRIES', 1)
+    def test_bounded(self):
+        ReachabilityCache.lookup(FIRST, self.find)
+        ReachabilityCache.lookup(SECOND, self.find)
+        self.assertEqual(
+            list(ReachabilityCache.read(self.path).entries),
+            [SECOND]
+        )
+
+    def test_outdated_format(self):
+        makedirs(join(self.root, 'easyrelease'))
+        with open(self.path, 'w') as handle:
+            handle.write('easyrelease-reachable 0\n-\n%s 9.9.9\n' % FIRST)
+        self.assertEqual(ReachabilityCache.lookup(FIRST, self.find), 'v1.2.0')
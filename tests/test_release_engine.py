@@ -0,0 +1,256 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os import chdir, chmod, environ, getcwd, makedirs
+from os.path import join
+from shutil import rmtree
+from subprocess import check_call, check_output, CalledProcessError
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from mock import patch
+
+from gitflow_easyrelease import (
+    GitDir,
+    GitflowConfig,
+    ReleaseEngine,
+    RepoSnapshot,
+    Subcommand,
+)
+from gitflow_easyrelease.release_engine import UnsupportedRelease
+
+
+class ReleaseEngineTestCase(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.repo = join(self.root, 'repo')
+        environment_patcher = patch.dict(environ, {
+            'GIT_CONFIG_GLOBAL': join(self.root, 'gitconfig'),
+            'GIT_CONFIG_NOSYSTEM': '1',
+            'GIT_AUTHOR_NAME': 'test',
+            'GIT_AUTHOR_EMAIL': 'test@example.com',
+            'GIT_COMMITTER_NAME': 'test',
+            'GIT_COMMITTER_EMAIL': 'test@example.com',
+        })
+        environment_patcher.start()
+        self.addCleanup(environment_patcher.stop)
+        check_call(['git', 'init', '-q', '--bare', join(self.root, 'origin')])
+        check_call(['git', 'init', '-q', self.repo])
+        self.addCleanup(chdir, getcwd())
+        chdir(self.repo)
+        self.git('checkout', '-q', '-b', 'master')
+        self.git('commit', '-q', '--allow-empty', '-m', 'initial')
+        self.git('branch', 'develop')
+        self.git('checkout', '-q', 'develop')
+        self.git('commit', '-q', '--allow-empty', '-m', 'feature')
+        self.git('remote', 'add', 'origin', join(self.root, 'origin'))
+        self.clear()
+        self.addCleanup(self.clear)
+
+    @staticmethod
+    def clear():
+        GitDir.clear()
+        GitflowConfig.clear()
+        RepoSnapshot.clear()
+
+    @staticmethod
+    def git(*args):
+        return check_output(('git',) + args, universal_newlines=True).strip()
+
+    def run_action(self, action, version='1.0.0', base=None, options=None):
+        ReleaseEngine(version, base, options).run(action)
+
+    def is_merged(self, commit, branch):
+        return ReleaseEngine.is_merged(commit, branch)
+
+
+class StartTests(ReleaseEngineTestCase):
+
+    def test_from_develop(self):
+        self.run_action('start')
+        self.assertEqual(self.git('rev-parse', '--abbrev-ref', 'HEAD'), 'release/1.0.0')
+        self.assertEqual(self.git('rev-parse', 'HEAD'), self.git('rev-parse', 'develop'))
+
+    def test_from_base(self):
+        self.run_action('start', base='master')
+        self.assertEqual(
+            self.git('config', 'gitflow.branch.release/1.0.0.base'),
+            'master'
+        )
+        self.assertEqual(self.git('rev-parse', 'HEAD'), self.git('rev-parse', 'master'))
+
+    def test_existing_release(self):
+        self.git('branch', 'release/0.9.0')
+        with self.assertRaises(ValueError):
+            self.run_action('start')
+
+    def test_existing_tag(self):
+        self.git('tag', '1.0.0')
+        with self.assertRaises(ValueError):
+            self.run_action('start')
+
+    @patch.object(ReleaseEngine, 'NATIVE', True)
+    def test_dirty_quick(self):
+        with open('tracked', 'w') as handle:
+            handle.write('one')
+        self.git('add', 'tracked')
+        with self.assertRaises(ValueError):
+            for command in ['start', 'finish']:
+                Subcommand.run_release_command(command, '1.0.0')
+        self.assertEqual(self.git('rev-parse', '--abbrev-ref', 'HEAD'), 'develop')
+        self.assertEqual(self.git('branch', '--list', 'release/*'), '')
+        self.assertEqual(self.git('tag'), '')
+
+
+class FinishTests(ReleaseEngineTestCase):
+
+    def setUp(self):
+        ReleaseEngineTestCase.setUp(self)
+        self.run_action('start')
+        self.git('commit', '-q', '--allow-empty', '-m', 'bump')
+
+    def test_finish(self):
+        self.run_action('finish')
+        self.assertEqual(self.git('rev-parse', '--abbrev-ref', 'HEAD'), 'develop')
+        self.assertEqual(self.git('cat-file', '-t', '1.0.0'), 'tag')
+        self.assertEqual(
+            self.git('rev-parse', '1.0.0^{commit}'),
+            self.git('rev-parse', 'master')
+        )
+        self.assertTrue(self.is_merged('1.0.0', 'develop'))
+        self.assertEqual(self.git('branch', '--list', 'release/*'), '')
+
+    def test_versiontag_prefix_and_message(self):
+        self.git('config', 'gitflow.prefix.versiontag', 'v')
+        self.clear()
+        self.run_action('finish', options=['-m', 'Shipped'])
+        self.assertEqual(
+            self.git('tag', '-l', '--format=%(contents:subject)', 'v1.0.0'),
+            'Shipped'
+        )
+
+    def test_keep_without_tag(self):
+        self.run_action('finish', options=['--keep', '-n'])
+        self.assertEqual(self.git('tag'), '')
+        self.assertTrue(self.is_merged('master', 'develop'))
+        self.assertEqual(self.git('branch', '--list', 'release/*'), 'release/1.0.0')
+
+    def test_config_defaults(self):
+        self.git('config', 'gitflow.release.finish.keep', 'true')
+        self.clear()
+        self.run_action('finish')
+        self.assertEqual(self.git('branch', '--list', 'release/*'), 'release/1.0.0')
+
+    def test_config_override(self):
+        self.git('config', 'gitflow.release.finish.keep', 'true')
+        self.clear()
+        self.run_action('finish', options=['--nokeep'])
+        self.assertEqual(self.git('branch', '--list', 'release/*'), '')
+
+    def test_recorded_base(self):
+        self.git('checkout', '-q', 'master')
+        self.git('branch', '-q', '-D', 'release/1.0.0')
+        self.git('branch', 'support/1.x')
+        self.clear()
+        self.run_action('start', base='support/1.x')
+        self.git('commit', '-q', '--allow-empty', '-m', 'fix')
+        self.run_action('finish')
+        self.assertTrue(self.is_merged('1.0.0', 'support/1.x'))
+        self.assertFalse(self.is_merged('1.0.0', 'develop'))
+        with self.assertRaises(CalledProcessError):
+            self.git('config', 'gitflow.branch.release/1.0.0.base')
+
+    def test_rerun_after_tagging(self):
+        self.git('checkout', '-q', 'master')
+        self.git('merge', '-q', '--no-ff', '--no-edit', 'release/1.0.0')
+        self.git('tag', '-a', '-m', '1.0.0', '1.0.0')
+        self.clear()
+        self.run_action('finish')
+        self.assertTrue(self.is_merged('1.0.0', 'develop'))
+        self.assertEqual(self.git('rev-list', '--merges', '--count', 'master'), '1')
+
+    def test_push(self):
+        self.run_action('finish', options=['--push'])
+        remote = join(self.root, 'origin')
+        self.assertEqual(
+            self.git('--git-dir', remote, 'rev-parse', 'master'),
+            self.git('rev-parse', 'master')
+        )
+        self.assertEqual(
+            self.git('--git-dir', remote, 'rev-parse', 'develop'),
+            self.git('rev-parse', 'develop')
+        )
+        self.assertEqual(
+            self.git('--git-dir', remote, 'rev-parse', '1.0.0'),
+            self.git('rev-parse', '1.0.0')
+        )
+
+    def test_dirty_tree(self):
+        with open('tracked', 'w') as handle:
+            handle.write('one')
+        self.git('add', 'tracked')
+        with self.assertRaises(ValueError):
+            self.run_action('finish')
+        self.assertEqual(self.git('tag'), '')
+
+    def test_unknown_option(self):
+        head = self.git('rev-parse', 'master')
+        with self.assertRaises(UnsupportedRelease):
+            self.run_action('finish', options=['--squash'])
+        self.assertEqual(self.git('rev-parse', 'master'), head)
+
+    def test_unsupported_config(self):
+        self.git('config', 'gitflow.release.finish.sign', 'true')
+        self.clear()
+        with self.assertRaises(UnsupportedRelease):
+            self.run_action('finish')
+        self.assertEqual(self.git('tag'), '')
+
+    def test_hook(self):
+        hooks = join(self.root, 'hooks')
+        makedirs(hooks)
+        hook = join(hooks, 'pre-flow-release-finish')
+        with open(hook, 'w') as handle:
+            handle.write('#!/bin/sh\n')
+        chmod(hook, 0o755)
+        self.git('config', 'gitflow.path.hooks', hooks)
+        self.clear()
+        with self.assertRaises(UnsupportedRelease):
+            self.run_action('finish')
+        self.run_action('delete', options=['-f'])
+
+
+class PublishDeleteTests(ReleaseEngineTestCase):
+
+    def setUp(self):
+        ReleaseEngineTestCase.setUp(self)
+        self.run_action('start')
+
+    def test_publish(self):
+        self.git('checkout', '-q', 'develop')
+        self.clear()
+        self.run_action('publish')
+        self.assertEqual(self.git('rev-parse', '--abbrev-ref', 'HEAD'), 'release/1.0.0')
+        self.assertEqual(
+            self.git('rev-parse', '--abbrev-ref', 'release/1.0.0@{upstream}'),
+            'origin/release/1.0.0'
+        )
+        with self.assertRaises(ValueError):
+            self.run_action('publish')
+
+    def test_delete(self):
+        self.run_action('publish')
+        self.run_action('delete', options=['--remote'])
+        self.assertEqual(self.git('rev-parse', '--abbrev-ref', 'HEAD'), 'master')
+        self.assertEqual(self.git('branch', '--list', 'release/*'), '')
+        self.assertEqual(
+            self.git('--git-dir', join(self.root, 'origin'), 'branch'),
+            ''
+        )
+
+    def test_missing_branch(self):
+        with self.assertRaises(ValueError):
+            self.run_action('delete', '2.0.0')
@@ -2,12 +2,23 @@
 
 from __future__ import print_function
 
-from subprocess import CalledProcessError
+from gc import collect
+from shutil import rmtree
+from subprocess import CalledProcessError, check_call, check_output, PIPE, Popen
+from tempfile import mkdtemp
 from unittest import TestCase
+from weakref import ref
 
-from mock import call, patch
+from mock import call, MagicMock, patch
+from pytest import mark
 
-from gitflow_easyrelease import RepoInfo
+from gitflow_easyrelease import GitDir, RepoInfo, RepoSnapshot
+from gitflow_easyrelease.git_dir import UnsupportedLayout
+
+try:
+    from shutil import which
+except ImportError:  # pragma: no cover
+    from distutils.spawn import find_executable as which
 
 
 class RepoInfoTestCase(TestCase):
@@ -95,91 +106,115 @@ class ToSemverArgsUnitTests(RepoInfoTestCase):
         mock_tidy.assert_not_called()
         mock_release.assert_not_called()
         self.assertEqual(
-            ['1', '2', '3'],
+            ['1', '2', '3', None, None],
             self.repo_info.to_semver_args()
         )
         mock_tidy.assert_called_once_with()
         mock_release.assert_called_once_with()
 
+    @patch.object(RepoInfo, 'tidy_branch', return_value='1.4.0-rc.2')
+    @patch.object(RepoInfo, 'is_release_branch', return_value=True)
+    def test_prerelease_branch(self, mock_release, mock_tidy):
+        self.assertEqual(
+            ['1', '4', '0', 'rc.2', None],
+            self.repo_info.to_semver_args()
+        )
 
-class EnsureGitFlowUnitTests(RepoInfoTestCase):
+    @patch.object(RepoInfo, 'tidy_branch', return_value='1.2')
+    @patch.object(RepoInfo, 'is_release_branch', return_value=True)
+    def test_partial_branch(self, mock_release, mock_tidy):
+        self.assertEqual(['1', '2'], self.repo_info.to_semver_args())
 
-    @staticmethod
-    @patch('gitflow_easyrelease.repo_info.check_output')
-    def test_call(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.ensure_git_flow()
-        mock_check.assert_called_once_with(['which', 'git-flow'])
-
-
-class GetReleasePrefixUnitTests(RepoInfoTestCase):
-
-    @staticmethod
-    @patch('gitflow_easyrelease.repo_info.check_output')
-    def test_success(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.get_release_prefix()
-        mock_check.assert_called_once_with([
-            'git',
-            'config',
-            'gitflow.prefix.release'
-        ])
 
-    @staticmethod
-    @patch(
-        'gitflow_easyrelease.repo_info.check_output',
-        side_effect=CalledProcessError(1, 'git config gitflow.prefix.release')
+class EnsureGitFlowUnitTests(RepoInfoTestCase):
+    GIT_FLOW = '/usr/bin/git-flow'
+
+    def setUp(self):
+        RepoInfoTestCase.setUp(self)
+        git_flow_patcher = patch.object(RepoInfo, 'GIT_FLOW', None)
+        git_flow_patcher.start()
+        self.addCleanup(git_flow_patcher.stop)
+
+    @patch('gitflow_easyrelease.repo_info.which', return_value=GIT_FLOW)
+    def test_cached_search(self, mock_which):
+        mock_which.assert_not_called()
+        self.assertEqual(RepoInfo.ensure_git_flow(), self.GIT_FLOW)
+        self.assertEqual(RepoInfo.ensure_git_flow(), self.GIT_FLOW)
+        mock_which.assert_called_once_with('git-flow')
+
+    @patch('gitflow_easyrelease.repo_info.which', return_value=None)
+    def test_missing(self, mock_which):
+        with self.assertRaises(OSError):
+            RepoInfo.ensure_git_flow()
+        with self.assertRaises(OSError):
+            RepoInfo.ensure_git_flow()
+        mock_which.assert_called_once_with('git-flow')
+
+
+class SnapshotTestCase(RepoInfoTestCase):
+    SNAPSHOT = RepoSnapshot(
+        'develop',
+        ['develop', 'master', 'origin/develop'],
+        ['0.1.0', 'qqq'],
+        {'release': 'rel/'}
     )
-    def test_failure(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.get_release_prefix()
-        mock_check.assert_called_once_with([
-            'git',
-            'config',
-            'gitflow.prefix.release'
-        ])
+
+    def setUp(self):
+        RepoInfoTestCase.setUp(self)
+        current_patcher = patch.object(
+            RepoSnapshot,
+            'current',
+            return_value=self.SNAPSHOT
+        )
+        self.mock_current = current_patcher.start()
+        self.addCleanup(current_patcher.stop)
 
 
-class GetActiveBranchUnitTests(RepoInfoTestCase):
+class GetReleasePrefixUnitTests(SnapshotTestCase):
 
-    @staticmethod
-    @patch('gitflow_easyrelease.repo_info.check_output')
-    def test_call(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.get_active_branch()
-        mock_check.assert_called_once_with([
-            'git',
-            'rev-parse',
-            '--abbrev-ref',
-            'HEAD'
-        ])
+    def test_configured(self):
+        self.assertEqual(RepoInfo.get_release_prefix(), 'rel/')
+        self.mock_current.assert_called_once_with()
 
+    def test_default(self):
+        self.mock_current.return_value = RepoSnapshot()
+        self.assertEqual(RepoInfo.get_release_prefix(), 'release/')
 
-class GetBranchesUnitTests(RepoInfoTestCase):
-
-    @staticmethod
-    @patch('gitflow_easyrelease.repo_info.check_output')
-    def test_call(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.get_branches()
-        mock_check.assert_called_once_with([
-            'git',
-            'for-each-ref',
-            '--format',
-            '%(refname:short)',
-            'refs/heads/',
-            'refs/remotes/'
-        ])
 
+class GetActiveBranchUnitTests(SnapshotTestCase):
+
+    def test_call(self):
+        self.assertEqual(RepoInfo.get_active_branch(), 'develop')
+        self.mock_current.assert_called_once_with()
 
-class GetTagsUnitTests(RepoInfoTestCase):
 
-    @staticmethod
-    @patch('gitflow_easyrelease.repo_info.check_output')
-    def test_call(mock_check):
-        mock_check.assert_not_called()
-        RepoInfo.get_tags()
-        mock_check.assert_called_once_with(['git', 'tag'])
+class GetBranchesUnitTests(SnapshotTestCase):
+
+    def test_call(self):
+        self.assertEqual(
+            RepoInfo.get_branches(),
+            ['develop', 'master', 'origin/develop']
+        )
+        self.mock_current.assert_called_once_with()
+
+
+class HasBranchUnitTests(SnapshotTestCase):
+
+    def test_local(self):
+        self.assertTrue(RepoInfo.has_branch('master'))
+
+    def test_remote(self):
+        self.assertTrue(RepoInfo.has_branch('origin/develop'))
+
+    def test_missing(self):
+        self.assertFalse(RepoInfo.has_branch('origin'))
+
+
+class GetTagsUnitTests(SnapshotTestCase):
+
+    def test_call(self):
+        self.assertEqual(RepoInfo.get_tags(), ['0.1.0', 'qqq'])
+        self.mock_current.assert_called_once_with()
 
 
 class GetSemverTagsUnitTests(RepoInfoTestCase):
@@ -201,3 +236,266 @@ class GetSemverTagsUnitTests(RepoInfoTestCase):
         )
         mock_tags.assert_called_once_with()
         mock_semver.assert_has_calls(self.CALLS)
+
+
+class Refname(str):
+    pass
+
+
+class IterTagsUnitTests(RepoInfoTestCase):
+
+    @patch.object(GitDir, 'current')
+    def test_git_dir(self, mock_current):
+        mock_current.return_value.iter_refs.return_value = iter(
+            ['refs/tags/1.0.0', 'refs/tags/qqq']
+        )
+        self.assertEqual(list(RepoInfo.iter_tags()), ['1.0.0', 'qqq'])
+        mock_current.return_value.iter_refs.assert_called_once_with(
+            'refs/tags/'
+        )
+
+    @patch.object(
+        RepoInfo,
+        'stream_refs',
+        return_value=iter(['refs/tags/1.0.0'])
+    )
+    @patch.object(GitDir, 'current', side_effect=UnsupportedLayout('bare'))
+    def test_fallback(self, mock_current, mock_stream):
+        self.assertEqual(list(RepoInfo.iter_tags()), ['1.0.0'])
+        mock_stream.assert_called_once_with('refs/tags/')
+
+    @patch.object(
+        RepoInfo,
+        'stream_refs',
+        return_value=iter(['refs/tags/1.0.0', 'refs/tags/1.1.0'])
+    )
+    @patch.object(GitDir, 'current')
+    def test_fallback_malformed(self, mock_current, mock_stream):
+        mock_current.return_value.iter_refs.side_effect = UnsupportedLayout(
+            'packed-refs is malformed'
+        )
+        self.assertEqual(list(RepoInfo.iter_tags()), ['1.0.0', '1.1.0'])
+        mock_stream.assert_called_once_with('refs/tags/')
+
+    @patch.object(GitDir, 'current')
+    def test_no_per_tag_state(self, mock_current):
+        released = []
+
+        def iter_refs(prefix):
+            for name in ['1.0.0', '1.1.0', '1.2.0']:
+                refname = Refname(prefix + name)
+                released.append(ref(refname))
+                yield refname
+                del refname
+        mock_current.return_value.iter_refs.side_effect = iter_refs
+        for tag in RepoInfo.iter_tags():
+            collect()
+            self.assertTrue(tag)
+            self.assertEqual(
+                [released_ref() for released_ref in released[:-1]],
+                [None] * (len(released) - 1)
+            )
+        self.assertEqual(len(released), 3)
+
+    @patch.object(
+        RepoInfo,
+        'iter_tags',
+        return_value=iter(['1.0.0', 'qqq', 'v1.1.0'])
+    )
+    def test_semver_only(self, mock_tags):
+        self.assertEqual(
+            list(RepoInfo.iter_semver_tags()),
+            ['1.0.0', 'v1.1.0']
+        )
+
+
+class GetNewestSemverTagUnitTests(RepoInfoTestCase):
+
+    def setUp(self):
+        RepoInfoTestCase.setUp(self)
+        current_patcher = patch.object(
+            RepoSnapshot,
+            'current',
+            return_value=RepoSnapshot(prefixes={'versiontag': 'v'})
+        )
+        current_patcher.start()
+        self.addCleanup(current_patcher.stop)
+
+    @patch.object(RepoInfo, 'stream_refs')
+    def test_reads_newest_core(self, mock_stream):
+        refnames = MagicMock()
+        refnames.__iter__.return_value = iter([
+            'refs/tags/vnext',
+            'refs/tags/v1.10.0',
+            'refs/tags/v1.10.0-rc.1',
+            'refs/tags/v1.9.0',
+            'refs/tags/v1.8.0',
+        ])
+        mock_stream.return_value = refnames
+        self.assertEqual(
+            RepoInfo.get_newest_semver_tags(),
+            ['v1.10.0', 'v1.10.0-rc.1']
+        )
+        mock_stream.assert_called_once_with('refs/tags/v[0-9]*', '-version:refname')
+        refnames.close.assert_called_once_with()
+
+    @patch.object(RepoInfo, 'stream_refs')
+    @patch.object(RepoSnapshot, 'current', return_value=RepoSnapshot(prefixes={}))
+    def test_mixed_leading_v(self, mock_current, mock_stream):
+        bare = MagicMock()
+        bare.__iter__.return_value = iter(['refs/tags/1.10.0', 'refs/tags/1.2.0'])
+        leading_v = MagicMock()
+        leading_v.__iter__.return_value = iter(['refs/tags/v1.9.0'])
+        mock_stream.side_effect = [bare, leading_v]
+        self.assertEqual(RepoInfo.get_newest_semver_tags(), ['1.10.0'])
+        mock_stream.assert_has_calls([
+            call('refs/tags/[0-9]*', '-version:refname'),
+            call('refs/tags/v[0-9]*', '-version:refname'),
+        ])
+
+    @patch.object(
+        RepoInfo,
+        'stream_refs',
+        return_value=(refname for refname in [])
+    )
+    def test_untagged(self, mock_stream):
+        self.assertEqual(RepoInfo.get_newest_semver_tags(), [])
+
+
+@mark.skipif(not which('git'), reason='git is not installed')
+class GitSortTests(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        self.git('init', '-q')
+        self.git('commit', '-q', '--allow-empty', '-m', 'one')
+        for tag in [
+                'v1.9.0',
+                'v1.10.0-rc.2',
+                'v1.10.0',
+                'v1.10.0-rc.10',
+                'v1.2.0',
+                'v2.0',
+                '3.0.0',
+        ]:
+            self.git('tag', tag)
+        popen_patcher = patch(
+            'gitflow_easyrelease.repo_info.Popen',
+            side_effect=lambda *args, **kwargs: Popen(
+                *args,
+                cwd=self.root,
+                **kwargs
+            )
+        )
+        popen_patcher.start()
+        self.addCleanup(popen_patcher.stop)
+        current_patcher = patch.object(
+            RepoSnapshot,
+            'current',
+            return_value=RepoSnapshot(prefixes={'versiontag': 'v'})
+        )
+        current_patcher.start()
+        self.addCleanup(current_patcher.stop)
+
+    def git(self, *args):
+        check_call(
+            [
+                'git',
+                '-c', 'user.name=test',
+                '-c', 'user.email=test@example.com',
+                '-C', self.root,
+            ] + list(args)
+        )
+
+    def test_newest(self):
+        self.assertEqual(
+            RepoInfo.get_newest_semver_tags(),
+            ['v1.10.0', 'v1.10.0-rc.10', 'v1.10.0-rc.2']
+        )
+
+    def test_unprefixed(self):
+        with patch.object(
+            RepoSnapshot,
+            'current',
+            return_value=RepoSnapshot(prefixes={})
+        ):
+            self.assertEqual(RepoInfo.get_newest_semver_tags(), ['3.0.0'])
+
+    def test_reachable(self):
+        self.git('checkout', '-q', '-b', 'support/0.x', 'HEAD')
+        self.git('commit', '-q', '--allow-empty', '-m', 'support')
+        self.git('tag', 'v0.9.1')
+        self.git('checkout', '-q', '-')
+        self.git('commit', '-q', '--allow-empty', '-m', 'two')
+        self.git('tag', 'v4.0.0')
+        with patch(
+            'gitflow_easyrelease.repo_info.check_output',
+            side_effect=lambda *args, **kwargs: check_output(
+                *args,
+                cwd=self.root,
+                **kwargs
+            )
+        ):
+            commit = RepoInfo.resolve_commit('support/0.x')
+        self.assertEqual(
+            sorted(RepoInfo.iter_reachable_semver_tags(commit)),
+            ['3.0.0', 'v0.9.1', 'v1.10.0', 'v1.10.0-rc.10', 'v1.10.0-rc.2', 'v1.2.0', 'v1.9.0']
+        )
+
+
+class StreamRefsUnitTests(RepoInfoTestCase):
+    SIGNATURE = ['git', 'for-each-ref', '--format', '%(refname)', 'refs/tags/']
+
+    def setUp(self):
+        RepoInfoTestCase.setUp(self)
+        popen_patcher = patch('gitflow_easyrelease.repo_info.Popen')
+        self.mock_popen = popen_patcher.start()
+        self.addCleanup(popen_patcher.stop)
+        self.process = MagicMock()
+        self.process.stdout = MagicMock()
+        self.process.stdout.__iter__.return_value = iter(
+            ['refs/tags/1.0.0\n', 'refs/tags/1.1.0\n']
+        )
+        self.process.poll.return_value = None
+        self.process.wait.return_value = 0
+        self.mock_popen.return_value = self.process
+
+    def test_streamed(self):
+        self.assertEqual(
+            list(RepoInfo.stream_refs('refs/tags/')),
+            ['refs/tags/1.0.0', 'refs/tags/1.1.0']
+        )
+        self.mock_popen.assert_called_once_with(
+            self.SIGNATURE,
+            stdout=PIPE,
+            universal_newlines=True
+        )
+        self.process.kill.assert_not_called()
+
+    def test_sorted(self):
+        list(RepoInfo.stream_refs('refs/tags/v*', '-version:refname'))
+        self.mock_popen.assert_called_once_with(
+            [
+                'git',
+                '-c', 'versionsort.suffix=-',
+                'for-each-ref',
+                '--format', '%(refname)',
+                '--sort=-version:refname',
+                'refs/tags/v*',
+            ],
+            stdout=PIPE,
+            universal_newlines=True
+        )
+
+    def test_abandoned(self):
+        refs = RepoInfo.stream_refs('refs/tags/')
+        self.assertEqual(next(refs), 'refs/tags/1.0.0')
+        refs.close()
+        self.process.kill.assert_called_once_with()
+        self.process.wait.assert_called_once_with()
+
+    def test_failure(self):
+        self.process.wait.return_value = 128
+        with self.assertRaises(CalledProcessError):
+            list(RepoInfo.stream_refs('refs/tags/'))
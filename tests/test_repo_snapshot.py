@@ -0,0 +1,214 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import patch
+
+from gitflow_easyrelease import GitDir, GitflowConfig, RepoSnapshot
+from gitflow_easyrelease.git_dir import UnsupportedLayout
+
+
+class RepoSnapshotTestCase(TestCase):
+
+    def setUp(self):
+        RepoSnapshot.clear()
+        self.addCleanup(RepoSnapshot.clear)
+
+
+class ConstructorUnitTests(RepoSnapshotTestCase):
+
+    def test_defaults(self):
+        snapshot = RepoSnapshot()
+        self.assertEqual(snapshot.head, 'HEAD')
+        self.assertEqual(snapshot.branches, [])
+        self.assertEqual(snapshot.tags, [])
+        self.assertEqual(snapshot.get_prefix('release', 'release/'), 'release/')
+
+    def test_branch_set(self):
+        snapshot = RepoSnapshot(branches=['master', 'develop'])
+        self.assertEqual(snapshot.branch_set, frozenset(['master', 'develop']))
+
+
+class HasBranchUnitTests(RepoSnapshotTestCase):
+
+    def setUp(self):
+        RepoSnapshotTestCase.setUp(self)
+        self.loader = lambda: self.fail('refs were listed')
+        self.snapshot = RepoSnapshot(refs_loader=self.loader)
+
+    def test_listed(self):
+        snapshot = RepoSnapshot(branches=['master', 'origin/develop'])
+        self.assertTrue(snapshot.has_branch('origin/develop'))
+        self.assertFalse(snapshot.has_branch('develop'))
+
+    @patch.object(GitDir, 'current')
+    def test_git_dir(self, mock_current):
+        mock_current.return_value.has_ref.side_effect = (
+            lambda refname: 'refs/remotes/origin/master' == refname
+        )
+        self.assertTrue(self.snapshot.has_branch('origin/master'))
+        self.assertFalse(self.snapshot.has_branch('master'))
+        mock_current.return_value.has_ref.assert_called_with(
+            'refs/remotes/master'
+        )
+        self.assertIsNone(self.snapshot.refs)
+
+    @patch(
+        'gitflow_easyrelease.repo_snapshot.check_output',
+        return_value='refs/heads/master\n'
+    )
+    @patch.object(
+        GitDir,
+        'current',
+        side_effect=UnsupportedLayout('reftable')
+    )
+    def test_cli_fallback(self, mock_current, mock_check):
+        self.assertTrue(self.snapshot.has_branch('master'))
+        mock_current.assert_called_once_with()
+        mock_check.assert_called_once_with(
+            [
+                'git',
+                'for-each-ref',
+                '--format',
+                '%(refname)',
+                'refs/heads/master',
+                'refs/remotes/master',
+            ],
+            universal_newlines=True
+        )
+        self.assertIsNone(self.snapshot.refs)
+
+
+class CurrentUnitTests(RepoSnapshotTestCase):
+
+    @patch.object(RepoSnapshot, 'load', return_value=RepoSnapshot())
+    def test_shared(self, mock_load):
+        mock_load.assert_not_called()
+        first = RepoSnapshot.current()
+        self.assertIs(RepoSnapshot.current(), first)
+        mock_load.assert_called_once_with()
+
+    @patch.object(RepoSnapshot, 'load', return_value=RepoSnapshot())
+    def test_clear(self, mock_load):
+        RepoSnapshot.current()
+        RepoSnapshot.clear()
+        RepoSnapshot.current()
+        self.assertEqual(mock_load.call_count, 2)
+
+
+class LoadUnitTests(RepoSnapshotTestCase):
+    REFS = ('master', {'branches': ['master'], 'tags': ['1.0.0']})
+
+    def setUp(self):
+        RepoSnapshotTestCase.setUp(self)
+        config_patcher = patch.object(
+            GitflowConfig,
+            'current',
+            return_value=GitflowConfig({'gitflow.prefix.release': 'r/'})
+        )
+        self.mock_config = config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        read_refs_patcher = patch.object(
+            RepoSnapshot,
+            'read_refs',
+            return_value=self.REFS
+        )
+        self.mock_read_refs = read_refs_patcher.start()
+        self.addCleanup(read_refs_patcher.stop)
+
+    @patch.object(RepoSnapshot, 'read_git_dir', return_value=REFS)
+    @patch.object(GitDir, 'current')
+    def test_lazy_refs(self, mock_current, mock_git_dir):
+        mock_current.return_value.read_head.return_value = 'master'
+        snapshot = RepoSnapshot.load()
+        self.mock_config.assert_called_once_with()
+        self.assertEqual(snapshot.head, 'master')
+        self.assertEqual(snapshot.get_prefix('release'), 'r/')
+        mock_git_dir.assert_not_called()
+        self.assertEqual(snapshot.branches, ['master'])
+        self.assertEqual(snapshot.tags, ['1.0.0'])
+        self.assertEqual(snapshot.branch_set, frozenset(['master']))
+        mock_git_dir.assert_called_once_with()
+        self.mock_read_refs.assert_not_called()
+
+    @patch.object(
+        RepoSnapshot,
+        'read_git_dir',
+        side_effect=UnsupportedLayout('broken loose ref')
+    )
+    @patch.object(GitDir, 'current')
+    def test_lazy_cli_fallback(self, mock_current, mock_git_dir):
+        mock_current.return_value.read_head.return_value = 'master'
+        snapshot = RepoSnapshot.load()
+        self.assertEqual(snapshot.tags, ['1.0.0'])
+        mock_git_dir.assert_called_once_with()
+        self.mock_read_refs.assert_called_once_with()
+
+    @patch.object(
+        GitDir,
+        'current',
+        side_effect=UnsupportedLayout('reftable')
+    )
+    def test_cli_fallback(self, mock_current):
+        snapshot = RepoSnapshot.load()
+        mock_current.assert_called_once_with()
+        self.mock_read_refs.assert_called_once_with()
+        self.assertEqual(snapshot.head, 'master')
+        self.assertEqual(snapshot.tags, ['1.0.0'])
+
+
+class ReadGitDirUnitTests(RepoSnapshotTestCase):
+
+    @patch.object(GitDir, 'current')
+    def test_call(self, mock_current):
+        mock_current.return_value.read_head.return_value = 'develop'
+        mock_current.return_value.read_refs.return_value = [
+            'refs/heads/develop',
+            'refs/heads/master',
+            'refs/tags/1.0.0',
+        ]
+        head, refs = RepoSnapshot.read_git_dir()
+        mock_current.return_value.read_refs.assert_called_once_with(
+            ['refs/heads/', 'refs/remotes/', 'refs/tags/']
+        )
+        self.assertEqual(head, 'develop')
+        self.assertEqual(refs['branches'], ['develop', 'master'])
+        self.assertEqual(refs['tags'], ['1.0.0'])
+
+
+class ReadRefsUnitTests(RepoSnapshotTestCase):
+    OUTPUT = (
+        '  refs/heads/develop\n'
+        '* refs/heads/release/1.2.3\n'
+        '  refs/remotes/origin/develop\n'
+        '  refs/tags/1.2.2\n'
+        '  refs/tags/v1.0.0\n'
+    )
+
+    @patch('gitflow_easyrelease.repo_snapshot.check_output', return_value=OUTPUT)
+    def test_call(self, mock_check):
+        head, refs = RepoSnapshot.read_refs()
+        mock_check.assert_called_once_with(
+            [
+                'git',
+                'for-each-ref',
+                '--format',
+                '%(HEAD) %(refname)',
+                'refs/heads/',
+                'refs/remotes/',
+                'refs/tags/'
+            ],
+            universal_newlines=True
+        )
+        self.assertEqual(head, 'release/1.2.3')
+        self.assertEqual(
+            refs['branches'],
+            ['develop', 'release/1.2.3', 'origin/develop']
+        )
+        self.assertEqual(refs['tags'], ['1.2.2', 'v1.0.0'])
+
+    def test_detached_head(self):
+        head, _ = RepoSnapshot.parse_refs(['  refs/heads/master'])
+        self.assertEqual(head, 'HEAD')
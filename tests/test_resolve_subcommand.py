@@ -0,0 +1,72 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from argparse import ArgumentParser
+from unittest import TestCase
+
+from mock import patch
+
+from gitflow_easyrelease import (
+    ProcessRunner,
+    ResolveSubcommand,
+    SemVer,
+    VersionIndex,
+)
+
+
+class ResolveSubcommandTestCase(TestCase):
+
+    def setUp(self):
+        self.subcommand = ResolveSubcommand('resolve')
+        self.parser = ArgumentParser()
+        self.subcommand.attach_subparser(
+            self.parser.add_subparsers(dest='subcommand')
+        )
+        index_patcher = patch.object(
+            SemVer,
+            'get_version_index',
+            return_value=VersionIndex([
+                SemVer.from_version(version)
+                for version in ['1.2.0', '1.4.0', '2.0.0-rc.1', '2.1.0']
+            ])
+        )
+        index_patcher.start()
+        self.addCleanup(index_patcher.stop)
+        print_patcher = patch('gitflow_easyrelease.resolve_subcommand.print')
+        self.mock_print = print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def run_resolve(self, *args):
+        self.subcommand.execute(
+            self.parser.parse_args(['resolve'] + list(args))
+        )
+
+
+class ExecuteUnitTests(ResolveSubcommandTestCase):
+
+    def test_resolved(self):
+        self.run_resolve('^1.2')
+        self.mock_print.assert_called_once_with(SemVer(1, 4, 0))
+
+    def test_prerelease(self):
+        self.run_resolve('--pre', '>=2.0.0-alpha <2.0.0')
+        self.mock_print.assert_called_once_with(SemVer(2, 0, 0, 'rc.1'))
+
+    def test_phase(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        self.run_resolve('^1.2')
+        self.assertEqual(
+            [phase['name'] for phase in ProcessRunner.PHASES],
+            ['version']
+        )
+
+    def test_unresolved(self):
+        with self.assertRaises(ValueError):
+            self.run_resolve('>=3')
+
+    @patch('sys.stderr')
+    def test_invalid(self, mock_stderr):
+        with self.assertRaises(SystemExit):
+            self.run_resolve('~qqq')
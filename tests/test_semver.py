@@ -2,17 +2,21 @@
 
 from __future__ import print_function
 
+from copy import copy
 from unittest import TestCase
 
-from mock import call, MagicMock, patch
+from mock import MagicMock, patch
 from pytest import mark
 
-from gitflow_easyrelease import SemVer
+from gitflow_easyrelease import ProcessRunner, SemVer, tokenize_semver, VersionIndex
+from gitflow_easyrelease.git_dir import UnsupportedLayout
 
 
 class SemVerTestCase(TestCase):
 
     def setUp(self):
+        SemVer.clear_cache()
+        self.addCleanup(SemVer.clear_cache)
         self.construct_semver()
         self.addCleanup(self.wipe_semver)
 
@@ -64,11 +68,10 @@ class CompareUnitTests(SemVerTestCase):
             self.semver.compare(self.SEMVER_VERSION),
             0
         )
-        mock_comparison.assert_has_calls([
-            call(0, 1),
-            call(0, 2),
-            call(0, 3)
-        ])
+        mock_comparison.assert_called_once_with(
+            (0, 0, 0, SemVer.RELEASE_KEY),
+            (1, 2, 3, SemVer.RELEASE_KEY)
+        )
 
     @patch(
         'gitflow_easyrelease.semver.SemVer.compare_component',
@@ -80,7 +83,52 @@ class CompareUnitTests(SemVerTestCase):
             self.semver.compare(self.SEMVER_VERSION),
             1
         )
-        mock_comparison.assert_called_once_with(0, 1)
+        mock_comparison.assert_called_once_with(
+            (0, 0, 0, SemVer.RELEASE_KEY),
+            (1, 2, 3, SemVer.RELEASE_KEY)
+        )
+
+
+class OrderingUnitTests(SemVerTestCase):
+    VERSIONS = [SemVer(1, 10, 0), SemVer(1, 2, 0), SemVer(0, 9, 9)]
+
+    def test_sorted(self):
+        self.assertEqual(
+            sorted(self.VERSIONS),
+            [SemVer(0, 9, 9), SemVer(1, 2, 0), SemVer(1, 10, 0)]
+        )
+        self.assertEqual(max(self.VERSIONS), SemVer(1, 10, 0))
+
+    def test_operators(self):
+        self.assertTrue(SemVer(1, 2, 3) < SemVer(1, 3, 0))
+        self.assertTrue(SemVer(1, 2, 3) <= SemVer(1, 2, 3))
+        self.assertTrue(SemVer(2, 0, 0) > SemVer(1, 99, 99))
+        self.assertTrue(SemVer(1, 2, 3) >= SemVer(1, 2, 3))
+        self.assertTrue(SemVer(1, 2, 3) != SemVer(1, 2, 4))
+        self.assertFalse(SemVer(1, 2, 3) == '1.2.3')
+
+    def test_hashable(self):
+        self.assertEqual(
+            len(set([SemVer(1, 2, 3), SemVer('1', '2', '3'), SemVer()])),
+            2
+        )
+
+    @patch(
+        'gitflow_easyrelease.semver.tokenize_semver',
+        side_effect=tokenize_semver
+    )
+    def test_lookup(self, mock_tokenize):
+        self.assertIsNone(SemVer.lookup('qqq'))
+        self.assertIsNone(SemVer.lookup('qqq'))
+        self.assertEqual('%s' % SemVer.from_version('qqq'), '0.0.0')
+        self.assertIs(SemVer.lookup('v1.2.3'), SemVer.from_version('v1.2.3'))
+        self.assertEqual(mock_tokenize.call_count, 2)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.semver.major = 1
+        with self.assertRaises(AttributeError):
+            self.semver.extra = 1
 
 
 class GreaterUnitTests(SemVerTestCase):
@@ -202,7 +250,7 @@ class BumpUnitTests(SemVerTestCase):
             self.semver.__repr__(),
             '1.2.3'
         )
-        self.semver.bump(' '.join(SemVer.ALL_KEYS))
+        self.assertIs(self.semver.bump(' '.join(SemVer.ALL_KEYS)), self.semver)
         self.assertEqual(
             self.semver.__repr__(),
             '1.2.3'
@@ -215,11 +263,14 @@ class BumpUnitTests(SemVerTestCase):
                 self.semver.__repr__(),
                 '1.2.3'
             )
-            self.semver.bump(component)
             self.assertEqual(
-                self.semver.__repr__(),
+                self.semver.bump(component).__repr__(),
                 '1.2.4'
             )
+            self.assertEqual(
+                self.semver.__repr__(),
+                '1.2.3'
+            )
 
     def test_minor_bump(self):
         for component in SemVer.MINOR_KEYS:
@@ -228,11 +279,14 @@ class BumpUnitTests(SemVerTestCase):
                 self.semver.__repr__(),
                 '1.2.3'
             )
-            self.semver.bump(component)
             self.assertEqual(
-                self.semver.__repr__(),
+                self.semver.bump(component).__repr__(),
                 '1.3.0'
             )
+            self.assertEqual(
+                self.semver.__repr__(),
+                '1.2.3'
+            )
 
     def test_major_bump(self):
         for component in SemVer.MAJOR_KEYS:
@@ -241,11 +295,14 @@ class BumpUnitTests(SemVerTestCase):
                 self.semver.__repr__(),
                 '1.2.3'
             )
-            self.semver.bump(component)
             self.assertEqual(
-                self.semver.__repr__(),
+                self.semver.bump(component).__repr__(),
                 '2.0.0'
             )
+            self.assertEqual(
+                self.semver.__repr__(),
+                '1.2.3'
+            )
 
 
 @mark.parametrize(
@@ -261,35 +318,140 @@ def test_compare_component(first, second, result):
 
 
 class FromVersionUnitTests(SemVerTestCase):
-    VERSION = '1.2.3'
 
-    @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=True
-    )
-    def test_with_semver_version(self, mock_is_semver):
-        mock_is_semver.assert_not_called()
-        result = SemVer.from_version(self.VERSION)
-        mock_is_semver.assert_called_once_with(self.VERSION)
+    def test_with_semver_version(self):
+        result = SemVer.from_version('v1.4.0-rc.2+build.77')
+        self.assertEqual(result.key[:3], (1, 4, 0))
+        self.assertEqual(result.prerelease, 'rc.2')
+        self.assertEqual(result.build, 'build.77')
+        self.assertEqual(result.__repr__(), '1.4.0-rc.2+build.77')
+
+    def test_without_semver_version(self):
+        self.assertEqual(
+            SemVer.from_version('1.4.0-rc.02').__repr__(),
+            '0.0.0'
+        )
+
+    def test_strict_parse(self):
+        self.assertEqual(SemVer.parse_version('01.2.3').key[:3], (1, 2, 3))
+        self.assertEqual(
+            SemVer.parse_version('01.2.3', strict=True).__repr__(),
+            '0.0.0'
+        )
+        self.assertEqual(
+            SemVer.parse_version('1.2.3-rc.1', strict=True).__repr__(),
+            '1.2.3-rc.1'
+        )
+
+
+class FromVersionCacheUnitTests(SemVerTestCase):
+
+    def test_shared_instances(self):
+        first = SemVer.from_version('1.2.3')
+        self.assertIs(SemVer.from_version('1.2.3'), first)
+        self.assertIsNot(SemVer.from_version('v1.2.3'), first)
         self.assertEqual(
-            result.__repr__(),
-            self.VERSION
+            SemVer.get_cache_info(),
+            {
+                'hits': 1,
+                'misses': 2,
+                'size': 2,
+                'max_size': SemVer.CACHE_SIZE,
+            }
         )
 
     @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=False
+        'gitflow_easyrelease.semver.tokenize_semver',
+        side_effect=tokenize_semver
     )
-    def test_without_semver_version(self, mock_is_semver):
-        mock_is_semver.assert_not_called()
-        result = SemVer.from_version(self.VERSION)
-        mock_is_semver.assert_called_once_with(self.VERSION)
+    def test_lookup(self, mock_tokenize):
+        self.assertIsNone(SemVer.lookup('qqq'))
+        self.assertIsNone(SemVer.lookup('qqq'))
+        self.assertEqual('%s' % SemVer.from_version('qqq'), '0.0.0')
+        self.assertIs(SemVer.lookup('v1.2.3'), SemVer.from_version('v1.2.3'))
+        self.assertEqual(mock_tokenize.call_count, 2)
+
+    def test_immutable(self):
+        version = SemVer.from_version('1.2.3-rc.1')
+        for name in ['key', 'prerelease', 'build', 'major']:
+            with self.assertRaises(AttributeError):
+                setattr(version, name, None)
+        with self.assertRaises(AttributeError):
+            del version.prerelease
+        self.assertEqual('%s' % SemVer.from_version('1.2.3-rc.1'), '1.2.3-rc.1')
+
+    def test_copy(self):
+        version = SemVer(1, 2, 3, 'rc.1', 'build.5')
+        copied = copy(version)
+        self.assertEqual(copied, version)
+        self.assertEqual(copied.build, 'build.5')
+
+    @patch.object(SemVer, 'CACHE_SIZE', 2)
+    @patch(
+        'gitflow_easyrelease.semver.tokenize_semver',
+        side_effect=tokenize_semver
+    )
+    def test_eviction(self, mock_parse):
+        SemVer.from_version('1.0.0')
+        SemVer.from_version('2.0.0')
+        SemVer.from_version('1.0.0')
+        SemVer.from_version('3.0.0')
+        self.assertEqual(list(SemVer.CACHE), ['1.0.0', '3.0.0'])
+        SemVer.from_version('2.0.0')
+        self.assertEqual(mock_parse.call_count, 4)
+
+    @patch.object(SemVer, 'CACHE_SIZE', 0)
+    def test_disabled(self):
+        SemVer.from_version('1.0.0')
+        self.assertEqual(len(SemVer.CACHE), 0)
+
+    def test_clear(self):
+        SemVer.from_version('1.0.0')
+        SemVer.from_version('1.0.0')
+        SemVer.clear_cache()
         self.assertEqual(
-            result.__repr__(),
-            '0.0.0'
+            SemVer.get_cache_info(),
+            {'hits': 0, 'misses': 0, 'size': 0, 'max_size': SemVer.CACHE_SIZE}
         )
 
 
+def test_precedence():
+    ordered = [
+        '1.0.0-alpha',
+        '1.0.0-alpha.1',
+        '1.0.0-alpha.beta',
+        '1.0.0-beta',
+        '1.0.0-beta.2',
+        '1.0.0-beta.11',
+        '1.0.0-rc.1',
+        '1.0.0',
+        '1.0.1-0',
+        '1.0.1',
+        '1.10.0',
+    ]
+    versions = [SemVer.from_version(version) for version in ordered]
+    assert ordered == [
+        version.__repr__()
+        for version in sorted(reversed(versions))
+    ]
+    assert SemVer.from_version('1.0.0+a') == SemVer.from_version('1.0.0+b')
+
+
+@mark.parametrize(
+    "version,component,result",
+    [
+        ('1.4.0-rc.2', 'patch', '1.4.0'),
+        ('1.4.0-rc.2', 'minor', '1.4.0'),
+        ('1.4.1-rc.2', 'minor', '1.5.0'),
+        ('2.0.0-rc.2', 'major', '2.0.0'),
+        ('2.1.0-rc.2', 'major', '3.0.0'),
+        ('1.4.0+build.7', 'patch', '1.4.1'),
+    ]
+)
+def test_prerelease_bump(version, component, result):
+    assert result == SemVer.from_version(version).bump(component).__repr__()
+
+
 @mark.parametrize(
     "version,result",
     [
@@ -352,7 +514,7 @@ class GetCurrentVersionUnitTests(SemVerTestCase):
         RETURN_NONE
     )
     @patch(
-        'gitflow_easyrelease.semver.RepoInfo.get_semver_tags',
+        'gitflow_easyrelease.semver.SemVer.get_latest_version',
         RETURN_NONE
     )
     def test_no_versions(self):
@@ -366,16 +528,218 @@ class GetCurrentVersionUnitTests(SemVerTestCase):
         RETURN_NONE
     )
     @patch(
-        'gitflow_easyrelease.semver.RepoInfo.get_semver_tags',
-        return_value=TAGS
+        'gitflow_easyrelease.semver.TagIndex.load',
+        side_effect=UnsupportedLayout('no .git found')
     )
-    def test_tagged_versions(self, mock_tags):
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.iter_semver_tags',
+        side_effect=lambda: iter(GetCurrentVersionUnitTests.TAGS)
+    )
+    def test_tagged_versions(self, mock_tags, mock_load):
         mock_tags.assert_not_called()
         self.assertEqual(
             SemVer.get_current_version().__repr__(),
             '1.0.0'
         )
         mock_tags.assert_called_once_with()
+        mock_load.assert_called_once_with(SemVer.get_sorted_tags)
+
+    @patch(
+        'gitflow_easyrelease.semver.SemVer.get_active_branch',
+        RETURN_NONE
+    )
+    @patch(
+        'gitflow_easyrelease.semver.TagIndex.load',
+        return_value=MagicMock(latest='v2.3.4')
+    )
+    @patch('gitflow_easyrelease.semver.RepoInfo.iter_semver_tags')
+    def test_indexed_versions(self, mock_tags, mock_load):
+        self.assertEqual(
+            SemVer.get_current_version().__repr__(),
+            '2.3.4'
+        )
+        mock_load.assert_called_once_with(SemVer.get_sorted_tags)
+        mock_tags.assert_not_called()
+
+
+class GetLatestVersionUnitTests(SemVerTestCase):
+
+    @patch.object(SemVer, 'GIT_SORT', True)
+    @patch('gitflow_easyrelease.semver.TagIndex.load')
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.get_newest_semver_tags',
+        return_value=['v1.10.0-rc.1', 'v1.10.0', 'v1.10.0-beta.11']
+    )
+    def test_git_sort(self, mock_newest, mock_load):
+        self.assertEqual(SemVer.get_latest_version().__repr__(), '1.10.0')
+        mock_newest.assert_called_once_with()
+        mock_load.assert_not_called()
+
+    @patch.object(SemVer, 'GIT_SORT', True)
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.get_newest_semver_tags',
+        return_value=[]
+    )
+    def test_git_sort_untagged(self, mock_newest):
+        self.assertIsNone(SemVer.get_latest_version())
+
+
+class GetVersionIndexUnitTests(SemVerTestCase):
+
+    @patch(
+        'gitflow_easyrelease.semver.TagIndex.load',
+        return_value=MagicMock(
+            get_tags=MagicMock(return_value=['1.0.0', 'v2.0.0'])
+        )
+    )
+    def test_indexed(self, mock_load):
+        index = SemVer.get_version_index()
+        self.assertEqual(index.keys, [(1, 0, 0, (1,)), (2, 0, 0, (1,))])
+        mock_load.assert_called_once_with(SemVer.get_sorted_tags)
+
+    @patch.object(SemVer, 'get_sorted_tags', return_value=['1.0.0'])
+    @patch(
+        'gitflow_easyrelease.semver.TagIndex.load',
+        side_effect=UnsupportedLayout('bare')
+    )
+    def test_fallback(self, mock_load, mock_sorted):
+        self.assertEqual(len(SemVer.get_version_index()), 1)
+        mock_sorted.assert_called_once_with()
+
+    @patch.object(SemVer, 'get_sorted_tags', return_value=['1.0.0'])
+    @patch(
+        'gitflow_easyrelease.semver.TagIndex.load',
+        side_effect=UnsupportedLayout('bare')
+    )
+    def test_span(self, mock_load, mock_sorted):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        SemVer.get_version_index()
+        self.assertEqual(
+            [span['name'] for span in ProcessRunner.SPANS],
+            ['SemVer.get_version_index']
+        )
+
+
+class GetCurrentVersionOnLineUnitTests(SemVerTestCase):
+
+    def setUp(self):
+        SemVerTestCase.setUp(self)
+        index_patcher = patch.object(
+            SemVer,
+            'get_version_index',
+            return_value=VersionIndex([
+                SemVer.from_version(version)
+                for version in ['2.9.0', '3.4.1', '3.4.2', '3.5.0']
+            ])
+        )
+        index_patcher.start()
+        self.addCleanup(index_patcher.stop)
+
+    @patch.object(SemVer, 'get_active_branch')
+    def test_line(self, mock_active):
+        self.assertEqual(SemVer.get_current_version('3.4').__repr__(), '3.4.2')
+        mock_active.assert_not_called()
+
+    def test_missing_line(self):
+        with self.assertRaises(ValueError):
+            SemVer.get_current_version('4')
+
+    def test_bump(self):
+        self.assertEqual(
+            SemVer.process_version('patch', '3.4').__repr__(),
+            '3.4.3'
+        )
+        self.assertEqual(
+            SemVer.process_version('minor', '2').__repr__(),
+            '2.10.0'
+        )
+
+
+class GetReachableVersionUnitTests(SemVerTestCase):
+    COMMIT = 'a' * 40
+
+    def setUp(self):
+        SemVerTestCase.setUp(self)
+        resolve_patcher = patch(
+            'gitflow_easyrelease.semver.RepoInfo.resolve_commit',
+            return_value=self.COMMIT
+        )
+        self.mock_resolve = resolve_patcher.start()
+        self.addCleanup(resolve_patcher.stop)
+
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.iter_reachable_semver_tags',
+        return_value=iter(['1.9.0', 'v1.10.0-rc.1', '1.2.0'])
+    )
+    def test_find(self, mock_tags):
+        self.assertEqual(SemVer.find_reachable_tag(self.COMMIT), 'v1.10.0-rc.1')
+        mock_tags.assert_called_once_with(self.COMMIT)
+
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.iter_reachable_semver_tags',
+        return_value=iter([])
+    )
+    def test_find_untagged(self, mock_tags):
+        self.assertIsNone(SemVer.find_reachable_tag(self.COMMIT))
+
+    @patch(
+        'gitflow_easyrelease.semver.ReachabilityCache.lookup',
+        return_value='1.4.0'
+    )
+    def test_cached(self, mock_lookup):
+        self.assertEqual(
+            SemVer.get_reachable_version('support/1.x').__repr__(),
+            '1.4.0'
+        )
+        self.mock_resolve.assert_called_once_with('support/1.x')
+        mock_lookup.assert_called_once_with(
+            self.COMMIT,
+            SemVer.find_reachable_tag
+        )
+
+    @patch.object(SemVer, 'find_reachable_tag', return_value=None)
+    @patch(
+        'gitflow_easyrelease.semver.ReachabilityCache.lookup',
+        side_effect=UnsupportedLayout('bare')
+    )
+    def test_fallback(self, mock_lookup, mock_find):
+        self.assertIsNone(SemVer.get_reachable_version())
+        mock_find.assert_called_once_with(self.COMMIT)
+
+    @patch.object(SemVer, 'get_latest_version')
+    @patch.object(SemVer, 'get_reachable_version', return_value=None)
+    def test_current_version(self, mock_reachable, mock_latest):
+        self.assertEqual(
+            SemVer.get_current_version(reachable_from='HEAD').__repr__(),
+            '0.0.0'
+        )
+        mock_reachable.assert_called_once_with('HEAD')
+        mock_latest.assert_not_called()
+
+
+class GetSortedTagsUnitTests(SemVerTestCase):
+
+    @patch(
+        'gitflow_easyrelease.semver.RepoInfo.iter_semver_tags',
+        return_value=iter(['1.10.0', 'v1.2.0', '0.9.9', '1.2.1'])
+    )
+    def test_call(self, mock_tags):
+        self.assertEqual(
+            SemVer.get_sorted_tags(),
+            ['0.9.9', 'v1.2.0', '1.2.1', '1.10.0']
+        )
+        mock_tags.assert_called_once_with()
+
+
+class GetMaxVersionUnitTests(SemVerTestCase):
+
+    def test_streamed(self):
+        versions = SemVer.iter_versions(iter(['0.2.0', 'v1.10.0', '1.9.9']))
+        self.assertEqual(SemVer.get_max_version(versions).__repr__(), '1.10.0')
+
+    def test_empty(self):
+        self.assertIsNone(SemVer.get_max_version(iter([])))
 
 
 class ProcessVersionUnitTests(SemVerTestCase):
@@ -386,13 +750,9 @@ class ProcessVersionUnitTests(SemVerTestCase):
 
     def setUp(self):
         SemVerTestCase.setUp(self)
-        from_version_patcher = patch.object(
-            SemVer,
-            'from_version',
-            return_value=self.FROM_VERSION
-        )
-        self.mock_from_version = from_version_patcher.start()
-        self.addCleanup(from_version_patcher.stop)
+        lookup_patcher = patch.object(SemVer, 'lookup', return_value=None)
+        self.mock_lookup = lookup_patcher.start()
+        self.addCleanup(lookup_patcher.stop)
         get_current_branch_patcher = patch.object(
             SemVer,
             'get_current_version',
@@ -408,98 +768,56 @@ class ProcessVersionUnitTests(SemVerTestCase):
         self.mock_get_active_branch = get_active_branch_patcher.start()
         self.addCleanup(get_active_branch_patcher.stop)
 
-    @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=False
-    )
     @patch(
         'gitflow_easyrelease.semver.SemVer.is_component',
         return_value=False
     )
-    def test_weird_version(self, mock_component, mock_is):
-        mock_is.assert_not_called()
-        self.mock_from_version.assert_not_called()
-        mock_component.assert_not_called()
-        self.mock_get_current_branch.assert_not_called()
-        self.mock_get_active_branch.assert_not_called()
+    def test_weird_version(self, mock_component):
         self.assertEqual(
             SemVer.process_version(self.WEIRD_VERSION),
             self.WEIRD_VERSION
         )
-        mock_is.assert_called_once_with(self.WEIRD_VERSION)
-        self.mock_from_version.assert_not_called()
+        self.mock_lookup.assert_called_once_with(self.WEIRD_VERSION)
         mock_component.assert_called_once_with(self.WEIRD_VERSION)
         self.mock_get_current_branch.assert_not_called()
         self.mock_get_active_branch.assert_not_called()
 
-    @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=True
-    )
     @patch(
         'gitflow_easyrelease.semver.SemVer.is_component',
         return_value=False
     )
-    def test_semver(self, mock_component, mock_is):
-        mock_is.assert_not_called()
-        self.mock_from_version.assert_not_called()
-        mock_component.assert_not_called()
-        self.mock_get_current_branch.assert_not_called()
-        self.mock_get_active_branch.assert_not_called()
-        self.assertEqual(
-            SemVer.process_version(self.SEMVER).__repr__(),
-            self.FROM_VERSION.__repr__()
-        )
-        mock_is.assert_called_once_with(self.SEMVER)
-        self.mock_from_version.assert_called_once_with(self.SEMVER)
+    def test_semver(self, mock_component):
+        self.mock_lookup.return_value = self.FROM_VERSION
+        self.assertIs(SemVer.process_version(self.SEMVER), self.FROM_VERSION)
+        self.mock_lookup.assert_called_once_with(self.SEMVER)
         mock_component.assert_not_called()
         self.mock_get_current_branch.assert_not_called()
         self.mock_get_active_branch.assert_not_called()
 
-    @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=False
-    )
     @patch(
         'gitflow_easyrelease.semver.SemVer.is_component',
         return_value=True
     )
-    def test_component(self, mock_component, mock_is):
-        mock_is.assert_not_called()
-        self.mock_from_version.assert_not_called()
-        mock_component.assert_not_called()
-        self.mock_get_current_branch.assert_not_called()
-        self.mock_get_active_branch.assert_not_called()
+    def test_component(self, mock_component):
         self.assertEqual(
             SemVer.process_version(self.COMPONENT).__repr__(),
             '1.0.0'
         )
-        mock_is.assert_called_once_with(self.COMPONENT)
-        self.mock_from_version.assert_not_called()
+        self.mock_lookup.assert_called_once_with(self.COMPONENT)
         mock_component.assert_called_once_with(self.COMPONENT)
-        self.mock_get_current_branch.assert_called_once_with()
+        self.mock_get_current_branch.assert_called_once_with(None, None)
         self.mock_get_active_branch.assert_not_called()
 
-    @patch(
-        'gitflow_easyrelease.semver.is_semver',
-        return_value=True
-    )
     @patch(
         'gitflow_easyrelease.semver.SemVer.is_component',
         return_value=True
     )
-    def test_none(self, mock_component, mock_is):
-        mock_is.assert_not_called()
-        self.mock_from_version.assert_not_called()
-        mock_component.assert_not_called()
-        self.mock_get_current_branch.assert_not_called()
-        self.mock_get_active_branch.assert_not_called()
+    def test_none(self, mock_component):
         self.assertEqual(
             SemVer.process_version().__repr__(),
             '0.0.0'
         )
-        mock_is.assert_not_called()
-        self.mock_from_version.assert_not_called()
+        self.mock_lookup.assert_not_called()
         mock_component.assert_not_called()
         self.mock_get_current_branch.assert_not_called()
         self.mock_get_active_branch.assert_called_once_with()
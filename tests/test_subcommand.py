@@ -2,12 +2,17 @@
 
 from __future__ import print_function
 
+from argparse import ArgumentTypeError
+from sys import executable
+
 from pytest import mark
 from unittest import TestCase
 
 from mock import call, MagicMock, patch
 
-from gitflow_easyrelease import SemVer, Subcommand
+from gitflow_easyrelease import ReleaseEngine, SemVer, Subcommand
+from gitflow_easyrelease.release_engine import UnsupportedRelease
+from gitflow_easyrelease.subcommand import ReleaseCommandError
 
 
 class SubcommandTestCase(TestCase):
@@ -104,6 +109,11 @@ class ExecuteUnitTests(SubcommandTestCase):
         )
         self.mock_execute_release_command = execute_release_command_patcher.start()
         self.addCleanup(execute_release_command_patcher.stop)
+        ensure_git_flow_patcher = patch(
+            'gitflow_easyrelease.subcommand.RepoInfo.ensure_git_flow'
+        )
+        self.mock_ensure_git_flow = ensure_git_flow_patcher.start()
+        self.addCleanup(ensure_git_flow_patcher.stop)
 
     @patch(
         'gitflow_easyrelease.subcommand.SemVer.process_version',
@@ -131,6 +141,98 @@ class ExecuteUnitTests(SubcommandTestCase):
             call(self.RELEASE_COMMANDS[0], self.VERSION, None, None)
         ])
 
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer.process_version',
+        return_value=VERSION
+    )
+    def test_with_line(self, mock_process):
+        self.subcommand.has_version = True
+        self.subcommand.execute(MagicMock(
+            version='patch',
+            line='3.4',
+            spec=['version', 'line']
+        ))
+        mock_process.assert_called_once_with('patch', '3.4', None)
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer.process_version',
+        return_value=VERSION
+    )
+    def test_reachable_from_base(self, mock_process):
+        self.subcommand.has_version = True
+        self.subcommand.has_base = True
+        self.subcommand.execute(MagicMock(
+            version='patch',
+            base='support/1.x',
+            reachable=True,
+            spec=['version', 'base', 'reachable']
+        ))
+        mock_process.assert_called_once_with('patch', None, 'support/1.x')
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer.process_version',
+        return_value=VERSION
+    )
+    def test_reachable_from_head(self, mock_process):
+        self.subcommand.has_version = True
+        self.subcommand.execute(MagicMock(
+            version='patch',
+            reachable=True,
+            spec=['version', 'reachable']
+        ))
+        mock_process.assert_called_once_with('patch', None, 'HEAD')
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer.process_version',
+        return_value=VERSION
+    )
+    def test_reachable_from_revision(self, mock_process):
+        self.subcommand.has_version = True
+        self.subcommand.execute(MagicMock(
+            version='minor',
+            reachable_from='v1.2.0',
+            spec=['version', 'reachable_from']
+        ))
+        mock_process.assert_called_once_with('minor', None, 'v1.2.0')
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer',
+        MagicMock(return_value=VERSION)
+    )
+    def test_git_flow_check(self):
+        self.mock_ensure_git_flow.assert_not_called()
+        self.subcommand.execute(MagicMock(spec=[]))
+        self.mock_ensure_git_flow.assert_called_once_with()
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer',
+        MagicMock(return_value=VERSION)
+    )
+    @patch('gitflow_easyrelease.subcommand.RepoSnapshot.clear')
+    def test_snapshot_cleared(self, mock_clear):
+        self.subcommand.execute(MagicMock(spec=[]))
+        mock_clear.assert_called_once_with()
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer',
+        MagicMock(return_value=VERSION)
+    )
+    @patch.object(ReleaseEngine, 'NATIVE', True)
+    def test_no_git_flow_check_when_native(self):
+        with patch.object(Subcommand, 'run_release_command') as mock_run:
+            self.subcommand.execute(MagicMock(spec=[]))
+        self.mock_ensure_git_flow.assert_not_called()
+        mock_run.assert_called_once_with('one', self.VERSION, None, None)
+
+    @patch(
+        'gitflow_easyrelease.subcommand.SemVer',
+        MagicMock(return_value=VERSION)
+    )
+    def test_no_git_flow_check_without_commands(self):
+        self.subcommand.release_commands = []
+        self.subcommand.execute(MagicMock(spec=[]))
+        self.mock_ensure_git_flow.assert_not_called()
+
     @patch(
         'gitflow_easyrelease.subcommand.SemVer',
         MagicMock(return_value=VERSION)
@@ -191,6 +293,16 @@ class AttachVersionArgumentUnitTests(SubcommandTestCase):
         self.mock_add.assert_called_once()
 
 
+class ReleaseLineUnitTests(SubcommandTestCase):
+
+    def test_valid(self):
+        self.assertEqual(Subcommand.release_line('3.4.x'), '3.4.x')
+
+    def test_invalid(self):
+        with self.assertRaises(ArgumentTypeError):
+            Subcommand.release_line('3.4.5')
+
+
 class AttachBaseArgumentUnitTests(SubcommandTestCase):
 
     def setUp(self):
@@ -198,16 +310,84 @@ class AttachBaseArgumentUnitTests(SubcommandTestCase):
         self.mock_add = MagicMock()
         self.parser = MagicMock(add_argument=self.mock_add)
 
-    @patch(
-        'gitflow_easyrelease.subcommand.RepoInfo.get_branches',
-        return_value=[]
-    )
-    def test_add_call(self, mock_branches):
-        mock_branches.assert_not_called()
+    @patch('gitflow_easyrelease.subcommand.RepoInfo.has_branch')
+    @patch('gitflow_easyrelease.subcommand.RepoInfo.get_branches')
+    def test_add_call(self, mock_branches, mock_has_branch):
         self.mock_add.assert_not_called()
         Subcommand.attach_base_argument(self.parser)
         self.mock_add.assert_called_once()
-        mock_branches.assert_called_once_with()
+        self.assertNotIn('choices', self.mock_add.call_args[1])
+        mock_branches.assert_not_called()
+        mock_has_branch.assert_not_called()
+
+
+class BaseBranchUnitTests(SubcommandTestCase):
+    BRANCH = 'develop'
+
+    @patch(
+        'gitflow_easyrelease.subcommand.RepoInfo.has_branch',
+        return_value=True
+    )
+    def test_known_branch(self, mock_has_branch):
+        self.assertEqual(Subcommand.base_branch(self.BRANCH), self.BRANCH)
+        mock_has_branch.assert_called_once_with(self.BRANCH)
+
+    @patch(
+        'gitflow_easyrelease.subcommand.RepoInfo.has_branch',
+        return_value=False
+    )
+    def test_unknown_branch(self, mock_has_branch):
+        with self.assertRaises(ArgumentTypeError):
+            Subcommand.base_branch(self.BRANCH)
+        mock_has_branch.assert_called_once_with(self.BRANCH)
+
+class RunReleaseCommandUnitTests(TestCase):
+    VERSION = '1.2.3'
+
+    def setUp(self):
+        execute_patcher = patch.object(Subcommand, 'execute_release_command')
+        self.mock_execute = execute_patcher.start()
+        self.addCleanup(execute_patcher.stop)
+        engine_patcher = patch('gitflow_easyrelease.subcommand.ReleaseEngine')
+        self.mock_engine = engine_patcher.start()
+        self.addCleanup(engine_patcher.stop)
+        ensure_patcher = patch(
+            'gitflow_easyrelease.subcommand.RepoInfo.ensure_git_flow'
+        )
+        self.mock_ensure = ensure_patcher.start()
+        self.addCleanup(ensure_patcher.stop)
+
+    def test_git_flow(self):
+        self.mock_engine.NATIVE = False
+        Subcommand.run_release_command('finish', self.VERSION, None, ['-k'])
+        self.mock_engine.assert_not_called()
+        self.mock_execute.assert_called_once_with(
+            'finish',
+            self.VERSION,
+            None,
+            ['-k']
+        )
+
+    def test_native(self):
+        self.mock_engine.NATIVE = True
+        Subcommand.run_release_command('finish', self.VERSION, None, ['-k'])
+        self.mock_engine.assert_called_once_with(self.VERSION, None, ['-k'])
+        self.mock_engine.return_value.run.assert_called_once_with('finish')
+        self.mock_execute.assert_not_called()
+        self.mock_ensure.assert_not_called()
+
+    def test_native_fallback(self):
+        self.mock_engine.NATIVE = True
+        self.mock_engine.return_value.run.side_effect = UnsupportedRelease
+        Subcommand.run_release_command('finish', self.VERSION, None, ['-S'])
+        self.mock_ensure.assert_called_once_with()
+        self.mock_execute.assert_called_once_with(
+            'finish',
+            self.VERSION,
+            None,
+            ['-S']
+        )
+
 
 COMMON_SIGNATURE = ['git', 'flow', 'release']
 
@@ -238,18 +418,57 @@ COMMON_SIGNATURE = ['git', 'flow', 'release']
         ),
     ]
 )
-@patch(
-    'gitflow_easyrelease.subcommand.check_output'
-)
+@patch.object(Subcommand, 'stream_command')
 def test_execute_release_command(
-        mock_check,
+        mock_stream,
         command,
         version,
         base,
         options,
         call_signature,
-        # mock_check
 ):
-    mock_check.assert_not_called()
+    mock_stream.assert_not_called()
     Subcommand.execute_release_command(command, version, base, options)
-    mock_check.assert_called_once_with(call_signature)
+    mock_stream.assert_called_once_with(call_signature)
+
+
+def written(sink):
+    return ''.join(args[0] for args, _ in sink.write.call_args_list)
+
+
+class StreamCommandTests(TestCase):
+
+    def test_streams_lines(self):
+        sink = MagicMock()
+        Subcommand.stream_command(
+            [
+                executable,
+                '-c',
+                'import sys; print("one"); sys.stderr.write("two\\n")',
+            ],
+            sink
+        )
+        self.assertEqual(written(sink), 'one\ntwo\n')
+
+    @patch.object(Subcommand, 'OUTPUT_LINES', 2)
+    def test_failure_keeps_tail(self):
+        sink = MagicMock()
+        with self.assertRaises(ReleaseCommandError) as context:
+            Subcommand.stream_command(
+                [
+                    executable,
+                    '-c',
+                    'import sys\nfor i in range(5): print(i)\nsys.exit(3)',
+                ],
+                sink
+            )
+        self.assertEqual(written(sink), '0\n1\n2\n3\n4\n')
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertEqual(context.exception.output, '3\n4\n')
+        self.assertIn('Its last output was:\n3\n4', str(context.exception))
+
+    def test_default_sink(self):
+        sink = MagicMock()
+        with patch.object(Subcommand, 'OUTPUT', sink):
+            Subcommand.stream_command([executable, '-c', 'print("one")'])
+        self.assertEqual(written(sink), 'one\n')
@@ -0,0 +1,122 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from os import makedirs, utime
+from os.path import exists, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from gitflow_easyrelease import GitDir, ProcessRunner, TagIndex
+
+TAGS = ['0.1.0', '0.2.0', 'v1.0.0']
+
+
+class TagIndexTestCase(TestCase):
+
+    def setUp(self):
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+        makedirs(join(self.root, 'refs', 'tags'))
+        self.git_dir = GitDir(self.root)
+        current_patcher = patch.object(
+            GitDir,
+            'current',
+            return_value=self.git_dir
+        )
+        current_patcher.start()
+        self.addCleanup(current_patcher.stop)
+        self.build = MagicMock(return_value=list(TAGS))
+        self.path = join(self.root, 'easyrelease', 'tags.idx')
+        self.settle()
+
+    def settle(self):
+        past = time() - 60
+        for path in [join(self.root, 'refs', 'tags')]:
+            utime(path, (past, past))
+
+    def write_tag(self, name):
+        with open(join(self.root, 'refs', 'tags', name), 'w') as handle:
+            handle.write('a' * 40 + '\n')
+        self.settle()
+
+
+class LoadUnitTests(TagIndexTestCase):
+
+    def test_first_build(self):
+        index = TagIndex.load(self.build)
+        self.build.assert_called_once_with()
+        self.assertEqual(index.latest, 'v1.0.0')
+        self.assertEqual(index.get_tags(), TAGS)
+        self.assertTrue(exists(self.path))
+        with open(self.path) as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual(lines[0], TagIndex.FORMAT)
+        self.assertEqual(lines[2:], list(reversed(TAGS)))
+
+    def test_span(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        TagIndex.load(self.build)
+        self.assertEqual(
+            [span['name'] for span in ProcessRunner.SPANS],
+            ['TagIndex.load']
+        )
+
+    def test_hit(self):
+        TagIndex.load(self.build)
+        index = TagIndex.load(self.build)
+        self.build.assert_called_once_with()
+        self.assertEqual(index.latest, 'v1.0.0')
+        self.assertIsNone(index.cached_tags)
+        self.assertEqual(index.get_tags(), TAGS)
+
+    def test_new_tag(self):
+        TagIndex.load(self.build)
+        self.write_tag('1.1.0')
+        self.build.return_value = TAGS + ['1.1.0']
+        index = TagIndex.load(self.build)
+        self.assertEqual(self.build.call_count, 2)
+        self.assertEqual(index.latest, '1.1.0')
+        self.assertEqual(TagIndex.load(self.build).latest, '1.1.0')
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_packed_refs_change(self):
+        TagIndex.load(self.build)
+        with open(join(self.root, 'packed-refs'), 'w') as handle:
+            handle.write('a' * 40 + ' refs/tags/2.0.0\n')
+        past = time() - 60
+        utime(join(self.root, 'packed-refs'), (past, past))
+        self.build.return_value = TAGS + ['2.0.0']
+        self.assertEqual(TagIndex.load(self.build).latest, '2.0.0')
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_racy_refs_not_persisted(self):
+        now = time()
+        utime(join(self.root, 'refs', 'tags'), (now, now))
+        self.assertEqual(TagIndex.load(self.build).latest, 'v1.0.0')
+        self.assertFalse(exists(self.path))
+
+    def test_no_tags(self):
+        self.build.return_value = []
+        self.assertIsNone(TagIndex.load(self.build).latest)
+        index = TagIndex.load(self.build)
+        self.build.assert_called_once_with()
+        self.assertIsNone(index.latest)
+        self.assertEqual(index.get_tags(), [])
+
+    def test_outdated_format(self):
+        makedirs(join(self.root, 'easyrelease'))
+        with open(self.path, 'w') as handle:
+            handle.write('easyrelease-tags 0\n')
+        self.assertEqual(TagIndex.load(self.build).latest, 'v1.0.0')
+        self.build.assert_called_once_with()
+
+    @patch.object(TagIndex, 'write', side_effect=OSError('read-only'))
+    def test_unwritable(self, mock_write):
+        self.assertEqual(TagIndex.load(self.build).latest, 'v1.0.0')
+        mock_write.assert_called_once_with()
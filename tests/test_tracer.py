@@ -0,0 +1,124 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from json import load
+from os import environ, listdir
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from mock import patch
+
+from gitflow_easyrelease import ProcessRunner, Tracer
+
+
+class TracerTestCase(TestCase):
+
+    def setUp(self):
+        ProcessRunner.clear()
+        self.addCleanup(ProcessRunner.clear)
+        ProcessRunner.PHASES.append({
+            'name': 'version',
+            'start': 0.5,
+            'duration': 0.25,
+        })
+        ProcessRunner.SPANS.append({
+            'name': 'RepoSnapshot.load',
+            'category': 'repo',
+            'start': 0.5,
+            'duration': 0.125,
+        })
+        ProcessRunner.RECORDS.append({
+            'command': ['git', 'for-each-ref', '--format', '%(refname)'],
+            'phase': 'version',
+            'start': 0.625,
+            'duration': 0.0625,
+            'status': 0,
+        })
+
+
+class GetPathUnitTests(TracerTestCase):
+
+    @patch.object(Tracer, 'PATH', None)
+    @patch.dict(environ, {}, clear=True)
+    def test_off(self):
+        self.assertIsNone(Tracer.get_path())
+
+    @patch.object(Tracer, 'PATH', None)
+    @patch.dict(environ, {Tracer.ENVIRONMENT: 'env.json'})
+    def test_environment(self):
+        self.assertEqual(Tracer.get_path(), 'env.json')
+
+    @patch.object(Tracer, 'PATH', 'flag.json')
+    @patch.dict(environ, {Tracer.ENVIRONMENT: 'env.json'})
+    def test_flag_wins(self):
+        self.assertEqual(Tracer.get_path(), 'flag.json')
+
+
+class GetEventsUnitTests(TracerTestCase):
+
+    @patch('gitflow_easyrelease.tracer.getpid', return_value=7)
+    def test_events(self, mock_getpid):
+        metadata, _, phase, span, process = Tracer.get_events()
+        self.assertEqual(
+            metadata,
+            {
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': 7,
+                'tid': Tracer.MAIN_TRACK,
+                'args': {'name': 'git easyrelease'},
+            }
+        )
+        self.assertEqual(
+            phase,
+            {
+                'name': 'version',
+                'cat': 'phase',
+                'ph': 'X',
+                'ts': 500000,
+                'dur': 250000,
+                'pid': 7,
+                'tid': Tracer.MAIN_TRACK,
+            }
+        )
+        self.assertEqual(span['cat'], 'repo')
+        self.assertEqual(span['dur'], 125000)
+        self.assertEqual(process['name'], 'git for-each-ref --format')
+        self.assertEqual(process['tid'], Tracer.PROCESS_TRACK)
+        self.assertEqual(process['ts'], 625000)
+        self.assertEqual(
+            process['args'],
+            {
+                'command': 'git for-each-ref --format %(refname)',
+                'phase': 'version',
+                'status': 0,
+            }
+        )
+
+
+class WriteUnitTests(TracerTestCase):
+
+    def setUp(self):
+        TracerTestCase.setUp(self)
+        self.root = mkdtemp()
+        self.addCleanup(rmtree, self.root)
+
+    @patch('gitflow_easyrelease.tracer.argv', ['git-easyrelease', 'latest'])
+    def test_write(self):
+        path = join(self.root, 'trace.json')
+        Tracer.write(path)
+        with open(path) as handle:
+            trace = load(handle)
+        self.assertEqual(len(trace['traceEvents']), 5)
+        self.assertEqual(trace['displayTimeUnit'], 'ms')
+        self.assertEqual(trace['otherData']['arguments'], 'latest')
+        self.assertEqual(listdir(self.root), ['trace.json'])
+
+    @patch('gitflow_easyrelease.atomic_file.replace_file', side_effect=OSError)
+    def test_failure_cleans_up(self, mock_replace):
+        with self.assertRaises(OSError):
+            Tracer.write(join(self.root, 'trace.json'))
+        self.assertEqual(listdir(self.root), [])
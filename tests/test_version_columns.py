@@ -0,0 +1,82 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from unittest import TestCase
+
+from pytest import mark
+
+from gitflow_easyrelease import SemVer, VersionColumns
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+TAGS = [
+    'v1.2.0',
+    'qqq',
+    '1.10.0-rc.1',
+    '0.9.9',
+    '1.10.0',
+    '1.2.0.1',
+    '1.10.0-beta.2+build.7',
+    ' 2.0.0 ',
+]
+
+
+class ParseUnitTests(TestCase):
+
+    def test_columns(self):
+        columns = SemVer.parse_many(TAGS[:-1])
+        self.assertFalse(columns.is_numpy())
+        self.assertEqual(len(columns), 5)
+        self.assertEqual(
+            list(columns.versions),
+            ['v1.2.0', '1.10.0-rc.1', '0.9.9', '1.10.0', '1.10.0-beta.2+build.7']
+        )
+        self.assertEqual(list(columns.major), [1, 1, 0, 1, 1])
+        self.assertEqual(list(columns.minor), [2, 10, 9, 10, 10])
+        self.assertEqual(list(columns.patch), [0, 0, 9, 0, 0])
+        self.assertEqual(columns.prerelease, ('', 'rc.1', '', '', 'beta.2'))
+        self.assertEqual(columns.build, ('', '', '', '', 'build.7'))
+
+    def test_empty(self):
+        columns = SemVer.parse_many(['qqq'])
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(columns.newest(), [])
+        self.assertIsNone(SemVer.get_latest_in(columns))
+
+    def test_whitespace(self):
+        self.assertEqual(SemVer.parse_many(TAGS).versions[-1], '2.0.0')
+
+
+def check_queries(columns):
+    assert [columns.versions[index] for index in columns.argsort()] == [
+        '0.9.9',
+        'v1.2.0',
+        '1.10.0-rc.1',
+        '1.10.0',
+        '1.10.0-beta.2+build.7',
+    ]
+    assert [int(index) for index in columns.newest()] == [1, 3, 4]
+    assert SemVer.get_latest_in(columns).__repr__() == '1.10.0'
+    assert SemVer.from_columns(columns, 4).__repr__() == '1.10.0-beta.2+build.7'
+    groups = columns.group_by('major')
+    assert sorted(groups) == [0, 1]
+    assert [int(index) for index in groups[1]] == [0, 1, 3, 4]
+
+
+def test_array_queries():
+    check_queries(SemVer.parse_many(TAGS[:-1]))
+
+
+@mark.skipif(numpy is None, reason='NumPy is not installed')
+def test_numpy_queries():
+    columns = SemVer.parse_many(TAGS[:-1], use_numpy=True)
+    assert columns.is_numpy()
+    check_queries(columns)
+
+
+def test_default_constructor():
+    assert 0 == len(VersionColumns())
@@ -0,0 +1,107 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+from pytest import mark, raises
+
+from gitflow_easyrelease import SemVer, VersionConstraint, VersionIndex
+
+VERSIONS = [
+    '0.0.3',
+    '0.0.4',
+    '0.2.0',
+    '0.2.5',
+    '0.3.0',
+    '1.0.0',
+    '1.2.0',
+    '1.2.3',
+    '1.2.9',
+    '1.3.0-rc.1',
+    '1.3.0',
+    '1.10.2',
+    '2.0.0-beta',
+    '2.0.0',
+    '2.4.1',
+    '3.0.0',
+]
+INDEX = VersionIndex([SemVer.from_version(version) for version in VERSIONS])
+
+
+@mark.parametrize(
+    "constraint,expected",
+    [
+        ('^1.2', '1.10.2'),
+        ('^1.2.3', '1.10.2'),
+        ('^0.2', '0.2.5'),
+        ('^0.2.1', '0.2.5'),
+        ('^0.0.3', '0.0.3'),
+        ('^0.0', '0.0.4'),
+        ('^0', '0.3.0'),
+        ('~1.2', '1.2.9'),
+        ('~1.2.4', '1.2.9'),
+        ('~1', '1.10.2'),
+        ('>=2.0,<3', '2.4.1'),
+        ('>= 2.0 < 3', '2.4.1'),
+        ('>1.2 <2', '1.10.2'),
+        ('<=1.2', '1.2.9'),
+        ('<1.3.0', '1.3.0-rc.1'),
+        ('<1.3', '1.2.9'),
+        ('>3.0.0', None),
+        ('1.2', '1.2.9'),
+        ('1.2.x', '1.2.9'),
+        ('=1.2.3', '1.2.3'),
+        ('v1.2.3', '1.2.3'),
+        ('1.2.4', None),
+        ('*', '3.0.0'),
+        ('', '3.0.0'),
+        ('<*', None),
+        ('1.0.0 - 1.2', '1.2.9'),
+        ('^0.2 || ~1.2', '1.2.9'),
+        ('^5 || <0.1', '0.0.4'),
+        ('>=2.0.0-alpha <2.0.0', '2.0.0-beta'),
+    ]
+)
+def test_resolve(constraint, expected):
+    resolved = VersionConstraint(constraint).resolve(INDEX)
+    assert expected == (None if resolved is None else resolved.__repr__())
+    brute_force = [
+        version
+        for version in INDEX.versions
+        if VersionConstraint(constraint).matches(version)
+    ]
+    assert resolved == (brute_force[-1] if brute_force else None)
+
+
+@mark.parametrize('constraint', ['^', '>=1.x.3', '1.2.3.4', '~qqq', '>= ^1'])
+def test_invalid(constraint):
+    with raises(ValueError):
+        VersionConstraint(constraint)
+
+
+class FindHighestUnitTests(TestCase):
+
+    @patch.object(SemVer, 'get_version_index', return_value=INDEX)
+    def test_releases_only(self, mock_index):
+        self.assertEqual(
+            VersionConstraint.find_highest('<1.3.0').__repr__(),
+            '1.2.9'
+        )
+        mock_index.assert_called_once_with()
+
+    @patch.object(SemVer, 'get_version_index', return_value=INDEX)
+    def test_prereleases(self, mock_index):
+        self.assertEqual(
+            VersionConstraint.find_highest('<1.3.0', True).__repr__(),
+            '1.3.0-rc.1'
+        )
+
+    @patch.object(
+        SemVer,
+        'get_version_index',
+        return_value=MagicMock(get_releases=MagicMock(return_value=VersionIndex()))
+    )
+    def test_untagged(self, mock_index):
+        self.assertIsNone(VersionConstraint.find_highest('^1'))
@@ -0,0 +1,89 @@
+# pylint: disable=missing-docstring
+
+from __future__ import print_function
+
+from unittest import TestCase
+
+from pytest import mark, raises
+
+from gitflow_easyrelease import SemVer, VersionIndex
+
+VERSIONS = [
+    '1.0.0',
+    '1.9.0',
+    '2.0.0-rc.1',
+    '2.0.0',
+    '2.3.0',
+    '3.4.0',
+    '3.4.1',
+    '3.5.0-beta',
+    '10.0.0',
+]
+
+
+class VersionIndexTestCase(TestCase):
+
+    def setUp(self):
+        self.index = VersionIndex([
+            SemVer.from_version(version)
+            for version in VERSIONS
+        ])
+
+
+class LatestUnitTests(VersionIndexTestCase):
+
+    def test_global(self):
+        self.assertEqual(self.index.latest().__repr__(), '10.0.0')
+
+    def test_major_line(self):
+        self.assertEqual(self.index.latest('2').__repr__(), '2.3.0')
+        self.assertEqual(self.index.latest('3.x').__repr__(), '3.5.0-beta')
+
+    def test_minor_line(self):
+        self.assertEqual(self.index.latest('3.4').__repr__(), '3.4.1')
+        self.assertEqual(self.index.latest('v2.0.x').__repr__(), '2.0.0')
+
+    def test_missing_line(self):
+        self.assertIsNone(self.index.latest('4'))
+        self.assertIsNone(self.index.latest('3.6'))
+        self.assertIsNone(VersionIndex().latest())
+
+
+class GetLineUnitTests(VersionIndexTestCase):
+
+    def test_line(self):
+        self.assertEqual(
+            [version.__repr__() for version in self.index.get_line('2')],
+            ['2.0.0-rc.1', '2.0.0', '2.3.0']
+        )
+
+
+class LatestPerMajorUnitTests(VersionIndexTestCase):
+
+    def test_call(self):
+        self.assertEqual(
+            [
+                (major, version.__repr__())
+                for major, version in self.index.latest_per_major().items()
+            ],
+            [(1, '1.9.0'), (2, '2.3.0'), (3, '3.5.0-beta'), (10, '10.0.0')]
+        )
+
+
+@mark.parametrize(
+    "line,prefix",
+    [
+        ('2', (2,)),
+        ('2.x', (2,)),
+        ('v3.4', (3, 4)),
+        (' 3.4.* ', (3, 4)),
+    ]
+)
+def test_parse_line(line, prefix):
+    assert prefix == VersionIndex.parse_line(line)
+
+
+@mark.parametrize('line', ['', 'x', '3.4.5', 'qqq', '3.-1'])
+def test_parse_invalid_line(line):
+    with raises(ValueError):
+        VersionIndex.parse_line(line)